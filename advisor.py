@@ -0,0 +1,145 @@
+# advisor.py
+"""Советник по выбору в событиях: поиск Монте-Карло по дереву в фоновом потоке.
+
+Корень - варианты текущего события. Итерация: выбор варианта по UCB1,
+применение к копии кампании, затем игра по дням; в каждом следующем
+событии вариант выбирается по UCB1 из таблицы транспозиций (ключ -
+квантованное состояние игры), а с первого незнакомого состояния
+кампания доигрывается случайной политикой до концовки или горизонта.
+Награда - 1 за победную концовку. Для каждого варианта корня копится
+распределение концовок, которое интерфейс показывает по мере уточнения.
+
+Поиск работает только с копиями кампании. Доигрывания, RandomPolicy и бои
+копий берут числа из глобального модуля random, общего с основным потоком;
+он не пересевается. Игра получает из него другие числа, чем без советника,
+но с тем же распределением. Свой seed на каждую итерацию получает только
+генератор обстрела копии.
+"""
+import math
+import random
+import threading
+import time
+
+from policies import RandomPolicy
+
+
+def state_key(campaign, event):
+    """Квантованное состояние для таблицы транспозиций"""
+    state = campaign.game_state
+    resources = campaign.resources
+    military = campaign.military
+    return (
+        event.name,
+        state.current_day,
+        int(state.morale // 5),
+        state.population // 500,
+        int(resources.food // 500),
+        int(resources.ammunition // 1000),
+        int(resources.fuel // 500),
+        military.enemy_force // 250,
+        military.total_soldiers // 100,
+        tuple(state.events_triggered),
+    )
+
+
+class _Node:
+    __slots__ = ('visits', 'action_visits', 'action_values')
+
+    def __init__(self, actions):
+        self.visits = 0
+        self.action_visits = [0] * actions
+        self.action_values = [0.0] * actions
+
+    def select(self, exploration):
+        for action, visits in enumerate(self.action_visits):
+            if visits == 0:
+                return action
+        log_visits = math.log(self.visits)
+        return max(range(len(self.action_visits)),
+                   key=lambda a: self.action_values[a] / self.action_visits[a] +
+                   exploration * math.sqrt(log_visits / self.action_visits[a]))
+
+    def update(self, action, reward):
+        self.visits += 1
+        self.action_visits[action] += 1
+        self.action_values[action] += reward
+
+
+class EventAdvisor(threading.Thread):
+    """Фоновый поиск для события event кампании campaign в пределах time_budget секунд"""
+
+    def __init__(self, campaign, event, time_budget=5.0, horizon=60, exploration=1.4):
+        super().__init__(name="event-advisor", daemon=True)
+        # Снимок делается в вызывающем потоке, дальше поток работает только с копиями
+        self.snapshot = campaign.snapshot()
+        self.snapshot[0].metrics = None  # История копиям не нужна; иначе копировалась бы каждую итерацию
+        self.event = event
+        self.time_budget = time_budget
+        self.horizon = horizon
+        self.exploration = exploration
+        self.rollout_policy = RandomPolicy()
+
+        self.root = _Node(len(event.choices))
+        self.table = {}  # Таблица транспозиций: ключ состояния -> _Node
+        self.endings = [{} for _ in event.choices]  # Концовки по вариантам корня
+        self.iterations = 0
+        self._lock = threading.Lock()
+        self._stop_requested = threading.Event()
+
+    def stop(self):
+        self._stop_requested.set()
+
+    def run(self):
+        deadline = time.perf_counter() + self.time_budget
+        rng = random.Random()
+        while not self._stop_requested.is_set() and time.perf_counter() < deadline:
+            self.iterate(rng)
+
+    def iterate(self, rng):
+        from campaign import Campaign
+
+        campaign = Campaign.from_snapshot(self.snapshot)
+        campaign.verbose = False
+        campaign.reseed(rng.getrandbits(32), global_random=False)
+        state = campaign.game_state
+
+        action = self.root.select(self.exploration)
+        campaign.apply_choice(self.event, action)
+        path = []
+        expanding = True
+        while not state.game_over and state.current_day <= self.horizon:
+            event = campaign.next_day()
+            if event is None:
+                continue
+            if expanding:
+                key = state_key(campaign, event)
+                node = self.table.get(key)
+                if node is None:
+                    node = self.table[key] = _Node(len(event.choices))
+                    expanding = False  # Дальше - случайное доигрывание
+                choice = node.select(self.exploration)
+                path.append((node, choice))
+            else:
+                choice = self.rollout_policy.choose_event(campaign, event)
+            campaign.choose(choice)
+
+        ending = state.victory_type or state.defeat_reason or "none"
+        reward = 1.0 if state.victory_type else 0.0
+        with self._lock:
+            self.root.update(action, reward)
+            for node, choice in path:
+                node.update(choice, reward)
+            counts = self.endings[action]
+            counts[ending] = counts.get(ending, 0) + 1
+            self.iterations += 1
+
+    def estimates(self):
+        """По вариантам: (число прогонов, доля побед, {концовка: доля})"""
+        with self._lock:
+            result = []
+            for action, counts in enumerate(self.endings):
+                visits = self.root.action_visits[action]
+                wins = self.root.action_values[action] / visits if visits else 0.0
+                result.append((visits, wins, {name: count / visits for name, count in counts.items()}
+                               if visits else {}))
+            return result
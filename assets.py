@@ -0,0 +1,102 @@
+# assets.py
+from collections import OrderedDict
+
+import pygame
+
+
+def prepare_surface(surface, alpha=False):
+    """Приведение поверхности к формату экрана для быстрого blit"""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+def bake_panel_chrome(size, title, fonts, background, border, text_color):
+    """Статичная часть панели (фон, рамка, заголовок) одной поверхностью"""
+    surface = pygame.Surface(size)
+    rect = surface.get_rect()
+    pygame.draw.rect(surface, background, rect)
+    pygame.draw.rect(surface, border, rect, 2)
+    if title:
+        surface.blit(fonts.medium.render(title, True, text_color), (10, 10))
+    return prepare_surface(surface)
+
+
+class _AtlasPage:
+    def __init__(self, size):
+        self.surface = prepare_surface(pygame.Surface((size, size), pygame.SRCALPHA), alpha=True)
+        self.size = size
+        self.shelf_x = 0
+        self.shelf_y = 0
+        self.shelf_height = 0
+        self.keys = set()
+
+    def allocate(self, width, height):
+        """Место под спрайт по полочному алгоритму или None"""
+        if width > self.size or height > self.size:
+            return None
+        if self.shelf_x + width > self.size:
+            self.shelf_y += self.shelf_height
+            self.shelf_x = 0
+            self.shelf_height = 0
+        if self.shelf_y + height > self.size:
+            return None
+        rect = pygame.Rect(self.shelf_x, self.shelf_y, width, height)
+        self.shelf_x += width
+        self.shelf_height = max(self.shelf_height, height)
+        return rect
+
+
+class TextureAtlas:
+    """Атлас спрайтов (иконки зданий, подписи), заполняемый по требованию.
+
+    Спрайты упаковываются на страницы фиксированного размера. При превышении
+    лимита памяти освобождается страница, которая дольше всех не использовалась.
+    """
+
+    def __init__(self, page_size=512, memory_limit=16 * 1024 * 1024):
+        self.page_size = page_size
+        self.max_pages = max(1, memory_limit // (page_size * page_size * 4))
+        self.pages = OrderedDict()  # страница -> None, в порядке последнего использования
+        self.entries = {}  # ключ -> (страница, прямоугольник)
+
+    def get(self, key, render):
+        """Спрайт по ключу; render() создает поверхность при первом обращении"""
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self._insert(key, render())
+        self.pages.move_to_end(entry[0])
+        return entry
+
+    def blit(self, screen, key, render, dest=None, center=None):
+        page, rect = self.get(key, render)
+        if center is not None:
+            dest = (center[0] - rect.width // 2, center[1] - rect.height // 2)
+        screen.blit(page.surface, dest, rect)
+
+    def _insert(self, key, sprite):
+        width, height = sprite.get_size()
+        target = None
+        for page in reversed(self.pages):
+            rect = page.allocate(width, height)
+            if rect is not None:
+                target = page
+                break
+
+        if target is None:
+            if len(self.pages) >= self.max_pages:
+                self._evict_page(next(iter(self.pages)))
+            target = _AtlasPage(max(self.page_size, width, height))
+            self.pages[target] = None
+            rect = target.allocate(width, height)
+
+        target.surface.fill((0, 0, 0, 0), rect)
+        target.surface.blit(sprite, rect)
+        target.keys.add(key)
+        self.entries[key] = (target, rect)
+        return target, rect
+
+    def _evict_page(self, page):
+        for key in page.keys:
+            self.entries.pop(key, None)
+        del self.pages[page]
@@ -0,0 +1,50 @@
+# balance.py
+"""Балансовые константы симуляции в одном наборе параметров.
+
+Значения по умолчанию совпадают с прежними литералами в ResourceManager,
+MilitaryManager и расчете морали. Любой параметр можно переопределить
+для отдельного прогона: Balance(food_per_soldier=0.12).
+"""
+
+DEFAULTS = {
+    # Производство на единицу мощности зданий
+    'food_per_capacity': 300,
+    'ammo_per_capacity': 400,
+    'fuel_per_capacity': 50,
+    'power_fuel_per_capacity': 50,
+    'electricity_per_capacity': 200,
+
+    # Потребление
+    'food_per_citizen': 0.03,
+    'food_per_soldier': 0.1,
+    'ammo_per_battle': 200,
+    'ammo_per_patrol': 50,
+    'fuel_per_motorized': 50,
+    'electricity_per_citizen': 0.005,
+
+    # Бой (стохастическая модель)
+    'enemy_attack_factor': 0.1,  # Сила атаки на одного солдата противника
+    'battle_spread': 0.2,  # Случайный множитель 1 +- spread
+    'attacker_loss_rate': 0.3,
+    'defender_loss_rate': 0.2,
+    'max_loss_fraction': 0.8,  # Предел потерь за бой
+
+    # Мораль
+    'morale_per_food': 2.0,  # За единицу продовольствия на жителя
+    'morale_per_battle': 0.3,
+    'morale_per_propaganda': 0.5,
+}
+
+
+class Balance:
+    """Набор балансовых параметров; неизвестное имя параметра - ошибка"""
+
+    def __init__(self, **overrides):
+        unknown = set(overrides) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Неизвестные параметры баланса: {', '.join(sorted(unknown))}")
+        self.__dict__.update(DEFAULTS)
+        self.__dict__.update(overrides)
+
+    def to_dict(self):
+        return dict(self.__dict__)
@@ -0,0 +1,318 @@
+# batch_runner.py
+"""Пакетный прогон кампаний без интерфейса для статистики концовок.
+
+Кампания с номером seed воспроизводима; результат - компактная запись
+(список полей RECORD_FIELDS), которую дешево передавать между процессами.
+Пул рабочих запускается через forkserver с заранее импортированными модулями,
+а неизменяемые данные сценария лежат в разделяемой памяти (scenario_data.py).
+Готовые записи берутся из кэша результатов (result_cache.py), если он задан.
+В режиме --target-width прогон идет до сужения интервалов всех концовок (stopping.py).
+Запуск: python batch_runner.py --seeds 0:1000 --workers 4
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from collections import deque
+
+from balance import Balance
+from campaign import Campaign
+from events import EventManager
+from policies import RandomPolicy, make_policy
+
+
+DEFAULT_SCENARIO = {
+    'max_days': 60,  # Кампании без концовки к этому дню считаются незавершенными
+    'shelling': True,
+    'combat_model': "stochastic",
+    'balance': {},  # Переопределения параметров balance.DEFAULTS
+    'policy': "random",  # Автоматический игрок, см. policies.make_policy
+}
+
+ENDINGS = ("defense_miracle", "bloody_tyrant", "people_martyr",
+           "pragmatic_leader", "idealist_fanatic", "uprising")
+
+RECORD_FIELDS = ("seed", "ending", "day", "population", "morale")
+
+
+# Модули, которые forkserver импортирует один раз до порождения рабочих
+PRELOAD_MODULES = ["numpy", "campaign", "city_damage", "scenario_data", "batch_runner"]
+
+_events = None  # Каталог событий процесса, общий для всех его кампаний
+_catalog = None  # Данные сценария из разделяемой памяти (в рабочих пула)
+_policies = {}  # Политики процесса по строке описания
+
+
+_random_policy = RandomPolicy()
+
+
+def advance_day(campaign, policy=_random_policy):
+    """Один день: решения политики по зданиям и министрам, затем ответ на событие дня"""
+    policy.manage_buildings(campaign)
+    policy.manage_ministers(campaign)
+    event = campaign.next_day()
+    if event is not None:
+        campaign.choose(policy.choose_event(campaign, event))
+
+
+def get_policy(spec):
+    policy = _policies.get(spec)
+    if policy is None:
+        policy = _policies[spec] = make_policy(spec)
+    return policy
+
+
+def run_campaign(seed, scenario=None, policy=None):
+    """Одна кампания до концовки или max_days; возвращает компактную запись.
+
+    policy - готовый объект политики; по умолчанию берется по scenario['policy'].
+    """
+    global _events
+    scenario = dict(DEFAULT_SCENARIO, **(scenario or {}))
+    policy = policy or get_policy(scenario['policy'])
+
+    campaign = Campaign(events=_events, shelling=scenario['shelling'], seed=seed, catalog=_catalog,
+                        balance=Balance(**scenario['balance']))
+    _events = campaign.events
+    campaign.military.combat_model = scenario['combat_model']
+    state = campaign.game_state
+
+    while not state.game_over and state.current_day <= scenario['max_days']:
+        advance_day(campaign, policy)
+
+    ending = state.victory_type or state.defeat_reason or "none"
+    return [seed, ending, state.current_day, state.population, round(state.morale, 2)]
+
+
+def run_seeds(seeds, scenario=None):
+    return [run_campaign(seed, scenario) for seed in seeds]
+
+
+def _run_chunk(args):
+    return run_seeds(*args)
+
+
+def _init_worker(catalog_name):
+    global _events, _catalog
+    if catalog_name is not None:
+        from scenario_data import ScenarioCatalog
+
+        _catalog = ScenarioCatalog.attach(catalog_name)
+    _events = EventManager()
+
+
+def start_method():
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class WorkerPool:
+    """Прогретый пул рабочих с общим каталогом сценария; используется как контекстный менеджер"""
+
+    def __init__(self, workers=None, method=None, shared_catalog=True):
+        from scenario_data import ScenarioCatalog
+
+        method = method or start_method()
+        context = multiprocessing.get_context(method)
+        if method == "forkserver":
+            context.set_forkserver_preload(PRELOAD_MODULES)
+        self.catalog = ScenarioCatalog.create() if shared_catalog else None
+        self.pool = context.Pool(workers, initializer=_init_worker,
+                                 initargs=(self.catalog.name if self.catalog else None,))
+
+    def imap_chunks(self, seeds, scenario=None, chunk_size=50):
+        chunks = [(chunk, scenario) for chunk in chunk_range(seeds, chunk_size)]
+        return self.pool.imap_unordered(_run_chunk, chunks)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        if self.catalog is not None:
+            self.catalog.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parse_seed_range(text):
+    """'0:1000' -> range(0, 1000)"""
+    start, stop = text.split(":")
+    return range(int(start), int(stop))
+
+
+def chunk_range(seeds, size):
+    return [seeds[i:i + size] for i in range(0, len(seeds), size)]
+
+
+def run_batch(seeds, scenario=None, workers=None, chunk_size=50, pool=None):
+    """Прогон диапазона seed на пуле процессов; записи приходят по мере готовности частей"""
+    if pool is not None:
+        for records in pool.imap_chunks(seeds, scenario, chunk_size):
+            yield from records
+        return
+
+    if workers == 1:
+        for chunk in chunk_range(seeds, chunk_size):
+            yield from run_seeds(chunk, scenario)
+        return
+
+    with WorkerPool(workers) as own_pool:
+        for records in own_pool.imap_chunks(seeds, scenario, chunk_size):
+            yield from records
+
+
+def run_batch_cached(seeds, scenario=None, workers=None, cache=None, chunk_size=50, pool=None):
+    """run_batch с кэшем: симулируются только seed, которых в кэше нет"""
+    if cache is None:
+        yield from run_batch(seeds, scenario, workers, chunk_size, pool)
+        return
+
+    from result_cache import context_key
+
+    full_scenario = dict(DEFAULT_SCENARIO, **(scenario or {}))
+    context = context_key(full_scenario, full_scenario['policy'])
+    found = cache.get_range(context, seeds)
+    yield from found.values()
+
+    missing = [seed for seed in seeds if seed not in found]
+    if not missing:
+        return
+    fresh = []
+    for record in run_batch(missing, scenario, workers, chunk_size, pool):
+        fresh.append(record)
+        yield record
+        if len(fresh) >= 500:
+            cache.put_many(context, fresh)
+            fresh = []
+    cache.put_many(context, fresh)
+
+
+def run_sequential(scenario=None, workers=None, target_width=0.01, time_budget=None, max_campaigns=1000000,
+                   chunk_size=50, cache=None, confidence=0.95):
+    """Прогон, пока все интервалы концовок шире target_width и не вышел time_budget (секунды).
+
+    Части seed раздаются по мере готовности, в работе не больше двух частей на
+    рабочего, так что после выполнения критерия досчитываются только они.
+    Возвращает (записи, EndingIntervals).
+    """
+    from stopping import EndingIntervals
+
+    intervals = EndingIntervals(ENDINGS, target_width, confidence)
+    records = []
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    context = None
+    if cache is not None:
+        from result_cache import context_key
+
+        full_scenario = dict(DEFAULT_SCENARIO, **(scenario or {}))
+        context = context_key(full_scenario, full_scenario['policy'])
+
+    def accept(chunk_records, fresh):
+        for record in chunk_records:
+            records.append(record)
+            intervals.add(record[1])
+        if fresh and cache is not None:
+            cache.put_many(context, chunk_records)
+
+    def should_dispatch():
+        return (next_seed < max_campaigns and not intervals.converged()
+                and (deadline is None or time.perf_counter() < deadline))
+
+    pool = WorkerPool(workers) if workers != 1 else None
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    in_flight = deque()
+    next_seed = 0
+    try:
+        while True:
+            while should_dispatch() and len(in_flight) < max_in_flight:
+                seeds = range(next_seed, min(next_seed + chunk_size, max_campaigns))
+                next_seed = seeds.stop
+                found = cache.get_range(context, seeds) if cache is not None else {}
+                accept(list(found.values()), False)
+                missing = [seed for seed in seeds if seed not in found]
+                if not missing:
+                    continue
+                if pool is None:
+                    accept(run_seeds(missing, scenario), True)
+                else:
+                    in_flight.append(pool.pool.apply_async(_run_chunk, ((missing, scenario),)))
+            if not in_flight:
+                break
+            accept(in_flight.popleft().get(), True)
+    finally:
+        if pool is not None:
+            pool.close()
+
+    return records, intervals
+
+
+def summarize(records):
+    """Частоты концовок и средние показатели"""
+    counts = dict.fromkeys(ENDINGS + ("none",), 0)
+    days = 0
+    for record in records:
+        counts[record[1]] = counts.get(record[1], 0) + 1
+        days += record[2]
+    total = sum(counts.values())
+    return {
+        'campaigns': total,
+        'endings': counts,
+        'frequencies': {name: count / total for name, count in counts.items()} if total else {},
+        'mean_day': days / total if total else 0.0
+    }
+
+
+def print_summary(summary, elapsed=None):
+    print(f"Кампаний: {summary['campaigns']}, средняя длительность: {summary['mean_day']:.1f} дней")
+    for name, count in summary['endings'].items():
+        print(f"  {name}: {count} ({summary['frequencies'].get(name, 0.0) * 100:.2f}%)")
+    if elapsed:
+        print(f"Время: {elapsed:.2f} с, {summary['campaigns'] / elapsed:.0f} кампаний/с")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетный прогон кампаний")
+    parser.add_argument('--seeds', default="0:1000", help="диапазон seed, начало:конец")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-days', type=int, default=DEFAULT_SCENARIO['max_days'])
+    parser.add_argument('--combat-model', default=DEFAULT_SCENARIO['combat_model'])
+    parser.add_argument('--no-shelling', action='store_true')
+    parser.add_argument('--policy', default=DEFAULT_SCENARIO['policy'],
+                        help="например humanist или events=tyrant,buildings=humanist")
+    parser.add_argument('--cache', default=".campaign_cache.sqlite", help="файл кэша результатов")
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--target-width', type=float, help="последовательный режим: ширина интервалов концовок")
+    parser.add_argument('--time-budget', type=float, help="последовательный режим: лимит времени, с")
+    parser.add_argument('--max-campaigns', type=int, default=1000000)
+    parser.add_argument('--confidence', type=float, default=0.95, choices=(0.9, 0.95, 0.99))
+    args = parser.parse_args()
+
+    scenario = {'max_days': args.max_days, 'combat_model': args.combat_model, 'shelling': not args.no_shelling,
+                'policy': args.policy}
+    cache = None
+    if not args.no_cache:
+        from result_cache import ResultCache
+
+        cache = ResultCache(args.cache)
+
+    started = time.perf_counter()
+    if args.target_width or args.time_budget:
+        records, intervals = run_sequential(scenario, args.workers, args.target_width or 0.0, args.time_budget,
+                                            args.max_campaigns, cache=cache,
+                                            confidence=args.confidence)
+        print_summary(summarize(records), time.perf_counter() - started)
+        print(f"Интервалы {args.confidence:.0%} (цель - ширина {args.target_width}):")
+        for ending, (p, low, high) in intervals.report().items():
+            print(f"  {ending}: {p:.4f} [{low:.4f}, {high:.4f}]")
+    else:
+        records = list(run_batch_cached(parse_seed_range(args.seeds), scenario, args.workers, cache))
+        print_summary(summarize(records), time.perf_counter() - started)
+    if cache is not None:
+        print(f"Кэш: найдено {cache.hits}, посчитано {cache.misses}")
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
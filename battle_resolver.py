@@ -0,0 +1,85 @@
+# battle_resolver.py
+import numpy as np
+
+from balance import Balance
+
+MIN_POWER = 0.1  # Минимум силы, чтобы избежать деления на 0
+
+
+def defense_power(soldiers, experience, morale, equipment, in_building=False):
+    """Векторный аналог Division.calculate_defense_power"""
+    base_power = soldiers * 0.4 + experience * 0.3 + morale * 0.2 + equipment * 0.1
+    base_power = np.where(in_building, base_power * 1.5, base_power)
+    return np.where(soldiers <= 0, MIN_POWER, np.maximum(MIN_POWER, base_power))
+
+
+def attack_power(soldiers, experience, morale, equipment, motorized, ammunition, fuel):
+    """Векторный аналог Division.calculate_attack_power"""
+    base_power = soldiers * 0.4 + experience * 0.3 + morale * 0.2 + equipment * 0.1
+    base_power = np.where(motorized, base_power * 1.3, base_power)
+
+    # Штрафы за нехватку ресурсов
+    base_power = np.where(ammunition < soldiers * 10, base_power * 0.7, base_power)
+    base_power = np.where(motorized & (fuel < soldiers * 5), base_power * 0.5, base_power)
+
+    return np.where(soldiers <= 0, 0, np.maximum(0, base_power))
+
+
+class BatchBattleResolver:
+    """Пакетный расчет боев: все сражения дня (или многих кампаний) за один проход.
+
+    Каждый элемент массивов - одно сражение: обороняющаяся дивизия против
+    вражеских сил своей кампании. Силы врага берутся на начало дня, поэтому
+    сражения одного дня не зависят друг от друга. Коэффициенты боя берутся
+    из balance, как в MilitaryManager.simulate_battle.
+    """
+
+    def __init__(self, rng=None, balance=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.balance = balance or Balance()
+
+    def resolve(self, soldiers, experience, morale, equipment, enemy_force,
+                in_building=True, campaign_index=None, campaign_count=None):
+        """Расчет потерь для массива сражений.
+
+        enemy_force - силы врага для каждого сражения (или одно число).
+        campaign_index - номер кампании для каждого сражения; если задан,
+        потери врага дополнительно суммируются по кампаниям.
+        """
+        soldiers = np.asarray(soldiers, dtype=np.float64)
+        experience = np.asarray(experience, dtype=np.float64)
+        morale = np.asarray(morale, dtype=np.float64)
+        equipment = np.asarray(equipment, dtype=np.float64)
+        enemy_force = np.broadcast_to(np.asarray(enemy_force, dtype=np.float64), soldiers.shape)
+        count = soldiers.shape[0]
+
+        balance = self.balance
+        noise = self.rng.uniform(1 - balance.battle_spread, 1 + balance.battle_spread, size=(3, count))
+
+        defense = defense_power(soldiers, experience, morale, equipment, in_building)
+        attack = np.maximum(MIN_POWER, enemy_force * balance.enemy_attack_factor * noise[0])
+
+        attacker_losses = np.minimum((defense / attack) * balance.attacker_loss_rate * noise[1],
+                                     balance.max_loss_fraction)
+        defender_losses = np.minimum((attack / defense) * balance.defender_loss_rate * noise[2],
+                                     balance.max_loss_fraction)
+
+        defender_casualties = (soldiers * defender_losses).astype(np.int64)
+        attacker_casualties = (enemy_force * attacker_losses).astype(np.int64)
+
+        result = {
+            "defense_power": defense,
+            "attack_power": attack,
+            "victory": defense > attack,
+            "defender_casualties": defender_casualties,
+            "attacker_casualties": attacker_casualties,
+            "soldiers_after": np.maximum(0, soldiers - defender_casualties),
+            "morale_after": np.maximum(0, morale - defender_casualties * 0.1),
+        }
+
+        if campaign_index is not None:
+            result["enemy_casualties_by_campaign"] = np.bincount(
+                campaign_index, weights=attacker_casualties, minlength=campaign_count or 0
+            ).astype(np.int64)
+
+        return result
@@ -0,0 +1,58 @@
+# bench_startup.py
+"""Замер холодного старта: время до первого кадра и до готовности к игре.
+
+Каждый замер - отдельный процесс, чтобы импорты и шрифты грузились заново.
+Запуск: python bench_startup.py [число запусков]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+CHILD_FLAG = "--child"
+
+
+def run_child():
+    import time
+    started = time.perf_counter()
+
+    from main import BerezovskyReichGame
+
+    game = BerezovskyReichGame()
+    game.show_splash_screen(wait_for_key=False)
+    times = dict(game.startup_times)
+    times['loader_steps'] = game.loader.timings
+    # Время импорта модулей тоже входит в холодный старт
+    times['imports'] = game.start_time - started
+    print(json.dumps(times))
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), CHILD_FLAG],
+                                env=env, capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    for key, label in (('imports', "Импорт модулей"),
+                       ('first_frame', "До первого кадра"),
+                       ('interactive', "До готовности")):
+        print(f"{label}: {statistics.median(s[key] for s in samples) * 1000:.1f} мс (медиана {runs} запусков)")
+
+    print("Шаги фоновой загрузки:")
+    for step in samples[0]['loader_steps']:
+        value = statistics.median(s['loader_steps'][step] for s in samples)
+        print(f"  {step}: {value * 1000:.1f} мс")
+
+
+if __name__ == "__main__":
+    if CHILD_FLAG in sys.argv:
+        run_child()
+    else:
+        main()
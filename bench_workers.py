@@ -0,0 +1,57 @@
+# bench_workers.py
+"""Сравнение запуска пула рабочих: spawn с полной инициализацией в каждом
+процессе против forkserver с предзагрузкой модулей и общим каталогом сценария.
+
+Для каждого варианта замеряется время от создания пула до готовности всех
+рабочих (каждый прогоняет одну кампанию) и память рабочего: RSS и USS
+(собственные страницы процесса, без разделяемых).
+Запуск: python bench_workers.py [число рабочих]
+"""
+import os
+import statistics
+import sys
+import time
+
+from batch_runner import WorkerPool, run_campaign
+
+
+def memory_kb():
+    """(RSS, USS) текущего процесса в КБ по /proc/self/smaps_rollup"""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return values.get('Rss', 0), values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+
+
+def probe(index):
+    # Короткая пауза, чтобы каждую задачу взял отдельный рабочий
+    time.sleep(0.2)
+    run_campaign(index, {'max_days': 5})
+    return (os.getpid(),) + memory_kb()
+
+
+def measure(workers, method, shared_catalog):
+    started = time.perf_counter()
+    with WorkerPool(workers, method=method, shared_catalog=shared_catalog) as pool:
+        results = pool.pool.map(probe, range(workers), chunksize=1)
+        elapsed = time.perf_counter() - started - 0.2
+    return elapsed, results
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    for label, method, shared in (("spawn, каталог в каждом рабочем", "spawn", False),
+                                  ("forkserver + общий каталог", "forkserver", True)):
+        elapsed, results = measure(workers, method, shared)
+        unique = {pid: (rss, uss) for pid, rss, uss in results}
+        rss = statistics.mean(value[0] for value in unique.values())
+        uss = statistics.mean(value[1] for value in unique.values())
+        print(f"{label}: готовность {elapsed * 1000:.0f} мс, рабочих {len(unique)}, "
+              f"RSS {rss / 1024:.1f} МБ, USS {uss / 1024:.1f} МБ")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,63 @@
+import random
+
+# Типы зданий, участвующие в производстве
+PRODUCTION_TYPES = ('food_production', 'military_production', 'power', 'fuel')
+
+# Позиции зданий на карте (относительные координаты в масштабе 1px = 10 метров)
+BUILDING_POSITIONS = {
+    "Рейхстаг": (300, 200),  # центр
+    "Отделение СС": (250, 200),  # 65 метров к востоку
+    "Электростанция": (150, 350),  # 620 метров северо-запад (62px по x, 62px по y)
+    "Завод продуктов": (450, 200),  # 770 метров к востоку
+    "Пекарня": (350, 169),  # 310 метров северо-запад (31px по x, 31px по y)
+    "Котельная": (400, 144),  # 560 метров к северу
+    "Подземная фабрика": (300, 144),  # 140 метров к югу
+    "Больница": (150, 200),  # 400 метров к западу
+    "Пожарная часть": (400, 250),  # 310 метров к востоку
+    "Церковь Св. Николая": (550, 200),  # 1.2 км к востоку
+    "АЗС": (410, 90),  # 1.1 км к востоку
+    "Церковь Покрова": (300, 300),  # 860 метров к северу
+}
+
+
 class Building:
-    def __init__(self, name, building_type, level=1, efficiency=1.0, is_destroyed=False):
+    def __init__(self, name, building_type, level=1, efficiency=1.0, is_destroyed=False, position=None):
+        self._observer = None  # Менеджер, ведущий мощности по типам
         self.name = name
         self.type = building_type
+        self.position = position  # Координаты на карте (1px = 10 метров)
         self.level = level
-        self.efficiency = efficiency
-        self.is_destroyed = is_destroyed
+        self._efficiency = efficiency
+        self._is_destroyed = is_destroyed
         self.workers = 0
 
+    @property
+    def capacity(self):
+        """Эффективная мощность здания (разрушенное здание не работает)"""
+        return 0.0 if self._is_destroyed else self._efficiency
+
+    def _set_state(self, attr, value):
+        old_capacity = self.capacity
+        setattr(self, attr, value)
+        if self._observer is not None and old_capacity != self.capacity:
+            self._observer.on_capacity_changed(self, old_capacity)
+
+    @property
+    def efficiency(self):
+        return self._efficiency
+
+    @efficiency.setter
+    def efficiency(self, value):
+        self._set_state('_efficiency', value)
+
+    @property
+    def is_destroyed(self):
+        return self._is_destroyed
+
+    @is_destroyed.setter
+    def is_destroyed(self, value):
+        self._set_state('_is_destroyed', value)
+
     def upgrade(self):
         """Улучшение здания"""
         if self.level < 3:  # Максимальный уровень
@@ -25,17 +76,27 @@ class Building:
 
     def take_damage(self, damage_chance=0.1):
         """Получение урона от вражеских обстрелов"""
-        import random
         if random.random() < damage_chance:
-            self.efficiency *= 0.8
-            if self.efficiency < 0.3:
-                self.is_destroyed = True
+            self.apply_damage(0.2)
             return True
         return False
 
+    def apply_damage(self, damage):
+        """Снижение эффективности на долю damage; при эффективности ниже 0.3 здание разрушено"""
+        self.efficiency *= 1.0 - damage
+        if self.efficiency < 0.3:
+            self.is_destroyed = True
+
 class BuildingManager:
-    def __init__(self):
-        self.buildings = self.initialize_buildings()
+    def __init__(self, buildings=None):
+        self.buildings = {}
+        self.capacity_by_type = {}  # Суммарная мощность по типам зданий
+        self.production_buildings = []
+        self.buildings_by_type = {}  # Тип -> здания (списки ведет менеджер)
+        if buildings is None:
+            buildings = self.initialize_buildings().values()
+        for building in buildings:
+            self.add_building(building)
 
     def initialize_buildings(self):
         """Инициализация всех зданий Березовского Рейха"""
@@ -53,14 +114,44 @@ class BuildingManager:
             Building("Церковь Покрова", "morale", 1, 1.0),
             Building("Отделение СС", "military", 1, 1.0),
         ]
+        for bld in buildings:
+            bld.position = BUILDING_POSITIONS.get(bld.name)
         return {bld.name: bld for bld in buildings}
 
+    def add_building(self, building):
+        """Добавление здания с учетом его мощности"""
+        if building.name in self.buildings:
+            self.remove_building(building.name)
+        self.buildings[building.name] = building
+        building._observer = self
+        self.capacity_by_type[building.type] = self.capacity_by_type.get(building.type, 0.0) + building.capacity
+        self.buildings_by_type.setdefault(building.type, []).append(building)
+        if building.type in PRODUCTION_TYPES:
+            self.production_buildings.append(building)
+
+    def remove_building(self, name):
+        building = self.buildings.pop(name, None)
+        if building is None:
+            return None
+        building._observer = None
+        self.capacity_by_type[building.type] -= building.capacity
+        self.buildings_by_type[building.type].remove(building)
+        if building in self.production_buildings:
+            self.production_buildings.remove(building)
+        return building
+
+    def on_capacity_changed(self, building, old_capacity):
+        self.capacity_by_type[building.type] += building.capacity - old_capacity
+
     def get_building(self, name):
         return self.buildings.get(name)
 
+    def get_capacity(self, building_type):
+        return self.capacity_by_type.get(building_type, 0.0)
+
     def get_production_buildings(self):
-        return [bld for bld in self.buildings.values() if
-                bld.type in ['food_production', 'military_production', 'power', 'fuel']]
+        """Производственные здания (список ведется менеджером, не изменять)"""
+        return self.production_buildings
 
     def to_dict(self):
         return {name: {
@@ -0,0 +1,286 @@
+# campaign.py
+import copy
+import random
+
+from balance import Balance
+from game_state import GameState
+from resources import ResourceManager
+from buildings import BuildingManager
+from ministers import MinisterManager
+from military import MilitaryManager
+from events import EventManager
+
+
+class Campaign:
+    """Одна кампания без интерфейса: состояние игры и ежедневный цикл.
+
+    Используется графической версией, сервером и пакетными прогонами.
+    Каталог событий неизменяем, поэтому его можно разделять между кампаниями.
+    При заданном seed кампания воспроизводима (глобальный random и ГСЧ обстрела).
+    """
+
+    __slots__ = ('game_state', 'resources', 'buildings', 'ministers', 'military',
+                 'events', 'city_damage', 'current_event', 'pending_events', 'verbose', 'seed', 'balance',
+                 'metrics')
+
+    # Случайные бои дня: число попыток и вероятность каждой
+    battle_attempts = 3
+    battle_chance = 0.6
+
+    def __init__(self, events=None, shelling=True, verbose=False, seed=None, catalog=None, balance=None,
+                 metrics=False, shelling_grid=None):
+        self.verbose = verbose
+        self.balance = balance or Balance()
+        self.seed = seed
+        if seed is not None:
+            random.seed(seed)
+        self.game_state = GameState()
+        self.resources = ResourceManager(self.balance)
+        if catalog is not None:
+            # Неизменяемые данные сценария из общего каталога (scenario_data.py)
+            self.buildings = BuildingManager(catalog.build_buildings())
+            self.ministers = MinisterManager(catalog.build_ministers())
+            self.military = MilitaryManager(catalog.build_divisions(), self.balance)
+        else:
+            self.buildings = BuildingManager()
+            self.ministers = MinisterManager()
+            self.military = MilitaryManager(balance=self.balance)
+        self.events = events or EventManager()
+
+        self.city_damage = None
+        if shelling:
+            # NumPy нужен только модели обстрела
+            import numpy as np
+            from city_damage import CityDamageModel
+
+            # shelling_grid - общая неизменяемая сетка обстрела (city_damage.ShellingGrid)
+            self.city_damage = CityDamageModel(rng=np.random.default_rng(seed), grid=shelling_grid)
+            self.city_damage.register_buildings(self.buildings.buildings.values())
+
+        self.current_event = None  # Событие, ожидающее выбора игрока
+        self.pending_events = []
+
+        self.metrics = None
+        if metrics:
+            # История показателей по дням (NumPy), нужна графикам интерфейса
+            from metrics import MetricsStore
+
+            self.metrics = MetricsStore()
+
+    def snapshot(self):
+        """Независимая копия состояния вместе с состоянием random; каталог событий общий"""
+        return copy.deepcopy(self, self._shared_memo()), random.getstate()
+
+    def restore(self, snapshot):
+        """Возврат к снимку; сам снимок не меняется и годится для повторных восстановлений"""
+        clone = Campaign.from_snapshot(snapshot)
+        for name in self.__slots__:
+            setattr(self, name, getattr(clone, name))
+        random.setstate(snapshot[1])
+
+    @staticmethod
+    def from_snapshot(snapshot):
+        """Новая кампания из снимка; глобальный random не меняется (безопасно в фоновом потоке)"""
+        state = snapshot[0]
+        return copy.deepcopy(state, state._shared_memo())
+
+    def reseed(self, seed, global_random=True):
+        """Новый поток случайности с текущего состояния (для ветвления копий).
+
+        global_random=False оставляет модуль random как есть - для копий,
+        работающих в фоне рядом с основной игрой.
+        """
+        self.seed = seed
+        if global_random:
+            random.seed(seed)
+        if self.city_damage is not None:
+            import numpy as np
+
+            self.city_damage.rng = np.random.default_rng(seed)
+
+    def _shared_memo(self):
+        memo = {id(self.events): self.events}
+        for event in self.events.events:
+            memo[id(event)] = event
+        return memo
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def daily_update(self):
+        """Один игровой день; возвращает сработавшие события"""
+        self.log(f"\n=== ДЕНЬ {self.game_state.current_day} ===")
+
+        minister_efficiency = self.ministers.get_minister_efficiency()
+
+        production = self.resources.calculate_daily_production(
+            minister_efficiency, self.buildings.capacity_by_type)
+        consumption = self.resources.calculate_daily_consumption(
+            self.game_state.population,
+            self.military.get_total_soldiers(),
+            self.military.battles_today,
+            self.military.patrols_today,
+            self.military.get_motorized_count()
+        )
+
+        self.resources.update_resources(production, consumption)
+
+        battle_count = self.simulate_random_battles()
+
+        # Обстрел города: урон зданиям по сетке карты
+        destroyed = []
+        if self.city_damage is not None:
+            destroyed = self.city_damage.apply_daily_shelling(self.military.enemy_force)
+
+        # Проверка заговоров и добавление новостей
+        conspiracies = self.ministers.check_conspiracies(self.game_state)
+        for conspiracy in conspiracies:
+            self.game_state.add_news(f"Обнаружены признаки заговора среди министров фракции {conspiracy.faction}")
+
+        daily_events = self.events.check_daily_events(
+            self.game_state, self.resources, self.ministers, self.military
+        )
+
+        self.update_morale(production[0], battle_count)
+
+        if self.metrics is not None:
+            self.record_metrics(production, consumption, battle_count)
+
+        self.military.reset_daily_engagement()
+
+        self.game_state.next_day()
+
+        # Разрушения и сработавшие триггеры министров попадают в новости нового дня
+        for building in destroyed:
+            self.game_state.add_news(f"Здание {building.name} разрушено обстрелом")
+        minister_triggers = self.ministers.check_triggers(self.game_state, self.resources)
+        for trigger_message in minister_triggers:
+            self.game_state.add_news(trigger_message)
+
+        return daily_events
+
+    def record_metrics(self, production, consumption, battle_count):
+        state = self.game_state
+        resources = self.resources
+        self.metrics.append({
+            'day': state.current_day,
+            'food': resources.food, 'ammunition': resources.ammunition,
+            'fuel': resources.fuel, 'electricity': resources.electricity,
+            'food_production': production[0], 'ammo_production': production[1],
+            'fuel_production': production[2], 'electricity_production': production[3],
+            'food_consumption': consumption[0], 'ammo_consumption': consumption[1],
+            'fuel_consumption': consumption[2], 'electricity_consumption': consumption[3],
+            'morale': state.morale, 'population': state.population,
+            'soldiers': self.military.get_total_soldiers(), 'enemy_force': self.military.enemy_force,
+            'battles': battle_count,
+        })
+
+    def simulate_random_battles(self):
+        battle_count = 0
+
+        for _ in range(self.battle_attempts):
+            if random.random() < self.battle_chance:
+                battle_result = self.military.simulate_battle(self.resources, is_defense=True)
+                if battle_result["result"] != "no_battle":
+                    self.log(f"БОЙ: {battle_result['message']}")
+                    battle_count += 1
+
+        return battle_count
+
+    def update_morale(self, food_production, battle_count):
+        food_per_person = food_production / self.game_state.population if self.game_state.population > 0 else 0
+
+        balance = self.balance
+        morale_change = food_per_person * balance.morale_per_food - battle_count * balance.morale_per_battle
+
+        propaganda_efficiency = self.ministers.get_minister_efficiency()['propaganda']
+        morale_change += propaganda_efficiency * balance.morale_per_propaganda
+
+        self.game_state.morale = max(0, min(100, self.game_state.morale + morale_change))
+
+    def next_day(self):
+        """День с учетом очереди событий; как в игре, игроку показывается первое из них"""
+        if self.game_state.game_over:
+            return None
+        daily_events = self.daily_update()
+        self.current_event = daily_events[0] if daily_events else None
+        return self.current_event
+
+    def apply_choice(self, event, choice_index):
+        return self.events.apply_event_choice(
+            event, choice_index, self.game_state,
+            self.resources, self.ministers, self.military
+        )
+
+    def choose(self, choice_index):
+        """Выбор варианта в текущем событии"""
+        if self.current_event and 0 <= choice_index < len(self.current_event.choices):
+            result = self.apply_choice(self.current_event, choice_index)
+            self.current_event = None
+            return result
+        return "Неверный выбор"
+
+    def building_action(self, building_name, action):
+        """Улучшение или восстановление здания по имени"""
+        building = self.buildings.buildings.get(building_name)
+        if building is None:
+            return "Нет такого здания"
+        if action == "upgrade_building":
+            return "Здание улучшено!" if building.upgrade() else "Невозможно улучшить здание"
+        if action == "repair_building":
+            return "Здание восстановлено!" if building.repair() else "Невозможно восстановить здание"
+        return "Неизвестное действие"
+
+    def load_save_data(self, save_data):
+        """Загрузка данных игры из сохранения"""
+        self.game_state.from_dict(save_data['game_state'])
+        self.resources.from_dict(save_data['resources'])
+        self.buildings.from_dict(save_data['buildings'])
+        self.ministers.from_dict(save_data['ministers'])
+        self.military.from_dict(save_data['military'])
+        if self.metrics is not None:
+            self.metrics.clear()  # История прежней партии к сохранению не относится
+
+        event_name = save_data.get('current_event')
+        self.current_event = next((e for e in self.events.events if e.name == event_name), None)
+
+    def save(self, save_system, filename=None):
+        return save_system.save_game(
+            self.game_state, self.resources, self.buildings,
+            self.ministers, self.military, filename=filename,
+            extra={'current_event': self.current_event.name if self.current_event else None}
+        )
+
+    def save_data(self, save_system):
+        """Данные сохранения без записи на диск"""
+        return save_system.build_save_data(
+            self.game_state, self.resources, self.buildings, self.ministers, self.military,
+            extra={'current_event': self.current_event.name if self.current_event else None}
+        )
+
+    def summary(self):
+        """Краткое состояние для клиентов и отчетов"""
+        state = self.game_state
+        event = self.current_event
+        return {
+            'day': state.current_day,
+            'game_over': state.game_over,
+            'victory_type': state.victory_type,
+            'defeat_reason': state.defeat_reason,
+            'population': state.population,
+            'morale': state.morale,
+            'humanism': state.humanism,
+            'cruelty': state.cruelty,
+            'pragmatism': state.pragmatism,
+            'ideology': state.ideology,
+            'resources': self.resources.to_dict(),
+            'soldiers': self.military.get_total_soldiers(),
+            'enemy_force': self.military.enemy_force,
+            'news': list(state.daily_news),
+            'event': {
+                'name': event.name,
+                'description': event.description,
+                'choices': [choice['text'] for choice in event.choices]
+            } if event else None
+        }
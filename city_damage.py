@@ -0,0 +1,111 @@
+# city_damage.py
+import numpy as np
+
+# Сетка города в координатах карты (1px = 10 метров)
+MAP_WIDTH = 600
+MAP_HEIGHT = 400
+CELL_SIZE = 10  # Ячейка 10px = 100 метров
+
+SHELLS_PER_ENEMY = 0.002  # Снарядов в день на одного вражеского солдата
+IMPACT_RADIUS = 3  # Радиус поражения снаряда в ячейках (300 метров)
+IMPACT_SIGMA = 1.5
+DAMAGE_PER_HIT = 0.2  # Доля эффективности, теряемая при прямом попадании
+
+
+def impact_kernel(radius=IMPACT_RADIUS, sigma=IMPACT_SIGMA):
+    """Гауссово ядро поражения одного снаряда (1.0 в эпицентре)"""
+    offsets = np.arange(-radius, radius + 1)
+    distance_sq = offsets[:, None] ** 2 + offsets[None, :] ** 2
+    kernel = np.exp(-distance_sq / (2 * sigma ** 2))
+    kernel[distance_sq > radius ** 2] = 0.0
+    return kernel
+
+
+class ShellingGrid:
+    """Неизменяемая часть модели обстрела: сетка, веса фронта и спектр ядра поражения.
+
+    Одна сетка разделяется всеми кампаниями процесса (сервер, копии кампаний);
+    при копировании кампании не дублируется.
+    """
+
+    def __init__(self, width=MAP_WIDTH, height=MAP_HEIGHT, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.shape = (height // cell_size, width // cell_size)
+
+        # Карта весов обстрела (например, ближе к линии фронта); по умолчанию равномерная
+        self.front_weights = np.full(self.shape, 1.0 / (self.shape[0] * self.shape[1]))
+
+        kernel = impact_kernel()
+        self.radius = kernel.shape[0] // 2
+        # Дополнение сетки, чтобы свертка через БПФ не заворачивалась по краям
+        self.padded_shape = (self.shape[0] + 2 * self.radius, self.shape[1] + 2 * self.radius)
+        padded_kernel = np.zeros(self.padded_shape)
+        padded_kernel[:kernel.shape[0], :kernel.shape[1]] = kernel
+        self.kernel_fft = np.fft.rfft2(padded_kernel)
+
+        self.front_weights.flags.writeable = False
+        self.kernel_fft.flags.writeable = False
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class CityDamageModel:
+    """Модель обстрела города на сетке карты.
+
+    Обстрел за день - поле интенсивности (ожидаемое число снарядов на ячейку).
+    Случайные попадания свертываются с ядром поражения через БПФ для всей
+    карты сразу, затем урон снимается в ячейках зданий одним векторным шагом.
+    Своё у модели только ГСЧ и привязка зданий; сетка (grid) может быть общей.
+    """
+
+    def __init__(self, width=MAP_WIDTH, height=MAP_HEIGHT, cell_size=CELL_SIZE, rng=None, grid=None):
+        self.grid = grid if grid is not None else ShellingGrid(width, height, cell_size)
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        self.buildings = []
+        self.rows = np.zeros(0, dtype=np.intp)
+        self.cols = np.zeros(0, dtype=np.intp)
+
+    def register_buildings(self, buildings):
+        """Привязка зданий к ячейкам сетки по их координатам на карте"""
+        self.buildings = [bld for bld in buildings if bld.position is not None]
+        positions = np.array([bld.position for bld in self.buildings], dtype=np.float64).reshape(-1, 2)
+        grid = self.grid
+        self.cols = np.clip((positions[:, 0] // grid.cell_size).astype(np.intp), 0, grid.shape[1] - 1)
+        self.rows = np.clip((positions[:, 1] // grid.cell_size).astype(np.intp), 0, grid.shape[0] - 1)
+
+    def shelling_intensity(self, enemy_force):
+        """Ожидаемое число снарядов на ячейку за день"""
+        return self.grid.front_weights * (enemy_force * SHELLS_PER_ENEMY)
+
+    def damage_field(self, intensity):
+        """Поле урона: случайные попадания, свернутые с ядром поражения"""
+        grid = self.grid
+        radius, shape = grid.radius, grid.shape
+        impacts = np.zeros(grid.padded_shape)
+        impacts[radius:radius + shape[0], radius:radius + shape[1]] = self.rng.poisson(intensity)
+        hits = np.fft.irfft2(np.fft.rfft2(impacts) * grid.kernel_fft, s=grid.padded_shape)
+        # Ядро лежит в углу массива, поэтому центрированный результат сдвинут на 2*radius
+        offset = 2 * radius
+        field = hits[offset:offset + shape[0], offset:offset + shape[1]]
+        return np.maximum(field, 0.0)
+
+    def apply_daily_shelling(self, enemy_force):
+        """Обстрел за день; возвращает список зданий, разрушенных сегодня"""
+        if not self.buildings or enemy_force <= 0:
+            return []
+
+        field = self.damage_field(self.shelling_intensity(enemy_force))
+        # Несколько попаданий складываются мультипликативно
+        damage = 1.0 - (1.0 - DAMAGE_PER_HIT) ** field[self.rows, self.cols]
+
+        destroyed = []
+        for index in np.flatnonzero(damage > 1e-3).tolist():
+            building = self.buildings[index]
+            if building.is_destroyed:
+                continue
+            building.apply_damage(float(damage[index]))
+            if building.is_destroyed:
+                destroyed.append(building)
+        return destroyed
@@ -0,0 +1,74 @@
+# display.py
+import pygame
+
+
+class Display:
+    """Вывод логического холста фиксированного размера на физический экран.
+
+    Основной путь - флаг SCALED: SDL масштабирует холст на видеокарте и сам
+    пересчитывает координаты мыши, поэтому стоимость кадра не зависит от
+    разрешения. Если он недоступен, холст масштабируется программно с
+    целым коэффициентом (ближайший сосед) и черными полями по краям.
+    """
+
+    def __init__(self, logical_size, fullscreen=False, window_size=None, hardware=True):
+        self.logical_size = logical_size
+        self.hardware = False
+        self.flags = pygame.FULLSCREEN if fullscreen else 0
+        flags = self.flags
+
+        if hardware and window_size is None:
+            try:
+                self.window = pygame.display.set_mode(logical_size, flags | pygame.SCALED)
+                self.canvas = self.window
+                self.hardware = True
+            except pygame.error:
+                pass
+
+        if not self.hardware:
+            self.window = pygame.display.set_mode(window_size or logical_size, flags | pygame.RESIZABLE)
+            self.canvas = pygame.Surface(logical_size).convert()
+            self._update_transform()
+
+    def _update_transform(self):
+        """Пересчет масштаба и полей под текущий размер окна"""
+        window_width, window_height = self.window.get_size()
+        logical_width, logical_height = self.logical_size
+        scale = min(window_width / logical_width, window_height / logical_height)
+        # Целый коэффициент быстрее и без размытия; дробный - только если окно меньше холста
+        self.scale = int(scale) if scale >= 1 else scale
+        self.scaled_size = (int(logical_width * self.scale), int(logical_height * self.scale))
+        self.offset = ((window_width - self.scaled_size[0]) // 2, (window_height - self.scaled_size[1]) // 2)
+
+        self.window.fill((0, 0, 0))
+        self._target = self.window.subsurface(pygame.Rect(self.offset, self.scaled_size))
+
+    def handle_resize(self, size):
+        if self.hardware:
+            return
+        # Исходные флаги сохраняются: полноэкранный режим не превращается в окно
+        self.window = pygame.display.set_mode(size, self.flags | pygame.RESIZABLE)
+        self._update_transform()
+
+    def present(self):
+        """Вывод холста на экран"""
+        if not self.hardware:
+            if self.scale == 1:
+                self._target.blit(self.canvas, (0, 0))
+            else:
+                pygame.transform.scale(self.canvas, self.scaled_size, self._target)
+        pygame.display.flip()
+
+    def to_logical(self, pos):
+        """Перевод физических координат мыши в координаты холста; None - мышь на черных полях"""
+        if self.hardware:
+            return pos
+        x = pos[0] - self.offset[0]
+        y = pos[1] - self.offset[1]
+        if not (0 <= x < self.scaled_size[0] and 0 <= y < self.scaled_size[1]):
+            return None
+        return (min(int(x / self.scale), self.logical_size[0] - 1),
+                min(int(y / self.scale), self.logical_size[1] - 1))
+
+    def get_mouse_pos(self):
+        return self.to_logical(pygame.mouse.get_pos())
@@ -0,0 +1,215 @@
+# distributed.py
+"""Распределенный прогон кампаний: координатор и рабочие на разных машинах.
+
+Координатор делит диапазон seed на части и раздает их рабочим по TCP
+(JSON по строкам). Рабочий прогоняет часть на своем пуле процессов и
+присылает компактные записи пачками. Записи части принимаются только
+целиком: если рабочий отвалился или замолчал дольше worker_timeout, его
+незавершенные части возвращаются в очередь и достаются другим.
+
+Сообщения рабочего: {"type": "ready"}, {"type": "results", "shard": id, "records": [...]},
+{"type": "done", "shard": id}. Ответы координатора: {"type": "shard", "shard": id,
+"start": a, "stop": b, "scenario": {...}}, {"type": "wait", "delay": c}, {"type": "stop"}.
+
+Запуск:
+    python distributed.py coordinator --seeds 0:100000 --port 7800
+    python distributed.py worker --host coordinator-host --port 7800 --processes 8
+    python distributed.py local --workers 4 --seeds 0:4000   (проверка на одной машине)
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import deque
+
+from batch_runner import DEFAULT_SCENARIO, WorkerPool, parse_seed_range, print_summary, run_batch, summarize
+
+
+class Coordinator:
+    def __init__(self, seeds, scenario=None, shard_size=500, worker_timeout=60.0):
+        self.scenario = dict(DEFAULT_SCENARIO, **(scenario or {}))
+        self.worker_timeout = worker_timeout
+        self.pending = deque(
+            (shard_id, start, min(start + shard_size, seeds.stop))
+            for shard_id, start in enumerate(range(seeds.start, seeds.stop, shard_size))
+        )
+        self.shard_count = len(self.pending)
+        self.shards = {shard[0]: shard for shard in self.pending}
+        self.partial = {}  # часть -> записи, полученные до её завершения
+        self.records = []
+        self.completed = set()
+        self.reassigned = 0
+        self.workers = 0
+        self.finished = asyncio.Event()
+
+    def next_message(self, worker_shards):
+        if self.pending:
+            shard_id, start, stop = self.pending.popleft()
+            worker_shards.add(shard_id)
+            self.partial[shard_id] = []
+            return {'type': 'shard', 'shard': shard_id, 'start': start, 'stop': stop, 'scenario': self.scenario}
+        if len(self.completed) == self.shard_count:
+            return {'type': 'stop'}
+        # Очередь пуста, но части еще считаются - вдруг какую-то придется переназначить
+        return {'type': 'wait', 'delay': 1.0}
+
+    def on_message(self, message, worker_shards):
+        kind = message['type']
+        if kind == 'ready':
+            return self.next_message(worker_shards)
+        if kind == 'results' and message['shard'] in worker_shards:
+            self.partial[message['shard']].extend(message['records'])
+        elif kind == 'done' and message['shard'] in worker_shards:
+            shard_id = message['shard']
+            worker_shards.discard(shard_id)
+            self.records.extend(self.partial.pop(shard_id))
+            self.completed.add(shard_id)
+            if len(self.completed) == self.shard_count:
+                self.finished.set()
+        return None
+
+    def release(self, worker_shards):
+        """Возврат незавершенных частей ушедшего рабочего в начало очереди"""
+        for shard_id in worker_shards:
+            self.partial.pop(shard_id, None)
+            self.pending.appendleft(self.shards[shard_id])
+            self.reassigned += 1
+        worker_shards.clear()
+
+    async def handle_worker(self, reader, writer):
+        self.workers += 1
+        worker_shards = set()
+        try:
+            while True:
+                line = await asyncio.wait_for(reader.readline(), self.worker_timeout)
+                if not line:
+                    break
+                reply = self.on_message(json.loads(line), worker_shards)
+                if reply is not None:
+                    writer.write(json.dumps(reply).encode('utf-8') + b'\n')
+                    await writer.drain()
+                    if reply['type'] == 'stop':
+                        break
+        except (asyncio.TimeoutError, ConnectionError, ValueError, KeyError):
+            pass
+        finally:
+            self.release(worker_shards)
+            self.workers -= 1
+            writer.close()
+
+    async def run(self, host="0.0.0.0", port=7800, on_listening=None):
+        server = await asyncio.start_server(self.handle_worker, host, port, backlog=1024)
+        if on_listening is not None:
+            on_listening(server.sockets[0].getsockname()[1])
+        async with server:
+            await self.finished.wait()
+        # Рабочие, спросившие работу после завершения, получают stop
+        return self.records
+
+
+def run_worker(host, port, processes=None, batch_size=50):
+    """Рабочий: берет части у координатора, пока тот не скажет stop"""
+    # Пул поднимается один раз и обслуживает все части
+    pool = WorkerPool(processes) if processes != 1 else None
+    try:
+        _serve_coordinator(host, port, pool, batch_size)
+    finally:
+        if pool is not None:
+            pool.close()
+
+
+def _serve_coordinator(host, port, pool, batch_size):
+    with socket.create_connection((host, port)) as sock:
+        stream = sock.makefile('rwb')
+
+        def send(message):
+            stream.write(json.dumps(message).encode('utf-8') + b'\n')
+            stream.flush()
+
+        send({'type': 'ready'})
+        while True:
+            line = stream.readline()
+            if not line:
+                return
+            message = json.loads(line)
+            if message['type'] == 'stop':
+                return
+            if message['type'] == 'wait':
+                time.sleep(message['delay'])
+            elif message['type'] == 'shard':
+                shard_id = message['shard']
+                batch = []
+                for record in run_batch(range(message['start'], message['stop']), message['scenario'],
+                                        1, chunk_size=batch_size, pool=pool):
+                    batch.append(record)
+                    if len(batch) >= batch_size:
+                        send({'type': 'results', 'shard': shard_id, 'records': batch})
+                        batch = []
+                if batch:
+                    send({'type': 'results', 'shard': shard_id, 'records': batch})
+                send({'type': 'done', 'shard': shard_id})
+            send({'type': 'ready'})
+
+
+def run_local(args, scenario):
+    """Координатор и несколько рабочих-процессов на одной машине"""
+    coordinator = Coordinator(parse_seed_range(args.seeds), scenario, args.shard_size, args.worker_timeout)
+    workers = []
+
+    def spawn_workers(port):
+        for _ in range(args.workers):
+            workers.append(subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "worker", "--host", "127.0.0.1",
+                 "--port", str(port), "--processes", "1"]))
+
+    async def main():
+        task = asyncio.ensure_future(coordinator.run("127.0.0.1", 0, spawn_workers))
+        if args.kill_one:
+            # Проверка переназначения: один рабочий пропадает посреди части
+            await asyncio.sleep(args.kill_one)
+            workers[0].kill()
+        return await task
+
+    started = time.perf_counter()
+    records = asyncio.run(main())
+    elapsed = time.perf_counter() - started
+    for worker in workers:
+        worker.wait()
+
+    print_summary(summarize(records), elapsed)
+    print(f"Рабочих: {args.workers}, переназначено частей: {coordinator.reassigned}, "
+          f"уникальных seed: {len({record[0] for record in records})}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Распределенный прогон кампаний")
+    parser.add_argument('mode', choices=("coordinator", "worker", "local"))
+    parser.add_argument('--host', default="0.0.0.0")
+    parser.add_argument('--port', type=int, default=7800)
+    parser.add_argument('--seeds', default="0:10000")
+    parser.add_argument('--shard-size', type=int, default=500)
+    parser.add_argument('--worker-timeout', type=float, default=60.0)
+    parser.add_argument('--processes', type=int, default=None, help="процессов у рабочего")
+    parser.add_argument('--workers', type=int, default=2, help="рабочих в режиме local")
+    parser.add_argument('--kill-one', type=float, default=0.0, help="убить одного рабочего через столько секунд")
+    parser.add_argument('--max-days', type=int, default=DEFAULT_SCENARIO['max_days'])
+    args = parser.parse_args()
+
+    scenario = {'max_days': args.max_days}
+    if args.mode == "worker":
+        run_worker(args.host, args.port, args.processes)
+    elif args.mode == "local":
+        run_local(args, scenario)
+    else:
+        coordinator = Coordinator(parse_seed_range(args.seeds), scenario, args.shard_size, args.worker_timeout)
+        started = time.perf_counter()
+        records = asyncio.run(coordinator.run(args.host, args.port))
+        print_summary(summarize(records), time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -154,9 +154,6 @@ class EventManager:
         """Проверка событий на текущий день"""
         triggered_events = []
 
-        # Проверяем заговоры
-        ministers.check_conspiracies(game_state)
-
         for event in self.events:
             if (event.is_triggered(game_state, resources, ministers, military) and
                     event.name not in game_state.events_triggered):
@@ -185,7 +182,8 @@ class EventManager:
 
             # Обработка заговора
             if event.name == "Обнаружение заговора":
-                conspirator = ministers.discover_conspiracy(game_state)
+                # Заговорщик, раскрытый при срабатывании события
+                conspirator = ministers.discovered_conspirator
                 if conspirator:
                     if choice_index == 0:  # Арест
                         conspirator.is_conspirator = False
@@ -0,0 +1,106 @@
+# fast_forward.py
+"""Перемотка кампании на несколько дней в фоновом потоке.
+
+Поток прогоняет дни подряд, без отрисовки, пока не выполнено одно из
+условий остановки: пройдено заданное число дней, игра окончена, сработало
+пороговое условие или пришло событие, требующее игрока. Простые события
+решает политика (policies.py). По умолчанию простыми считаются события,
+ни один вариант которых не меняет черты правителя (humanism, cruelty,
+pragmatism, ideology): черты определяют концовку, и такие решения
+оставляются игроку.
+
+Пока поток работает, главный поток не трогает кампанию и только читает
+счетчики прогресса для экрана перемотки.
+"""
+import threading
+import time
+
+STORY_EFFECTS = ('humanism', 'cruelty', 'pragmatism', 'ideology')
+
+# Пороговые условия: (описание, проверка); срабатывают при переходе из ложного в истинное
+DEFAULT_STOP_CONDITIONS = (
+    ("Мораль ниже 20%", lambda campaign: campaign.game_state.morale < 20),
+    ("Продовольствие на исходе", lambda campaign: campaign.resources.food < 500),
+)
+
+
+def is_trivial(event):
+    """Событие без влияния на черты правителя"""
+    return not any(key in choice.get("effects", {}) for choice in event.choices for key in STORY_EFFECTS)
+
+
+class FastForward(threading.Thread):
+    """Перемотка campaign не более чем на days дней; итог - в reason, event и resolved"""
+
+    def __init__(self, campaign, days, policy, trivial=is_trivial, conditions=DEFAULT_STOP_CONDITIONS):
+        super().__init__(name="fast-forward", daemon=True)
+        self.campaign = campaign
+        self.days = days
+        self.policy = policy
+        self.trivial = trivial
+        # Условия, уже выполненные при запуске, перемотку не останавливают
+        self.conditions = [(text, check) for text, check in conditions if not check(campaign)]
+
+        self.start_day = campaign.game_state.current_day
+        self.days_done = 0
+        self.resolved = []  # (событие, текст выбранного варианта), решенные политикой
+        self.event = None  # Событие, на котором перемотка остановилась
+        self.reason = None
+        self.elapsed = 0.0
+        self.error = None
+        self._cancel = threading.Event()
+        self.done = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def days_per_second(self):
+        return self.days_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    def run(self):
+        campaign = self.campaign
+        verbose = campaign.verbose
+        campaign.verbose = False  # Вывод в консоль по каждому дню замедлил бы перемотку
+        started = time.perf_counter()
+        try:
+            while self.reason is None:
+                self.reason = self.step()
+                self.elapsed = time.perf_counter() - started
+        except Exception as error:
+            self.error = error
+            self.reason = "Ошибка перемотки"
+        finally:
+            campaign.verbose = verbose
+            self.elapsed = time.perf_counter() - started
+            self.done.set()
+
+    def step(self):
+        """Один день; возвращает причину остановки или None"""
+        campaign = self.campaign
+        state = campaign.game_state
+        if self._cancel.is_set():
+            return "Перемотка прервана"
+        if state.game_over:
+            return "Игра окончена"
+        if self.days_done >= self.days:
+            return f"Пройдено дней: {self.days_done}"
+
+        daily_events = campaign.daily_update()
+        self.days_done += 1
+        if state.game_over:
+            return "Игра окончена"
+
+        if daily_events:
+            event = daily_events[0]
+            if not self.trivial(event):
+                self.event = event
+                return f"Событие: {event.name}"
+            choice = self.policy.choose_event(campaign, event)
+            campaign.apply_choice(event, choice)
+            self.resolved.append((event.name, event.choices[choice]['text']))
+
+        for text, check in self.conditions:
+            if check(campaign):
+                return text
+        return None
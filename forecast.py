@@ -0,0 +1,134 @@
+# forecast.py
+"""Прогноз запасов продовольствия, боеприпасов и топлива на N дней вперед.
+
+Производство (здания, эффективность министров) и потребление жителей,
+патрулей и моторизованных дивизий за день постоянны, пока не изменились
+входные данные, поэтому запас считается в замкнутой форме:
+запас(t) = запас(0) + t * (производство - потребление).
+
+Случайна только численность войск: бои дня (Campaign.battle_attempts попыток
+с вероятностью battle_chance) уносят солдат, потери считает BatchBattleResolver
+по той же стохастической модели, что и MilitaryManager, а с ними и часть расхода продовольствия. Эта часть
+считается векторно по samples траекториям сразу и дает полосы квантилей.
+Боеприпасы на бой (ammo_per_battle) движок списывает по battles_today на
+момент расчета потребления - это бои, уже проведенные за текущий день;
+случайные бои сбрасываются в конце дня, и прогноз учитывает только их.
+
+Прогноз пересчитывается, только когда меняется ключ входных данных.
+"""
+
+
+class ResourceForecast:
+    RESOURCES = ('food', 'ammunition', 'fuel')
+    QUANTILES = (0.1, 0.5, 0.9)
+
+    def __init__(self, campaign, days=30, samples=256, seed=0):
+        self.campaign = campaign
+        self.days = days
+        self.samples = samples
+        self.seed = seed  # Один и тот же seed - прогноз не "дрожит" при пересчете
+        self._key = None
+        self.bands = {}  # Ресурс -> массив (квантили, days + 1) запасов по дням
+        self.shortage = {}  # Ресурс -> (ранний, медианный, поздний) день нехватки или None
+        self.recomputations = 0
+
+    def inputs_key(self):
+        """Всё, от чего зависит прогноз; сравнивается при каждом обращении"""
+        campaign = self.campaign
+        resources = campaign.resources
+        military = campaign.military
+        return (
+            campaign.game_state.population,
+            resources.food, resources.ammunition, resources.fuel,
+            tuple(sorted(campaign.buildings.capacity_by_type.items())),
+            tuple(campaign.ministers.get_minister_efficiency().values()),
+            military.total_soldiers, military.enemy_force, military.get_motorized_count(),
+            military.battles_today, military.patrols_today,
+            id(campaign.balance),
+        )
+
+    def update(self):
+        """Пересчет при изменившихся входных данных; возвращает shortage"""
+        key = self.inputs_key()
+        if key != self._key:
+            self._key = key
+            self.recompute()
+        return self.shortage
+
+    def recompute(self):
+        import numpy as np
+
+        campaign = self.campaign
+        balance = campaign.balance
+        resources = campaign.resources
+        military = campaign.military
+        population = campaign.game_state.population
+
+        production = resources.calculate_daily_production(
+            campaign.ministers.get_minister_efficiency(), campaign.buildings.capacity_by_type)[:3]
+        days = np.arange(self.days + 1)
+
+        # Детерминированная часть: постоянное потребление и бои, уже проведенные сегодня
+        fixed = (population * balance.food_per_citizen,
+                 military.patrols_today * balance.ammo_per_patrol,
+                 military.get_motorized_count() * balance.fuel_per_motorized)
+        first_day = (0.0, military.battles_today * balance.ammo_per_battle, 0.0)
+        stocks = (resources.food, resources.ammunition, resources.fuel)
+
+        self.bands = {}
+        for name, stock, made, used, extra in zip(self.RESOURCES, stocks, production, fixed, first_day):
+            path = stock + days * (made - used) - np.where(days > 0, extra, 0.0)
+            self.bands[name] = np.tile(path, (len(self.QUANTILES), 1))
+
+        # Случайная часть: расход продовольствия солдатами по траекториям боев
+        soldiers = self.project_soldiers(np)
+        eaten = np.concatenate([np.zeros((self.samples, 1)),
+                                np.cumsum(soldiers * balance.food_per_soldier, axis=1)], axis=1)
+        self.bands['food'] = self.bands['food'][0] - np.quantile(eaten, self.QUANTILES[::-1], axis=0)
+
+        self.shortage = {}
+        for name, band in self.bands.items():
+            # Первый день, к которому запас исчерпан: по нижней, средней и верхней полосе
+            exhausted = band[:, 1:] <= 0
+            first = np.where(exhausted.any(axis=1), exhausted.argmax(axis=1) + 1, -1)
+            self.shortage[name] = None if first[0] < 0 else tuple(int(day) if day >= 0 else None for day in first)
+        self.recomputations += 1
+
+    def project_soldiers(self, np):
+        """Численность войск на начало каждого из days дней по samples траекториям"""
+        from battle_resolver import BatchBattleResolver
+
+        campaign = self.campaign
+        military = campaign.military
+        rng = np.random.default_rng(self.seed)
+        resolver = BatchBattleResolver(rng, campaign.balance)
+
+        divisions = list(military.divisions.values())
+        samples, count = self.samples, len(divisions)
+        soldiers = np.tile(np.array([d.soldiers for d in divisions], dtype=np.float64), (samples, 1))
+        morale = np.tile(np.array([d.morale for d in divisions], dtype=np.float64), (samples, 1))
+        experience = np.array([d.experience for d in divisions], dtype=np.float64)
+        equipment = np.array([d.equipment for d in divisions], dtype=np.float64)
+        enemy = np.full(samples, float(military.enemy_force))
+        rows = np.arange(samples)
+
+        totals = np.empty((samples, self.days))
+        for day in range(self.days):
+            totals[:, day] = soldiers.sum(axis=1)
+            if count == 0:
+                continue
+            # Случайный порядок дивизий дня; бой получает следующая свободная (как random.choice)
+            order = np.argsort(rng.random((samples, count)) + (soldiers <= 0), axis=1)
+            used = np.zeros(samples, dtype=np.int64)
+            for _ in range(campaign.battle_attempts):
+                fight = (rng.random(samples) < campaign.battle_chance) & (used < count)
+                index = order[rows, np.minimum(used, count - 1)]
+                fight &= soldiers[rows, index] > 0
+                used += fight
+
+                battle = resolver.resolve(soldiers[rows, index], experience[index], morale[rows, index],
+                                          equipment[index], enemy)
+                soldiers[rows, index] = np.where(fight, battle["soldiers_after"], soldiers[rows, index])
+                morale[rows, index] = np.where(fight, battle["morale_after"], morale[rows, index])
+                enemy = np.maximum(0.0, enemy - np.where(fight, battle["attacker_casualties"], 0))
+        return totals
@@ -114,6 +114,7 @@ class GameState:
             'suppressed_rebellions': self.suppressed_rebellions,
             'civilians_saved': self.civilians_saved,
             'peace_negotiations': self.peace_negotiations,
+            'events_triggered': self.events_triggered,
             'daily_news': self.daily_news
         }
 
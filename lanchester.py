@@ -0,0 +1,158 @@
+# lanchester.py
+import math
+import random
+
+from balance import Balance
+
+# Калибровка под стохастическую модель MilitaryManager.simulate_battle: на стартовом
+# сценарии (одна дивизия против 5000) средние потери обеих сторон совпадают,
+# разброс у Ланчестера меньше. Проверка - tests/test_combat_models.py
+DEFENDER_CALIBRATION = 1.52
+ATTACKER_CALIBRATION = 1.04
+ENGAGEMENT_DAYS = 1.0
+
+
+def kill_rates(balance):
+    """Коэффициенты (обороны, врага) из балансовых параметров: потери врага за день на
+    единицу силы обороны и потери своих за день на солдата врага и единицу силы"""
+    defender = DEFENDER_CALIBRATION * balance.attacker_loss_rate / balance.enemy_attack_factor
+    attacker = ATTACKER_CALIBRATION * balance.defender_loss_rate * balance.enemy_attack_factor
+    return defender, attacker
+
+
+def division_power(division, resources, is_defense):
+    """Боевая сила дивизии с учетом опыта, морали, экипировки и снабжения"""
+    if is_defense:
+        power = division.calculate_defense_power(resources, in_building=True)
+        # Без боеприпасов оборона тоже слабеет
+        if resources.ammunition < division.soldiers * 10:
+            power *= 0.7
+        return power
+    return division.calculate_attack_power(resources)
+
+
+def _time_to_level(own, opposing_scaled, level, rate):
+    """Время, за которое численность own(t) = own*cosh(kt) - opposing_scaled*sinh(kt) упадет до level"""
+    a = own - opposing_scaled
+    if abs(a) < 1e-12:
+        return math.log((own + opposing_scaled) / (2 * level)) / rate
+
+    discriminant = level * level - (own * own - opposing_scaled * opposing_scaled)
+    if discriminant < 0:
+        return math.inf
+    root = (level - math.sqrt(discriminant)) / a
+    if root < 1:
+        return math.inf
+    return math.log(root) / rate
+
+
+def lanchester_square(blue, red, blue_rate, red_rate, breakpoint, duration=ENGAGEMENT_DAYS):
+    """Аналитическое решение квадратичного закона Ланчестера.
+
+    dB/dt = -red_rate * R, dR/dt = -blue_rate * B. Бой длится duration дней
+    или до момента, когда одна из сторон сократится до breakpoint состава.
+    Возвращает (оставшиеся синие, оставшиеся красные, длительность боя).
+    """
+    if blue <= 0 or red <= 0 or blue_rate <= 0 or red_rate <= 0:
+        return blue, red, 0.0
+
+    rate = math.sqrt(blue_rate * red_rate)
+    blue_scale = math.sqrt(red_rate / blue_rate)
+    red_scale = math.sqrt(blue_rate / red_rate)
+
+    elapsed = min(
+        duration,
+        _time_to_level(blue, blue_scale * red, breakpoint * blue, rate),
+        _time_to_level(red, red_scale * blue, breakpoint * red, rate),
+    )
+
+    cosh = math.cosh(rate * elapsed)
+    sinh = math.sinh(rate * elapsed)
+    blue_left = max(breakpoint * blue, blue * cosh - blue_scale * red * sinh)
+    red_left = max(breakpoint * red, red * cosh - red_scale * blue * sinh)
+    return blue_left, red_left, elapsed
+
+
+def resolve_engagement(divisions, enemy_force, resources, is_defense=True, balance=None):
+    """Бой нескольких дивизий против вражеских сил за постоянное время.
+
+    Коэффициенты берутся из суммарной силы дивизий; потери распределяются
+    между дивизиями пропорционально численности. Состояние дивизий не меняется.
+    Сторона выходит из боя, потеряв balance.max_loss_fraction состава.
+    """
+    balance = balance or Balance()
+    soldiers = sum(div.soldiers for div in divisions)
+    if soldiers <= 0 or enemy_force <= 0:
+        return {"result": "no_battle", "defender_casualties": 0, "attacker_casualties": 0,
+                "casualties_by_division": {}}
+
+    power = max(0.1, sum(division_power(div, resources, is_defense) for div in divisions))
+    defender_rate, attacker_rate = kill_rates(balance)
+    blue_rate = defender_rate * power / soldiers
+    red_rate = attacker_rate * soldiers / power
+
+    blue_left, red_left, elapsed = lanchester_square(soldiers, enemy_force, blue_rate, red_rate,
+                                                     1 - balance.max_loss_fraction)
+
+    own_casualties = int(soldiers - blue_left)
+    enemy_casualties = int(enemy_force - red_left)
+
+    casualties_by_division = {}
+    assigned = 0
+    for div in divisions:
+        share = int(own_casualties * div.soldiers / soldiers)
+        casualties_by_division[div.name] = share
+        assigned += share
+    # Остаток от округления - самой многочисленной дивизии
+    if divisions and assigned < own_casualties:
+        largest = max(divisions, key=lambda div: div.soldiers)
+        casualties_by_division[largest.name] += own_casualties - assigned
+
+    own_loss_share = own_casualties / soldiers
+    enemy_loss_share = enemy_casualties / enemy_force
+
+    return {
+        "result": "victory" if enemy_loss_share > own_loss_share else "defeat",
+        "defender_casualties": own_casualties,
+        "attacker_casualties": enemy_casualties,
+        "casualties_by_division": casualties_by_division,
+        "duration": elapsed
+    }
+
+
+def compare_models(military_factory, resources, samples=1000):
+    """Сравнение средних потерь стохастической и ланчестерской моделей.
+
+    military_factory создает свежий MilitaryManager для каждого прогона.
+    Возвращает словарь со средними и стандартными отклонениями потерь.
+    """
+    stats = {}
+    for model in ("stochastic", "lanchester"):
+        own, enemy = [], []
+        for _ in range(samples):
+            military = military_factory()
+            military.combat_model = model
+            result = military.simulate_battle(resources, is_defense=True)
+            own.append(result.get("defender_casualties", 0))
+            enemy.append(result.get("attacker_casualties", 0))
+        stats[model] = {
+            "defender_mean": sum(own) / samples,
+            "attacker_mean": sum(enemy) / samples,
+            "defender_std": _std(own),
+            "attacker_std": _std(enemy),
+        }
+    return stats
+
+
+def _std(values):
+    mean = sum(values) / len(values)
+    return math.sqrt(sum((v - mean) ** 2 for v in values) / max(1, len(values) - 1))
+
+
+if __name__ == "__main__":
+    from military import MilitaryManager
+    from resources import ResourceManager
+
+    random.seed(0)
+    for model, values in compare_models(MilitaryManager, ResourceManager()).items():
+        print(model, {key: round(value, 1) for key, value in values.items()})
@@ -0,0 +1,122 @@
+# loadgen.py
+"""Нагрузочный тест сервера кампаний.
+
+N клиентов создают сессии и играют: следующий день, ответ на событие
+случайным вариантом. В конце печатаются задержки p50/p99, запросы в
+секунду и оценка числа сессий на ядро сервера.
+Без --port/--unix сервер запускается отдельным процессом на Unix-сокете.
+Запуск: python loadgen.py --clients 200 --days 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+
+class Client:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+        self.latencies = []
+
+    async def call(self, cmd, **fields):
+        self.next_id += 1
+        request = dict(fields, id=self.next_id, cmd=cmd)
+        started = time.perf_counter()
+        self.writer.write(json.dumps(request).encode('utf-8') + b'\n')
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        self.latencies.append(time.perf_counter() - started)
+        return response
+
+
+async def connect(args):
+    if args.unix:
+        return Client(*await asyncio.open_unix_connection(args.unix))
+    return Client(*await asyncio.open_connection(args.host, args.port))
+
+
+async def play(args, think_time):
+    client = await connect(args)
+    session = (await client.call('new'))['session']
+    for _ in range(args.days):
+        response = await client.call('next_day', session=session)
+        if not response['ok']:
+            break
+        state = response['state']
+        if state['event']:
+            await client.call('choose', session=session, choice=random.randrange(len(state['event']['choices'])))
+        if state['game_over']:
+            break
+        if think_time:
+            await asyncio.sleep(random.uniform(0, 2 * think_time))
+    await client.call('close', session=session)
+    client.writer.close()
+    return client.latencies
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run(args):
+    stats_client = await connect(args)
+    before = await stats_client.call('stats')
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(play(args, args.think_time) for _ in range(args.clients)))
+    elapsed = time.perf_counter() - started
+
+    after = await stats_client.call('stats')
+    stats_client.writer.close()
+
+    latencies = [value for client in results for value in client]
+    cpu = after['cpu_time'] - before['cpu_time']
+    print(f"Клиентов: {args.clients}, запросов: {len(latencies)}, время: {elapsed:.2f} с")
+    print(f"Задержка p50: {percentile(latencies, 0.5) * 1000:.2f} мс, p99: {percentile(latencies, 0.99) * 1000:.2f} мс")
+    print(f"Запросов в секунду: {len(latencies) / elapsed:.0f}")
+    print(f"CPU сервера: {cpu:.2f} с ({cpu / elapsed * 100:.0f}% ядра)")
+    # Сервер однопоточный: сессий на ядро = число сессий при полной загрузке ядра
+    if cpu > 0:
+        print(f"Сессий на ядро при этом темпе игры: {args.clients * elapsed / cpu:.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест сервера кампаний")
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--think-time', type=float, default=0.0, help="средняя пауза клиента между днями, с")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--unix')
+    args = parser.parse_args()
+
+    server = None
+    if args.port is None and args.unix is None:
+        workdir = tempfile.mkdtemp(prefix="reich_load_")
+        args.unix = os.path.join(workdir, "server.sock")
+        server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py"),
+                                   "--unix", args.unix, "--save-dir", os.path.join(workdir, "saves")],
+                                  stdout=subprocess.DEVNULL)
+        while not os.path.exists(args.unix):
+            if server.poll() is not None:
+                sys.exit("Сервер не запустился")
+            time.sleep(0.05)
+
+    try:
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,143 +1,208 @@
 import pygame
 import sys
-import random
-from game_state import GameState
-from resources import ResourceManager
-from buildings import BuildingManager
-from ministers import MinisterManager
-from military import MilitaryManager
-from events import EventManager
+import time
+from advisor import EventAdvisor
+from campaign import Campaign
 from save_system import SaveSystem
-from ui_manager import UIManager, Colors, Button
+from display import Display
+from fast_forward import FastForward
+from forecast import ResourceForecast
+from policies import make_policy
+from startup import StartupLoader
+from ui_manager import UIManager, Colors, Button, Fonts, WINDOW_TITLE
 
+# Перемотка (клавиша F): дней за раз, политика для простых событий, частота экрана прогресса
+FAST_FORWARD_DAYS = 10
+FAST_FORWARD_POLICY = "greedy_morale"
+FAST_FORWARD_FPS = 10
 
-class BerezovskyReichGame:
-    def __init__(self):
-        pygame.init()
-
-        self.ui = UIManager()
-        self.game_state = GameState()
-        self.resources = ResourceManager()
-        self.buildings = BuildingManager()
-        self.ministers = MinisterManager()
-        self.military = MilitaryManager()
-        self.events = EventManager()
-        self.save_system = SaveSystem()
 
-        self.ui.initialize_map(self.buildings)
+class BerezovskyReichGame:
+    def __init__(self, fullscreen=False):
+        self.start_time = time.perf_counter()
+        self.startup_times = {}  # Время до первого кадра и до готовности к игре
+
+        # Инициализируем только используемые подсистемы SDL: видео и шрифты
+        pygame.display.init()
+        pygame.font.init()
+        pygame.display.set_caption(WINDOW_TITLE)
+
+        self.display = Display((1200, 800), fullscreen)
+        self.splash_fonts = {
+            'title': pygame.font.Font(None, 48),
+            'large': pygame.font.Font(None, 32),
+            'medium': pygame.font.Font(None, 24)
+        }
+        self.ui = None  # Создается после фоновой загрузки
 
         self.current_event = None
+        self.advisor = None  # Фоновый советник для текущего события
+        self.fast_forward = None  # Идущая перемотка дней
         self.selected_building = None
         self.selected_minister = None
         self.selected_division = None
+        self.save_manifest = []
 
         self.clock = pygame.time.Clock()
         self.fps = 60
 
+        # Шрифты, менеджеры, каталоги и список сохранений грузятся за заставкой
+        self.loader = StartupLoader([
+            ("Шрифты", Fonts),
+            ("Кампания", self._create_campaign),
+            ("Сохранения", self._scan_saves),
+        ])
+        self.loader.start()
+
+    def _create_campaign(self):
+        self.campaign = Campaign(verbose=True, metrics=True)
+        self.game_state = self.campaign.game_state
+        self.resources = self.campaign.resources
+        self.buildings = self.campaign.buildings
+        self.ministers = self.campaign.ministers
+        self.military = self.campaign.military
+        self.events = self.campaign.events
+
+    def _scan_saves(self):
+        self.save_system = SaveSystem()
+        self.save_manifest = self.save_system.list_saves()
+
+    def finish_startup(self):
+        """Завершение загрузки в главном потоке: интерфейс и раскладка панелей"""
+        if self.ui is not None:
+            return
+        results = self.loader.result()
+        self.ui = UIManager(display=self.display, fonts=results["Шрифты"])
+        self.ui.initialize_map(self.buildings)
+        self.ui.forecast = ResourceForecast(self.campaign)
+        self.ui.chart_panel.metrics = self.campaign.metrics
+        self.startup_times['interactive'] = time.perf_counter() - self.start_time
+
     def start_new_game(self):
         self.show_splash_screen()
 
-    def show_splash_screen(self):
-        running = True
-        while running:
+    def show_splash_screen(self, wait_for_key=True):
+        key_pressed = False
+        while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
                 if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
-                    running = False
+                    key_pressed = True
 
-            self.ui.screen.fill(Colors.BLACK)
+            if self.ui is None and self.loader.done.is_set():
+                self.finish_startup()
 
-            title_surf = self.ui.fonts.title.render("БЕРЕЗОВСКИЙ РЕЙХ", True, Colors.WHITE)
-            subtitle_surf = self.ui.fonts.large.render("ПОСЛЕДНИЙ РУБЕЖ", True, Colors.RED)
-            info_surf = self.ui.fonts.medium.render("Год 2025. Гражданская война в России.", True, Colors.WHITE)
-            prompt_surf = self.ui.fonts.medium.render("Нажмите любую клавишу для продолжения...", True, Colors.YELLOW)
+            self.draw_splash()
+            self.display.present()
+            if 'first_frame' not in self.startup_times:
+                self.startup_times['first_frame'] = time.perf_counter() - self.start_time
 
-            self.ui.screen.blit(title_surf, (self.ui.screen_width // 2 - title_surf.get_width() // 2, 200))
-            self.ui.screen.blit(subtitle_surf, (self.ui.screen_width // 2 - subtitle_surf.get_width() // 2, 270))
-            self.ui.screen.blit(info_surf, (self.ui.screen_width // 2 - info_surf.get_width() // 2, 350))
-            self.ui.screen.blit(prompt_surf, (self.ui.screen_width // 2 - prompt_surf.get_width() // 2, 450))
-
-            pygame.display.flip()
+            # Нажатие во время загрузки запоминается и срабатывает по её окончании
+            if self.ui is not None and (key_pressed or not wait_for_key):
+                return
             self.clock.tick(self.fps)
 
-    def daily_update(self):
-        print(f"\n=== ДЕНЬ {self.game_state.current_day} ===")
-
-        minister_efficiency = self.ministers.get_minister_efficiency()
+    def draw_splash(self):
+        screen = self.display.canvas
+        screen_width = screen.get_width()
+        fonts = self.splash_fonts
+        screen.fill(Colors.BLACK)
 
-        production = self.resources.calculate_daily_production(minister_efficiency)
-        consumption = self.resources.calculate_daily_consumption(
-            self.game_state.population,
-            self.military.get_total_soldiers(),
-            self.military.battles_today,
-            self.military.patrols_today,
-            len(self.military.get_motorized_divisions())
-        )
+        title_surf = fonts['title'].render("БЕРЕЗОВСКИЙ РЕЙХ", True, Colors.WHITE)
+        subtitle_surf = fonts['large'].render("ПОСЛЕДНИЙ РУБЕЖ", True, Colors.RED)
+        info_surf = fonts['medium'].render("Год 2025. Гражданская война в России.", True, Colors.WHITE)
 
-        self.resources.update_resources(production, consumption)
+        screen.blit(title_surf, (screen_width // 2 - title_surf.get_width() // 2, 200))
+        screen.blit(subtitle_surf, (screen_width // 2 - subtitle_surf.get_width() // 2, 270))
+        screen.blit(info_surf, (screen_width // 2 - info_surf.get_width() // 2, 350))
 
-        battle_count = self.simulate_random_battles()
+        if self.ui is not None:
+            prompt_surf = fonts['medium'].render("Нажмите любую клавишу для продолжения...", True, Colors.YELLOW)
+            screen.blit(prompt_surf, (screen_width // 2 - prompt_surf.get_width() // 2, 450))
+            return
 
-        # Проверка заговоров и добавление новостей
-        conspiracies = self.ministers.check_conspiracies(self.game_state)
-        for conspiracy in conspiracies:
-            self.game_state.add_news(f"Обнаружены признаки заговора среди министров фракции {conspiracy.faction}")
+        # Прогресс фоновой загрузки
+        bar_rect = pygame.Rect(screen_width // 2 - 200, 450, 400, 16)
+        pygame.draw.rect(screen, Colors.DARK_GRAY, bar_rect)
+        fill_rect = pygame.Rect(bar_rect.x, bar_rect.y, int(bar_rect.width * self.loader.progress), bar_rect.height)
+        pygame.draw.rect(screen, Colors.GREEN, fill_rect)
+        pygame.draw.rect(screen, Colors.WHITE, bar_rect, 1)
 
-        daily_events = self.events.check_daily_events(
-            self.game_state, self.resources, self.ministers, self.military
-        )
+        step = self.loader.current_step or "Подготовка интерфейса"
+        step_surf = fonts['medium'].render(f"Загрузка: {step}...", True, Colors.WHITE)
+        screen.blit(step_surf, (screen_width // 2 - step_surf.get_width() // 2, 475))
 
-        self.update_morale(production[0], battle_count)
-
-        self.military.reset_daily_engagement()
-
-        self.game_state.next_day()
-
-        return daily_events
-
-    def simulate_random_battles(self):
-        battle_count = 0
-        battle_chance = 0.6
-
-        for _ in range(3):
-            if random.random() < battle_chance:
-                battle_result = self.military.simulate_battle(self.resources, is_defense=True)
-                if battle_result["result"] != "no_battle":
-                    print(f"БОЙ: {battle_result['message']}")
-                    battle_count += 1
-
-        return battle_count
-
-    def update_morale(self, food_production, battle_count):
-        food_per_person = food_production / self.game_state.population if self.game_state.population > 0 else 0
-
-        morale_change = (food_per_person * 2) - (battle_count * 0.3)
-
-        propaganda_efficiency = self.ministers.get_minister_efficiency()['propaganda']
-        morale_change += propaganda_efficiency * 0.5
-
-        self.game_state.morale = max(0, min(100, self.game_state.morale + morale_change))
+    def daily_update(self):
+        return self.campaign.daily_update()
 
     def handle_event_choice(self, choice_index):
         if self.current_event and 0 <= choice_index < len(self.current_event.choices):
-            result = self.events.apply_event_choice(
-                self.current_event, choice_index, self.game_state,
-                self.resources, self.ministers, self.military
-            )
+            self.stop_advisor()
+            result = self.campaign.apply_choice(self.current_event, choice_index)
             self.current_event = None
             self.ui.current_screen = "main"
             return result
         return "Неверный выбор"
 
+    def start_advisor(self):
+        self.stop_advisor()
+        self.advisor = EventAdvisor(self.campaign, self.current_event)
+        self.advisor.start()
+
+    def stop_advisor(self):
+        if self.advisor:
+            self.advisor.stop()
+            self.advisor.join()
+            self.advisor = None
+
+    def start_fast_forward(self, days=FAST_FORWARD_DAYS):
+        self.fast_forward = FastForward(self.campaign, days, make_policy(FAST_FORWARD_POLICY))
+        self.ui.begin_fast_forward()
+        self.fast_forward.start()
+
+    def update_fast_forward(self):
+        """Кадр режима перемотки; False - выйти из игры"""
+        fast_forward = self.fast_forward
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                fast_forward.cancel()
+                fast_forward.join()
+                return False
+            if event.type == pygame.VIDEORESIZE:
+                self.ui.display.handle_resize(event.size)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                fast_forward.cancel()
+
+        if not fast_forward.done.is_set():
+            # Кампанию считает поток перемотки; здесь только экран прогресса с ограниченной частотой
+            self.ui.draw_fast_forward_overlay(fast_forward)
+            self.ui.present()
+            self.clock.tick(FAST_FORWARD_FPS)
+            return True
+
+        fast_forward.join()
+        self.fast_forward = None
+        if fast_forward.error is not None:
+            raise fast_forward.error
+        print(f"Перемотка: {fast_forward.days_done} дн. за {fast_forward.elapsed:.2f} с "
+              f"({fast_forward.days_per_second:.0f} дн/с). {fast_forward.reason}")
+        for event_name, choice_text in fast_forward.resolved:
+            print(f"  {event_name}: {choice_text}")
+
+        if self.game_state.game_over:
+            self.show_end_game()
+            return False
+        if fast_forward.event is not None:
+            self.current_event = fast_forward.event
+            self.ui.current_screen = "event"
+            self.start_advisor()
+        return True
+
     def load_game_data(self, save_data):
         """Загрузка данных игры из сохранения"""
-        self.game_state.from_dict(save_data['game_state'])
-        self.resources.from_dict(save_data['resources'])
-        self.buildings.from_dict(save_data['buildings'])
-        self.ministers.from_dict(save_data['ministers'])
-        self.military.from_dict(save_data['military'])
+        self.campaign.load_save_data(save_data)
 
     def handle_building_action(self, action):
         """Обработка действий с зданиями"""
@@ -197,7 +262,7 @@ class BerezovskyReichGame:
 
             self.ui.screen.blit(message_surf, (self.ui.screen_width // 2 - message_surf.get_width() // 2, 300))
             self.ui.screen.blit(prompt_surf, (self.ui.screen_width // 2 - prompt_surf.get_width() // 2, 350))
-            pygame.display.flip()
+            self.ui.present()
 
             waiting = True
             while waiting:
@@ -242,14 +307,16 @@ class BerezovskyReichGame:
             load_button.draw(self.ui.screen, self.ui.fonts)
             back_button.draw(self.ui.screen, self.ui.fonts)
 
-            pygame.display.flip()
+            self.ui.present()
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
                 elif event.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
+                    mouse_pos = self.ui.get_mouse_pos()
+                    if mouse_pos is None:
+                        continue  # Клик по черным полям вокруг холста
 
                     # Проверка кликов по сохранениям
                     for button_rect, save_index in save_buttons:
@@ -273,12 +340,19 @@ class BerezovskyReichGame:
         running = True
 
         while running:
-            mouse_pos = pygame.mouse.get_pos()
+            if self.fast_forward:
+                running = self.update_fast_forward()
+                continue
+
+            mouse_pos = self.ui.get_mouse_pos()
             mouse_click = False
+            fast_forward_started = False
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.VIDEORESIZE:
+                    self.ui.display.handle_resize(event.size)
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:
                         mouse_click = True
@@ -288,14 +362,22 @@ class BerezovskyReichGame:
                             choice_index = event.key - pygame.K_1
                             result = self.handle_event_choice(choice_index)
                             print(f"Результат события: {result}")
+                    elif event.key == pygame.K_f and self.ui.current_screen == "main":
+                        self.start_fast_forward()
+                        # Кампания теперь у потока перемотки: остаток кадра не обрабатывается
+                        fast_forward_started = True
+                        break
                     elif event.key == pygame.K_ESCAPE:
                         if self.ui.current_screen in ["building_detail", "minister_detail", "division_detail", "info"]:
                             self.ui.current_screen = "main"
 
+            if fast_forward_started:
+                continue
+
             self.ui.update_ui(self.game_state, self.resources, self.ministers, self.military)
             self.ui.update_buttons(mouse_pos)
 
-            if mouse_click:
+            if mouse_click and mouse_pos is not None:
                 result = self.ui.handle_click(mouse_pos, mouse_click)
 
                 if result == "next_day":
@@ -303,6 +385,7 @@ class BerezovskyReichGame:
                     if daily_events:
                         self.current_event = daily_events[0]
                         self.ui.current_screen = "event"
+                        self.start_advisor()
 
                     if self.game_state.game_over:
                         self.show_end_game()
@@ -346,7 +429,8 @@ class BerezovskyReichGame:
             if self.ui.current_screen == "main":
                 self.ui.draw_main_screen()
             elif self.ui.current_screen == "event" and self.current_event:
-                self.ui.draw_event_screen(self.current_event)
+                self.ui.draw_event_screen(self.current_event,
+                                          self.advisor.estimates() if self.advisor else None)
             elif self.ui.current_screen == "building_detail":
                 self.ui.draw_main_screen()
                 self.ui.draw_building_detail(self.selected_building)
@@ -359,7 +443,7 @@ class BerezovskyReichGame:
             elif self.ui.current_screen == "info":  # Новый экран информации
                 self.ui.draw_info_screen()
 
-            pygame.display.flip()
+            self.ui.present()
             self.clock.tick(self.fps)
 
         pygame.quit()
@@ -426,12 +510,12 @@ class BerezovskyReichGame:
 
             self.ui.screen.blit(prompt_surf, (self.ui.screen_width // 2 - prompt_surf.get_width() // 2, 450))
 
-            pygame.display.flip()
+            self.ui.present()
             self.clock.tick(self.fps)
 
 
 def main():
-    game = BerezovskyReichGame()
+    game = BerezovskyReichGame(fullscreen="--fullscreen" in sys.argv)
 
     print("=== БЕРЕЗОВСКИЙ РЕЙХ: ПОСЛЕДНИЙ РУБЕЖ ===")
     print("Запуск графической версии...")
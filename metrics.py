@@ -0,0 +1,77 @@
+# metrics.py
+"""Дневные показатели кампании в кольцевом буфере постоянного размера.
+
+Буфер - заранее выделенный массив (capacity, число полей); каждый день
+записывается одна строка, при переполнении затираются самые старые.
+Столбцы отдаются в хронологическом порядке; история выгружается в CSV
+или в .npy (структурированный массив с именами полей).
+"""
+import csv
+
+import numpy as np
+
+FIELDS = (
+    'day',
+    'food', 'ammunition', 'fuel', 'electricity',
+    'food_production', 'ammo_production', 'fuel_production', 'electricity_production',
+    'food_consumption', 'ammo_consumption', 'fuel_consumption', 'electricity_consumption',
+    'morale', 'population', 'soldiers', 'enemy_force', 'battles',
+)
+
+
+class MetricsStore:
+    def __init__(self, capacity=365, fields=FIELDS):
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self.index = {name: i for i, name in enumerate(self.fields)}
+        self.data = np.zeros((capacity, len(self.fields)), dtype=np.float64)
+        self.head = 0  # Строка для следующей записи
+        self.count = 0
+        self.version = 0  # Растет с каждой записью; по нему обновляются графики
+
+    def __len__(self):
+        return self.count
+
+    def append(self, values):
+        """Запись дня: values - {поле: значение}; отсутствующие поля - 0"""
+        row = self.data[self.head]
+        row[:] = 0.0
+        for name, value in values.items():
+            row[self.index[name]] = value
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.version += 1
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+        self.version += 1
+
+    def column(self, name):
+        """Значения поля от старых к новым (копия)"""
+        i = self.index[name]
+        if self.count < self.capacity:
+            return self.data[:self.count, i].copy()
+        return np.concatenate((self.data[self.head:, i], self.data[:self.head, i]))
+
+    def rows(self):
+        """Все записи от старых к новым, массив (count, число полей)"""
+        if self.count < self.capacity:
+            return self.data[:self.count].copy()
+        return np.concatenate((self.data[self.head:], self.data[:self.head]))
+
+    def last(self, name):
+        if not self.count:
+            return None
+        return float(self.data[(self.head - 1) % self.capacity, self.index[name]])
+
+    def to_csv(self, path):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.fields)
+            for row in self.rows():
+                writer.writerow([f"{value:.6g}" for value in row])
+
+    def save_npy(self, path):
+        records = np.rec.fromarrays(self.rows().T, names=list(self.fields))
+        np.save(path, records)
@@ -1,16 +1,52 @@
 import random
 
+from balance import Balance
+
 
 class Division:
     def __init__(self, name, commander, division_type, soldiers, experience=50, morale=70, equipment=80):
+        self._observer = None  # Менеджер, ведущий суммарные показатели
         self.name = name
         self.commander = commander
-        self.type = division_type
-        self.soldiers = soldiers
+        self._type = division_type
+        self._soldiers = soldiers
         self.experience = experience
         self.morale = morale
         self.equipment = equipment
-        self.is_engaged = False
+        self._is_engaged = False
+
+    @property
+    def type(self):
+        return self._type
+
+    @type.setter
+    def type(self, value):
+        old_value = self._type
+        self._type = value
+        if self._observer is not None and old_value != value:
+            self._observer.on_division_type_changed(self, old_value)
+
+    @property
+    def soldiers(self):
+        return self._soldiers
+
+    @soldiers.setter
+    def soldiers(self, value):
+        old_value = self._soldiers
+        self._soldiers = value
+        if self._observer is not None and old_value != value:
+            self._observer.on_soldiers_changed(self, old_value)
+
+    @property
+    def is_engaged(self):
+        return self._is_engaged
+
+    @is_engaged.setter
+    def is_engaged(self, value):
+        old_value = self._is_engaged
+        self._is_engaged = value
+        if self._observer is not None and old_value != value:
+            self._observer.on_engaged_changed(self)
 
     def calculate_attack_power(self, resources):
         """Расчет силы атаки по формуле из GDD"""
@@ -50,11 +86,23 @@ class Division:
 
 
 class MilitaryManager:
-    def __init__(self):
-        self.divisions = self.initialize_divisions()
+    def __init__(self, divisions=None, balance=None):
+        self.balance = balance or Balance()
+        self.divisions = {}
+        # Суммарные показатели, обновляемые при изменении дивизий
+        self.total_soldiers = 0
+        self.engaged_soldiers = 0
+        self.soldiers_by_type = {}
+        self.divisions_by_type = {}
+        self.engaged_divisions = {}  # Упорядоченное множество занятых дивизий
+        if divisions is None:
+            divisions = self.initialize_divisions().values()
+        for division in divisions:
+            self.add_division(division)
         self.enemy_force = 5000
         self.battles_today = 0
         self.patrols_today = 2
+        self.combat_model = "stochastic"  # "stochastic" или "lanchester"
 
     def initialize_divisions(self):
         """Инициализация дивизий Березовского Рейха"""
@@ -71,11 +119,69 @@ class MilitaryManager:
 
         return {div.name: div for div in divisions}
 
+    def add_division(self, division):
+        """Добавление дивизии с учетом в суммарных показателях"""
+        if division.name in self.divisions:
+            self.remove_division(division.name)
+        self.divisions[division.name] = division
+        division._observer = self
+
+        self.total_soldiers += division.soldiers
+        self.soldiers_by_type[division.type] = self.soldiers_by_type.get(division.type, 0) + division.soldiers
+        self.divisions_by_type.setdefault(division.type, []).append(division)
+        if division.is_engaged:
+            self.engaged_divisions[division] = True
+            self.engaged_soldiers += division.soldiers
+
+    def remove_division(self, name):
+        division = self.divisions.pop(name, None)
+        if division is None:
+            return None
+        division._observer = None
+
+        self.total_soldiers -= division.soldiers
+        self.soldiers_by_type[division.type] -= division.soldiers
+        self.divisions_by_type[division.type].remove(division)
+        if self.engaged_divisions.pop(division, None):
+            self.engaged_soldiers -= division.soldiers
+        return division
+
+    def on_soldiers_changed(self, division, old_soldiers):
+        delta = division.soldiers - old_soldiers
+        self.total_soldiers += delta
+        self.soldiers_by_type[division.type] += delta
+        if division.is_engaged:
+            self.engaged_soldiers += delta
+
+    def on_engaged_changed(self, division):
+        if division.is_engaged:
+            self.engaged_divisions[division] = True
+            self.engaged_soldiers += division.soldiers
+        else:
+            self.engaged_divisions.pop(division, None)
+            self.engaged_soldiers -= division.soldiers
+
+    def on_division_type_changed(self, division, old_type):
+        self.soldiers_by_type[old_type] -= division.soldiers
+        self.divisions_by_type[old_type].remove(division)
+        self.soldiers_by_type[division.type] = self.soldiers_by_type.get(division.type, 0) + division.soldiers
+        self.divisions_by_type.setdefault(division.type, []).append(division)
+
     def get_total_soldiers(self):
-        return sum(div.soldiers for div in self.divisions.values())
+        return self.total_soldiers
+
+    def get_free_soldiers(self):
+        return self.total_soldiers - self.engaged_soldiers
+
+    def get_soldiers_by_type(self, division_type):
+        return self.soldiers_by_type.get(division_type, 0)
 
     def get_motorized_divisions(self):
-        return [div for div in self.divisions.values() if div.type == 'motorized']
+        """Моторизованные дивизии (список ведется менеджером, не изменять)"""
+        return self.divisions_by_type.get('motorized', [])
+
+    def get_motorized_count(self):
+        return len(self.divisions_by_type.get('motorized', ()))
 
     def simulate_battle(self, resources, is_defense=True):
         """Симуляция боя с защитой от деления на ноль"""
@@ -92,48 +198,93 @@ class MilitaryManager:
         defending_division = random.choice(available_divs)
         defending_division.is_engaged = True
 
-        # Расчет сил с защитой от нуля
-        defense_power = defending_division.calculate_defense_power(resources, is_defense)
-        attack_power = max(0.1, self.enemy_force * 0.1 * random.uniform(0.8, 1.2))  # Минимум 0.1
+        if self.combat_model == "lanchester":
+            return self._apply_lanchester([defending_division], resources, is_defense)
 
-        # Расчет потерь с защитой от экстремальных значений
-        if defense_power > 0 and attack_power > 0:
-            attacker_losses = (defense_power / attack_power) * 0.3 * random.uniform(0.8, 1.2)
-            defender_losses = (attack_power / defense_power) * 0.2 * random.uniform(0.8, 1.2)
+        result = self._resolve_stochastic(defending_division, resources, is_defense)
+        if result["result"] == "victory":
+            result["message"] = f"{defending_division.name} отбила атаку! Потери: {result['defender_casualties']} солдат"
         else:
-            # Если что-то пошло не так, используем безопасные значения
-            attacker_losses = 0.1
-            defender_losses = 0.1
+            result["message"] = (f"{defending_division.name} потерпела поражение. "
+                                 f"Потери: {result['defender_casualties']} солдат")
+        return result
+
+    def simulate_operation(self, division_names, resources, is_defense=True):
+        """Наступательная или оборонительная операция нескольких дивизий"""
+        divisions = [self.divisions[name] for name in division_names
+                     if name in self.divisions and self.divisions[name].soldiers > 0]
+        if not divisions:
+            return {"result": "no_battle", "message": "Нет доступных дивизий"}
+
+        for div in divisions:
+            div.is_engaged = True
 
-        # Ограничение потерь разумными пределами
-        attacker_losses = min(attacker_losses, 0.8)  # Максимум 80% потерь
-        defender_losses = min(defender_losses, 0.8)
+        if self.combat_model == "lanchester":
+            return self._apply_lanchester(divisions, resources, is_defense)
 
-        # Применение потерь
-        defender_casualties = int(defending_division.soldiers * defender_losses)
-        defending_division.take_casualties(defender_casualties)
+        # Стохастическая модель: каждая дивизия ведет свой бой
+        results = [self._resolve_stochastic(div, resources, is_defense) for div in divisions]
+        defender_casualties = sum(r["defender_casualties"] for r in results)
+        attacker_casualties = sum(r["attacker_casualties"] for r in results)
+        victories = sum(1 for r in results if r["result"] == "victory")
+        return {
+            "result": "victory" if victories * 2 > len(results) else "defeat",
+            "message": f"Операция {len(divisions)} дивизий. Потери: {defender_casualties} солдат",
+            "defender_casualties": defender_casualties,
+            "attacker_casualties": attacker_casualties
+        }
 
+    def _resolve_stochastic(self, division, resources, is_defense):
+        """Один стохастический бой дивизии (без лимитов и выбора дивизии)"""
+        if is_defense:
+            power = division.calculate_defense_power(resources, True)
+        else:
+            power = max(0.1, division.calculate_attack_power(resources))
+        balance = self.balance
+        low, high = 1 - balance.battle_spread, 1 + balance.battle_spread
+        attack_power = max(0.1, self.enemy_force * balance.enemy_attack_factor * random.uniform(low, high))
+
+        attacker_losses = min((power / attack_power) * balance.attacker_loss_rate * random.uniform(low, high),
+                              balance.max_loss_fraction)
+        defender_losses = min((attack_power / power) * balance.defender_loss_rate * random.uniform(low, high),
+                              balance.max_loss_fraction)
+
+        defender_casualties = int(division.soldiers * defender_losses)
+        division.take_casualties(defender_casualties)
         enemy_casualties = int(self.enemy_force * attacker_losses)
         self.enemy_force = max(0, self.enemy_force - enemy_casualties)
 
-        # Определение результата
-        if defense_power > attack_power:
-            result = "victory"
-            message = f"{defending_division.name} отбила атаку! Потери: {defender_casualties} солдат"
+        return {
+            "result": "victory" if power > attack_power else "defeat",
+            "defender_casualties": defender_casualties,
+            "attacker_casualties": enemy_casualties
+        }
+
+    def _apply_lanchester(self, divisions, resources, is_defense):
+        """Расчет боя по модели Ланчестера и применение потерь"""
+        from lanchester import resolve_engagement
+
+        outcome = resolve_engagement(divisions, self.enemy_force, resources, is_defense, self.balance)
+        for div in divisions:
+            div.take_casualties(outcome["casualties_by_division"].get(div.name, 0))
+        self.enemy_force = max(0, self.enemy_force - outcome["attacker_casualties"])
+
+        names = divisions[0].name if len(divisions) == 1 else f"Группа из {len(divisions)} дивизий"
+        if outcome["result"] == "victory":
+            message = f"{names} отбила атаку! Потери: {outcome['defender_casualties']} солдат"
         else:
-            result = "defeat"
-            message = f"{defending_division.name} потерпела поражение. Потери: {defender_casualties} солдат"
+            message = f"{names} потерпела поражение. Потери: {outcome['defender_casualties']} солдат"
 
         return {
-            "result": result,
+            "result": outcome["result"],
             "message": message,
-            "defender_casualties": defender_casualties,
-            "attacker_casualties": enemy_casualties
+            "defender_casualties": outcome["defender_casualties"],
+            "attacker_casualties": outcome["attacker_casualties"]
         }
 
     def reset_daily_engagement(self):
         """Сброс статуса занятости дивизий"""
-        for division in self.divisions.values():
+        for division in list(self.engaged_divisions):
             division.is_engaged = False
         self.battles_today = 0
 
@@ -153,7 +304,8 @@ class MilitaryManager:
             'divisions': divisions_data,
             'enemy_force': self.enemy_force,
             'battles_today': self.battles_today,
-            'patrols_today': self.patrols_today
+            'patrols_today': self.patrols_today,
+            'combat_model': self.combat_model
         }
 
     def from_dict(self, data):
@@ -165,4 +317,5 @@ class MilitaryManager:
 
         self.enemy_force = data['enemy_force']
         self.battles_today = data['battles_today']
-        self.patrols_today = data['patrols_today']
\ No newline at end of file
+        self.patrols_today = data['patrols_today']
+        self.combat_model = data.get('combat_model', self.combat_model)
\ No newline at end of file
@@ -1,18 +1,81 @@
 # ministers.py
+import heapq
 import random
 
+from triggers import TriggerIndex, compile_triggers
+
+# Пороги заговоров
+LOW_LOYALTY_THRESHOLD = 50  # Ниже - министр считается нелояльным
+CONTACT_LEVEL = 10  # Выше - министр участвует во встречах заговорщиков
+CONSPIRATOR_LEVEL = 70  # Выше - министр становится заговорщиком
+EXPOSED_LEVEL = 80  # Выше - заговорщика может раскрыть разведка
+
 
 class Minister:
     def __init__(self, name, position, skills, loyalty, faction, triggers=None):
+        self._observer = None  # Менеджер, которому сообщаются изменения
         self.name = name
         self.position = position
         self.skills = skills  # Словарь {навык: уровень}
-        self.loyalty = loyalty
+        self._loyalty = loyalty
         self.faction = faction  # Фракция министра
-        self.triggers = triggers or []
+        self._trigger_index = None  # Индекс менеджера, в котором зарегистрированы триггеры
+        self._compiled_triggers = None
+        self.triggers = triggers or []  # Текстовые или структурные триггеры (см. triggers.py)
         self.is_traitor = False
-        self.is_conspirator = False
-        self.conspiracy_level = 0  # Уровень вовлеченности в заговор (0-100)
+        self._is_conspirator = False
+        self._conspiracy_level = 0  # Уровень вовлеченности в заговор (0-100)
+
+    @property
+    def loyalty(self):
+        return self._loyalty
+
+    @loyalty.setter
+    def loyalty(self, value):
+        old_value = self._loyalty
+        self._loyalty = value
+        if self._observer is not None and old_value != value:
+            self._observer.on_loyalty_changed(self, old_value)
+
+    @property
+    def triggers(self):
+        return self._triggers
+
+    @triggers.setter
+    def triggers(self, value):
+        # Список заменяется целиком: скомпилированные триггеры и индекс менеджера перестраиваются
+        self._triggers = value
+        self._compiled_triggers = None
+        if self._trigger_index is not None:
+            self._trigger_index.add_minister(self)
+
+    @property
+    def compiled_triggers(self):
+        if self._compiled_triggers is None:
+            self._compiled_triggers = compile_triggers(self)
+        return self._compiled_triggers
+
+    @property
+    def conspiracy_level(self):
+        return self._conspiracy_level
+
+    @conspiracy_level.setter
+    def conspiracy_level(self, value):
+        old_value = self._conspiracy_level
+        self._conspiracy_level = value
+        if self._observer is not None and old_value != value:
+            self._observer.on_conspiracy_changed(self, old_value)
+
+    @property
+    def is_conspirator(self):
+        return self._is_conspirator
+
+    @is_conspirator.setter
+    def is_conspirator(self, value):
+        old_value = self._is_conspirator
+        self._is_conspirator = value
+        if self._observer is not None and old_value != value:
+            self._observer.on_conspiracy_changed(self, self._conspiracy_level)
 
     def calculate_efficiency(self):
         """Расчет эффективности министра на основе навыков и лояльности"""
@@ -26,24 +89,145 @@ class Minister:
 
     def check_triggers(self, game_state, resources):
         """Проверка триггеров для событий"""
-        events = []
+        sources = {"game_state": game_state, "resources": resources}
+        return [trigger.message for trigger in self.compiled_triggers
+                if trigger.predicate(getattr(sources[trigger.source], trigger.var))]
 
-        for trigger in self.triggers:
-            # Пример: триггер при низкой морали
-            if "мораль" in trigger and "низк" in trigger:
-                if game_state.morale < 30:
-                    events.append(f"{self.name}: {trigger}")
 
-            # Триггер при нехватке ресурсов
-            if "еда" in trigger and resources.food < 500:
-                events.append(f"{self.name}: {trigger}")
+class _IndexedSet:
+    """Множество с O(1) добавлением, удалением и случайным выбором"""
 
-        return events
+    def __init__(self):
+        self.items = []
+        self.positions = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def add(self, item):
+        if item not in self.positions:
+            self.positions[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item):
+        index = self.positions.pop(item, None)
+        if index is None:
+            return
+        last = self.items.pop()
+        if index < len(self.items):
+            self.items[index] = last
+            self.positions[last] = index
+
+    def random_choice(self, exclude=None):
+        """Случайный элемент, отличный от exclude, или None"""
+        size = len(self.items)
+        if exclude in self.positions:
+            size -= 1
+        if size <= 0:
+            return None
+        item = self.items[random.randrange(size)]
+        if item is exclude:
+            # exclude попал в первые size позиций - подставляем последний элемент
+            item = self.items[size]
+        return item
+
+
+class FactionGraph:
+    """Индекс фракций: состав, нелояльные министры и очередь заговорщиков.
+
+    Счетчики обновляются при изменении лояльности и уровня заговора,
+    поэтому ежедневная проверка не перебирает всех министров.
+    """
+
+    def __init__(self):
+        self.faction_of = {}  # министр -> фракция
+        self.members = {}  # фракция -> список министров
+        self.low_loyalty = {}  # фракция -> нелояльные министры
+        self.contacts = {}  # фракция -> министры с conspiracy_level > CONTACT_LEVEL
+        self.active_factions = {}  # фракции, где формируется заговор (упорядоченное множество)
+        self._heap = []  # (-conspiracy_level, номер записи, министр)
+        self._heap_entry = {}  # министр -> номер актуальной записи в куче
+        self._counter = 0
+
+    def add_member(self, minister, faction):
+        if minister in self.faction_of:
+            return
+        self.faction_of[minister] = faction
+        self.members.setdefault(faction, []).append(minister)
+        self.low_loyalty.setdefault(faction, _IndexedSet())
+        self.contacts.setdefault(faction, _IndexedSet())
+
+        if minister.loyalty < LOW_LOYALTY_THRESHOLD:
+            self.low_loyalty[faction].add(minister)
+            self._update_active(faction)
+        if minister.conspiracy_level > CONTACT_LEVEL:
+            self.contacts[faction].add(minister)
+        self.push_conspirator(minister)
+
+    def low_loyalty_count(self, faction):
+        low = self.low_loyalty.get(faction)
+        return len(low) if low is not None else 0
+
+    def on_loyalty_changed(self, minister, old_loyalty):
+        faction = self.faction_of.get(minister)
+        if faction is None:
+            return
+        was_low = old_loyalty < LOW_LOYALTY_THRESHOLD
+        is_low = minister.loyalty < LOW_LOYALTY_THRESHOLD
+        if was_low == is_low:
+            return
+
+        if is_low:
+            self.low_loyalty[faction].add(minister)
+        else:
+            self.low_loyalty[faction].discard(minister)
+        self._update_active(faction)
+
+    def on_conspiracy_changed(self, minister, old_level):
+        faction = self.faction_of.get(minister)
+        if faction is not None:
+            if minister.conspiracy_level > CONTACT_LEVEL:
+                self.contacts[faction].add(minister)
+            else:
+                self.contacts[faction].discard(minister)
+        self.push_conspirator(minister)
+
+    def _update_active(self, faction):
+        # Фанатики не участвуют в заговорах
+        if self.low_loyalty_count(faction) >= 2 and faction != "fanatics":
+            self.active_factions[faction] = True
+        else:
+            self.active_factions.pop(faction, None)
+
+    def push_conspirator(self, minister):
+        """Добавление заговорщика в очередь по уровню заговора"""
+        self._heap_entry.pop(minister, None)
+        if not minister.is_conspirator:
+            return
+        self._counter += 1
+        self._heap_entry[minister] = self._counter
+        heapq.heappush(self._heap, (-minister.conspiracy_level, self._counter, minister))
+
+    def top_conspirator(self):
+        """Заговорщик с наибольшим уровнем заговора (устаревшие записи удаляются лениво)"""
+        while self._heap:
+            _, entry, minister = self._heap[0]
+            if self._heap_entry.get(minister) == entry:
+                return minister
+            heapq.heappop(self._heap)
+        return None
 
 
 class MinisterManager:
-    def __init__(self):
-        self.ministers = self.initialize_ministers()
+    def __init__(self, ministers=None):
+        # Министры из готового каталога (scenario_data.py) или стандартный состав
+        if ministers is None:
+            self.ministers = self.initialize_ministers()
+        else:
+            self.ministers = {min.name: min for min in ministers}
         self.factions = {
             "fanatics": ["Макар Лысенко", "Александр Новченко", "Платон Литвинчук",
                          "Альберт Каспрак", "Марк Волков", "Алексей Портнов"],
@@ -51,6 +235,34 @@ class MinisterManager:
             "apolitical": ["Николас Кейдж", "Стас Ярушин"],
             "reformists": ["Стас Ватутин"]
         }
+        self.discovered_conspirator = None
+        self._last_conspiracy_day = None
+        self.faction_graph = self.build_faction_graph()
+        self.trigger_index = TriggerIndex()
+        for minister in self.ministers.values():
+            self.trigger_index.add_minister(minister)
+
+    def build_faction_graph(self):
+        """Построение индекса фракций и подписка на изменения министров"""
+        graph = FactionGraph()
+        for faction, members in self.factions.items():
+            for name in members:
+                if name in self.ministers:
+                    graph.add_member(self.ministers[name], faction)
+        for minister in self.ministers.values():
+            minister._observer = graph
+            graph.push_conspirator(minister)
+        return graph
+
+    def add_minister(self, minister):
+        """Добавление министра (например, из сценария) с регистрацией во фракции"""
+        self.ministers[minister.name] = minister
+        members = self.factions.setdefault(minister.faction, [])
+        if minister.name not in members:
+            members.append(minister.name)
+        minister._observer = self.faction_graph
+        self.faction_graph.add_member(minister, minister.faction)
+        self.trigger_index.add_minister(minister)
 
     def initialize_ministers(self):
         """Инициализация всех министров Березовского Рейха"""
@@ -127,42 +339,44 @@ class MinisterManager:
 
         return efficiencies
 
+    def check_triggers(self, game_state, resources):
+        """Срабатывание триггеров всех министров за один проход по параметрам"""
+        return self.trigger_index.evaluate({"game_state": game_state, "resources": resources})
+
     def check_conspiracies(self, game_state):
-        """Проверка заговоров среди министров"""
+        """Проверка заговоров среди министров (не чаще раза в день)"""
+        if self._last_conspiracy_day == game_state.current_day:
+            return []
+        self._last_conspiracy_day = game_state.current_day
+
         conspiracies = []
+        graph = self.faction_graph
 
-        # Проверяем фракции на формирование заговоров
-        for faction, members in self.factions.items():
-            faction_ministers = [self.ministers[name] for name in members if name in self.ministers]
-            low_loyalty_count = sum(1 for m in faction_ministers if m.loyalty < 50)
-
-            if low_loyalty_count >= 2 and faction != "fanatics":
-                # Фракция начинает формировать заговор
-                for minister in faction_ministers:
-                    if minister.loyalty < 50:
-                        minister.conspiracy_level = min(100, minister.conspiracy_level + random.randint(5, 15))
-
-                        # Случайные встречи заговорщиков
-                        if random.random() < 0.3 and minister.conspiracy_level > 20:
-                            other_conspirators = [m for m in faction_ministers
-                                                  if m != minister and m.conspiracy_level > 10]
-                            if other_conspirators:
-                                other_minister = random.choice(other_conspirators)
-                                game_state.add_news(
-                                    f"Министр {minister.name} встретился с министром {other_minister.name}")
-
-                        if minister.conspiracy_level > 70 and not minister.is_conspirator:
-                            minister.is_conspirator = True
-                            conspiracies.append(minister)
+        # Обходим только фракции, где не меньше двух нелояльных министров
+        for faction in list(graph.active_factions):
+            for minister in list(graph.low_loyalty[faction].items):
+                minister.conspiracy_level = min(100, minister.conspiracy_level + random.randint(5, 15))
+
+                # Случайные встречи заговорщиков
+                if random.random() < 0.3 and minister.conspiracy_level > 20:
+                    other_minister = graph.contacts[faction].random_choice(exclude=minister)
+                    if other_minister is not None:
+                        game_state.add_news(
+                            f"Министр {minister.name} встретился с министром {other_minister.name}")
+
+                if minister.conspiracy_level > CONSPIRATOR_LEVEL and not minister.is_conspirator:
+                    minister.is_conspirator = True
+                    conspiracies.append(minister)
 
         return conspiracies
 
     def discover_conspiracy(self, game_state):
-        """Обнаружение заговора"""
-        conspirators = [m for m in self.ministers.values() if m.is_conspirator and m.conspiracy_level > 80]
-        if conspirators and random.random() < 0.2:
-            return random.choice(conspirators)
-        return None
+        """Обнаружение заговора: разведка выходит на самого активного заговорщика"""
+        self.discovered_conspirator = None
+        conspirator = self.faction_graph.top_conspirator()
+        if conspirator and conspirator.conspiracy_level > EXPOSED_LEVEL and random.random() < 0.2:
+            self.discovered_conspirator = conspirator
+        return self.discovered_conspirator
 
     def to_dict(self):
         return {name: {
@@ -0,0 +1,193 @@
+# policies.py
+"""Автоматические игроки для прогонов без интерфейса.
+
+Политика отвечает за три решения: выбор варианта в событии (choose_event),
+действия со зданиями (manage_buildings) и действия с министрами
+(manage_ministers). Движок вызывает их каждый день; встроенные политики
+не создают объектов на вызов - ответы на события считаются один раз на
+событие каталога, приоритеты зданий заданы заранее.
+
+Политики собираются по строке: "humanist" или
+"events=tyrant,buildings=humanist" (CompositePolicy).
+Запуск замера: python policies.py --campaigns 200
+"""
+import argparse
+import random
+import time
+
+
+class Policy:
+    """Базовая политика: ничего не делает со зданиями и министрами"""
+
+    name = "base"
+
+    def choose_event(self, campaign, event):
+        return 0
+
+    def manage_buildings(self, campaign):
+        pass
+
+    def manage_ministers(self, campaign):
+        pass
+
+
+class RandomPolicy(Policy):
+    """Случайный вариант в событиях; прежнее поведение пакетного прогона"""
+
+    name = "random"
+
+    def choose_event(self, campaign, event):
+        return random.randrange(len(event.choices))
+
+
+class WeightedPolicy(Policy):
+    """Вариант с наибольшей взвешенной суммой числовых эффектов; одно действие со зданием в день.
+
+    Каждый день восстанавливается первое разрушенное здание по building_priority,
+    если таких нет - улучшается первое неулучшенное до предела.
+    """
+
+    weights = {}
+    building_priority = ()
+
+    def __init__(self):
+        self._choices = {}  # Имя события -> индекс выбранного варианта
+
+    def choose_event(self, campaign, event):
+        choice = self._choices.get(event.name)
+        if choice is None:
+            choice = self._choices[event.name] = self.best_choice(event)
+        return choice
+
+    def best_choice(self, event):
+        def score(choice):
+            return sum(self.weights.get(key, 0) * value for key, value in choice.get("effects", {}).items()
+                       if isinstance(value, (int, float)) and not isinstance(value, bool))
+
+        scores = [score(choice) for choice in event.choices]
+        return scores.index(max(scores))
+
+    def manage_buildings(self, campaign):
+        by_type = campaign.buildings.buildings_by_type
+        for building_type in self.building_priority:
+            for building in by_type.get(building_type, ()):
+                if building.is_destroyed:
+                    building.repair()
+                    return
+        for building_type in self.building_priority:
+            for building in by_type.get(building_type, ()):
+                if building.upgrade():
+                    return
+
+
+class GreedyMoralePolicy(WeightedPolicy):
+    name = "greedy_morale"
+    weights = {'morale': 1}
+    building_priority = ("morale", "food_production", "health")
+
+
+class HumanistPolicy(WeightedPolicy):
+    name = "humanist"
+    weights = {'humanism': 1, 'morale': 0.5, 'soldiers_rescued': 0.1, 'cruelty': -1}
+    building_priority = ("health", "food_production", "safety", "morale")
+
+
+class TyrantPolicy(WeightedPolicy):
+    name = "tyrant"
+    weights = {'cruelty': 1, 'ideology': 0.5, 'morale_radicals': 0.2, 'order': 0.2, 'humanism': -0.5}
+    building_priority = ("military", "military_production", "government")
+
+
+class PragmatistPolicy(WeightedPolicy):
+    name = "pragmatist"
+    weights = {'pragmatism': 1, 'food': 0.05, 'food_on_success': 0.02, 'soldiers_rescued': 0.1, 'morale': 0.2}
+    building_priority = ("food_production", "military_production", "power", "fuel")
+
+
+class CompositePolicy(Policy):
+    """Решения разных видов от разных политик"""
+
+    def __init__(self, events=None, buildings=None, ministers=None):
+        base = Policy()
+        self.events = events or base
+        self.buildings = buildings or base
+        self.ministers = ministers or base
+        self.name = f"events={self.events.name},buildings={self.buildings.name},ministers={self.ministers.name}"
+
+    def choose_event(self, campaign, event):
+        return self.events.choose_event(campaign, event)
+
+    def manage_buildings(self, campaign):
+        self.buildings.manage_buildings(campaign)
+
+    def manage_ministers(self, campaign):
+        self.ministers.manage_ministers(campaign)
+
+
+POLICIES = {policy.name: policy for policy in (Policy, RandomPolicy, GreedyMoralePolicy, HumanistPolicy,
+                                              TyrantPolicy, PragmatistPolicy)}
+
+
+def make_policy(spec):
+    """Политика по строке: "humanist" или "events=tyrant,buildings=humanist" """
+    if "=" not in spec:
+        if spec not in POLICIES:
+            raise ValueError(f"Неизвестная политика: {spec}")
+        return POLICIES[spec]()
+
+    parts = {}
+    for item in spec.split(","):
+        role, name = item.split("=", 1)
+        if role not in ("events", "buildings", "ministers"):
+            raise ValueError(f"Неизвестная роль политики: {role}")
+        parts[role] = make_policy(name)
+    return CompositePolicy(**parts)
+
+
+class TimedPolicy(Policy):
+    """Обертка для замера времени, проведенного в решениях политики"""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.name = policy.name
+        self.elapsed = 0.0
+
+    def choose_event(self, campaign, event):
+        started = time.perf_counter()
+        choice = self.policy.choose_event(campaign, event)
+        self.elapsed += time.perf_counter() - started
+        return choice
+
+    def manage_buildings(self, campaign):
+        started = time.perf_counter()
+        self.policy.manage_buildings(campaign)
+        self.elapsed += time.perf_counter() - started
+
+    def manage_ministers(self, campaign):
+        started = time.perf_counter()
+        self.policy.manage_ministers(campaign)
+        self.elapsed += time.perf_counter() - started
+
+
+def main():
+    from batch_runner import run_campaign, summarize
+
+    parser = argparse.ArgumentParser(description="Производительность и исходы встроенных политик")
+    parser.add_argument('--campaigns', type=int, default=200)
+    parser.add_argument('--shelling', action='store_true')
+    args = parser.parse_args()
+
+    for name in ("random", "greedy_morale", "humanist", "tyrant", "pragmatist"):
+        policy = TimedPolicy(make_policy(name))
+        scenario = {'shelling': args.shelling}
+        started = time.perf_counter()
+        records = [run_campaign(seed, scenario, policy) for seed in range(args.campaigns)]
+        elapsed = time.perf_counter() - started
+        summary = summarize(records)
+        endings = ", ".join(f"{ending} {freq:.0%}" for ending, freq in summary['frequencies'].items() if freq)
+        print(f"{name}: {args.campaigns / elapsed:.0f} кампаний/с, в политике {policy.elapsed / elapsed:.2%} "
+              f"времени; {endings}")
+
+
+if __name__ == "__main__":
+    main()
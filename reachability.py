@@ -0,0 +1,251 @@
+# reachability.py
+"""Достижимость концовок из сохранения: ограниченный поиск по решениям игрока.
+
+Узел поиска - событие, ожидающее выбора. Для каждого варианта кампания
+копируется и доигрывается до следующего события, концовки или горизонта
+с samples разными seed. Случайность трактуется одним из двух способов:
+  sample      - концовка достижима, если её дает хотя бы одна выборка;
+  adversarial - вариант засчитывается, только если концовку дают все выборки.
+Результаты узлов запоминаются по квантованному ключу состояния
+(advisor.state_key), поэтому совпадающие после квантования состояния
+считаются одинаковыми - это приближение.
+
+Отсечение - по монотонным границам. Черты (humanism, cruelty, pragmatism,
+ideology) и счетчики концовок меняются только эффектами событий, население
+в симуляции не растет, события срабатывают по разу. Отсюда оптимистичные
+границы: текущее значение плюс лучший заявленный эффект каждого еще не
+сработавшего события. Если даже граница не дает условия концовки (или
+горизонт раньше нужного дня), ветка отбрасывается. Заявленные эффекты -
+надмножество применяемых в apply_event_choice, так что границы корректны.
+
+Запуск: python reachability.py saves/save_20240101_120000.json --mode adversarial
+"""
+import argparse
+import os
+import random
+import time
+
+from advisor import state_key
+from batch_runner import DEFAULT_SCENARIO, ENDINGS, get_policy
+from campaign import Campaign
+from save_system import SaveSystem
+
+MONOTONIC_STATS = ('population', 'humanism', 'cruelty', 'pragmatism', 'ideology',
+                   'executed_ministers', 'suppressed_rebellions', 'civilians_saved', 'peace_negotiations')
+
+# Условия концовок из GameState.check_*_conditions, проверяемые по границам:
+# концовка -> (минимальный день, [(параметр, отношение, порог)])
+REQUIREMENTS = {
+    'defense_miracle': (45, [('population', '>=', 12500)]),
+    'bloody_tyrant': (1, [('cruelty', '>', 80), ('executed_ministers', '>=', 5),
+                          ('suppressed_rebellions', '>=', 3)]),
+    'people_martyr': (1, [('humanism', '>', 70), ('civilians_saved', '>=', 1000)]),
+    'pragmatic_leader': (1, [('pragmatism', '>', 60), ('peace_negotiations', '>=', 2),
+                             ('population', '>=', 20000)]),
+    'idealist_fanatic': (1, [('ideology', '>', 75), ('cruelty', '<', 30)]),
+    'uprising': (1, []),
+}
+
+
+class ReachabilitySearch:
+    def __init__(self, campaign, horizon=None, mode="sample", samples=2, policy=None, seed=0, max_nodes=5000):
+        if mode not in ("sample", "adversarial"):
+            raise ValueError(f"Неизвестный режим: {mode}")
+        self.campaign = campaign
+        self.horizon = horizon or DEFAULT_SCENARIO['max_days']
+        self.mode = mode
+        self.samples = samples
+        self.policy = policy or get_policy(DEFAULT_SCENARIO['policy'])  # Здания и министры между событиями
+        self.rng = random.Random(seed)
+        self.max_nodes = max_nodes
+
+        # Лучшие заявленные прибавки и убавки по событиям: имя -> {параметр: (min, max)}
+        self.event_effects = {}
+        for event in campaign.events.events:
+            ranges = {}
+            for stat in MONOTONIC_STATS:
+                values = [choice.get("effects", {}).get(stat, 0) for choice in event.choices]
+                ranges[stat] = (min(0, min(values)), max(0, max(values)))
+            self.event_effects[event.name] = ranges
+
+        self.memo = {}  # Ключ состояния -> (искомые концовки, {концовка: свидетель})
+        self.found = {}  # Концовка -> свидетель из корня
+        self.nodes = 0
+        self.days = 0
+        self.truncated = False  # Поиск упирался в max_nodes
+        self.feasible_at_root = set()
+
+    def bounds(self, campaign):
+        """Нижние и верхние границы монотонных параметров до конца игры"""
+        state = campaign.game_state
+        lower = {stat: getattr(state, stat) for stat in MONOTONIC_STATS}
+        upper = dict(lower)
+        for name, ranges in self.event_effects.items():
+            if name in state.events_triggered:
+                continue
+            for stat, (low, high) in ranges.items():
+                lower[stat] += low
+                upper[stat] += high
+        return lower, upper
+
+    def feasible(self, campaign, targets):
+        """Концовки из targets, не исключенные границами"""
+        lower, upper = self.bounds(campaign)
+        result = set()
+        for ending in targets:
+            min_day, conditions = REQUIREMENTS[ending]
+            if self.horizon < min_day:
+                continue
+            if all(upper[stat] > threshold if op == '>' else
+                   upper[stat] >= threshold if op == '>=' else
+                   lower[stat] < threshold
+                   for stat, op, threshold in conditions):
+                result.add(ending)
+        return result
+
+    def run(self, targets=ENDINGS):
+        """Поиск от текущего состояния; возвращает {концовка: свидетель} для найденных.
+
+        Свидетель - список шагов (день, событие, номер варианта, текст варианта).
+        """
+        snapshot = self.campaign.snapshot()
+        self.feasible_at_root = self.feasible(self.campaign, targets)
+        if self.campaign.current_event is not None:
+            campaign = Campaign.from_snapshot(snapshot)
+            self.found.update(self.decide(campaign, campaign.current_event, self.feasible_at_root))
+            return self.found
+
+        # Состояние random в сохранении не хранится: до первого решения тоже несколько выборок
+        outcomes = []
+        for _ in range(self.samples):
+            campaign = Campaign.from_snapshot(snapshot)
+            campaign.reseed(self.rng.getrandbits(32))
+            outcomes.append(self.advance(campaign, self.feasible_at_root))
+        for ending in self.feasible_at_root:
+            witnesses = [outcome[ending] for outcome in outcomes if ending in outcome]
+            if witnesses and (self.mode == "sample" or len(witnesses) == self.samples):
+                self.found.setdefault(ending, witnesses[0])
+        return self.found
+
+    def advance(self, campaign, targets):
+        """Доигрывание до следующего решения; концовки, достижимые из него"""
+        state = campaign.game_state
+        while True:
+            if state.game_over:
+                ending = state.victory_type or state.defeat_reason
+                return {ending: []} if ending in targets else {}
+            if state.current_day > self.horizon:
+                return {}
+            targets = self.feasible(campaign, targets)
+            if not targets:
+                return {}
+            self.policy.manage_buildings(campaign)
+            self.policy.manage_ministers(campaign)
+            event = campaign.next_day()
+            self.days += 1
+            if event is not None and not state.game_over:
+                return self.decide(campaign, event, targets)
+
+    def decide(self, campaign, event, targets):
+        """Концовки, достижимые из события event при лучшем выборе"""
+        if self.mode == "sample":
+            targets = {ending for ending in targets if ending not in self.found}
+        targets = self.feasible(campaign, targets)
+        if not targets:
+            return {}
+
+        key = state_key(campaign, event)
+        searched, found = self.memo.get(key, (set(), {}))
+        missing = targets - searched
+        if not missing:
+            return {ending: witness for ending, witness in found.items() if ending in targets}
+        if self.nodes >= self.max_nodes:
+            self.truncated = True
+            return {ending: witness for ending, witness in found.items() if ending in targets}
+        self.nodes += 1
+
+        snapshot = campaign.snapshot()
+        day = campaign.game_state.current_day
+        remaining = set(missing)
+        for choice in range(len(event.choices)):
+            step = (day, event.name, choice, event.choices[choice]['text'])
+            outcomes = []
+            for _ in range(self.samples):
+                child = Campaign.from_snapshot(snapshot)
+                child.reseed(self.rng.getrandbits(32))
+                child.choose(choice)
+                outcome = self.advance(child, remaining)
+                outcomes.append(outcome)
+                if self.mode == "sample":
+                    for ending, witness in outcome.items():
+                        if ending in remaining:
+                            found[ending] = [step] + witness
+                            remaining.discard(ending)
+                            self.found.setdefault(ending, found[ending])
+                    if not remaining:
+                        break
+                elif not remaining & outcome.keys():
+                    break  # Одна выборка без концовок решает исход варианта
+            if self.mode == "adversarial":
+                for ending in list(remaining):
+                    if all(ending in outcome for outcome in outcomes) and len(outcomes) == self.samples:
+                        found[ending] = [step] + outcomes[0][ending]
+                        remaining.discard(ending)
+            if not remaining:
+                break
+
+        self.memo[key] = (searched | missing, found)
+        return {ending: witness for ending, witness in found.items() if ending in targets}
+
+
+def load_campaign(path, shelling=True):
+    save_data = SaveSystem(os.path.dirname(path) or ".").load_game(os.path.basename(path))
+    if save_data is None:
+        raise SystemExit(f"Сохранение не найдено: {path}")
+    campaign = Campaign(shelling=shelling)
+    campaign.load_save_data(save_data)
+    return campaign
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Достижимость концовок из сохранения")
+    parser.add_argument('save', help="файл сохранения")
+    parser.add_argument('--endings', help="концовки через запятую (по умолчанию все)")
+    parser.add_argument('--mode', choices=("sample", "adversarial"), default="sample")
+    parser.add_argument('--samples', type=int, default=2, help="выборок случайности на вариант")
+    parser.add_argument('--horizon', type=int, default=DEFAULT_SCENARIO['max_days'])
+    parser.add_argument('--max-nodes', type=int, default=5000)
+    parser.add_argument('--policy', default=DEFAULT_SCENARIO['policy'], help="здания и министры между событиями")
+    parser.add_argument('--no-shelling', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    targets = args.endings.split(",") if args.endings else list(ENDINGS)
+    unknown = set(targets) - set(REQUIREMENTS)
+    if unknown:
+        parser.error(f"неизвестные концовки: {', '.join(sorted(unknown))}")
+
+    campaign = load_campaign(args.save, shelling=not args.no_shelling)
+    search = ReachabilitySearch(campaign, args.horizon, args.mode, args.samples, get_policy(args.policy),
+                                args.seed, args.max_nodes)
+    started = time.perf_counter()
+    found = search.run(targets)
+    elapsed = time.perf_counter() - started
+
+    print(f"День {campaign.game_state.current_day}, горизонт {search.horizon}, режим {args.mode}")
+    for ending in targets:
+        if ending in found:
+            print(f"{ending}: достижима")
+            for day, event_name, choice, text in found[ending]:
+                print(f"    день {day}: {event_name} -> {choice + 1}. {text}")
+            if not found[ending]:
+                print("    без решений игрока")
+        elif ending not in search.feasible_at_root:
+            print(f"{ending}: недостижима (границы параметров)")
+        else:
+            print(f"{ending}: не найдена" + (" (поиск прерван по --max-nodes)" if search.truncated else ""))
+    print(f"Узлов: {search.nodes}, дней симуляции: {search.days}, {elapsed:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
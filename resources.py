@@ -1,40 +1,47 @@
+from balance import Balance
+
+
 class ResourceManager:
-    def __init__(self):
+    def __init__(self, balance=None):
+        self.balance = balance or Balance()
+
         # Стартовые ресурсы
         self.food = 5000
         self.ammunition = 10000
         self.fuel = 2000
         self.electricity = 100
 
-        # Производственные мощности
-        self.food_factory = 1
-        self.bakery = 2
-        self.underground_factory = 1
-        self.power_plant = 1
-        self.boiler_house = 1
-
         # Потребление
         self.food_consumption = 0
         self.ammo_consumption = 0
         self.fuel_consumption = 0
 
-    def calculate_daily_production(self, minister_efficiency):
-        """Расчет ежедневного производства - БАЛАНСИРОВКА"""
-        # Увеличенное производство для баланса
-        food_production = (self.food_factory * 300 + self.bakery * 150) * minister_efficiency.get('agriculture', 1.0)
-        ammo_production = self.underground_factory * 400 * minister_efficiency.get('industry', 1.0)
-        fuel_production = (self.boiler_house * 100 + self.power_plant * 50) * minister_efficiency.get('resources', 1.0)
-        electricity_production = self.power_plant * 200
+    def calculate_daily_production(self, minister_efficiency, building_capacity):
+        """Расчет ежедневного производства - БАЛАНСИРОВКА
+
+        building_capacity - суммарная мощность зданий по типам (BuildingManager.capacity_by_type)
+        """
+        balance = self.balance
+        food_capacity = building_capacity.get('food_production', 0.0)
+        ammo_capacity = building_capacity.get('military_production', 0.0)
+        fuel_capacity = building_capacity.get('fuel', 0.0)
+        power_capacity = building_capacity.get('power', 0.0)
+
+        food_production = food_capacity * balance.food_per_capacity * minister_efficiency.get('agriculture', 1.0)
+        ammo_production = ammo_capacity * balance.ammo_per_capacity * minister_efficiency.get('industry', 1.0)
+        fuel_production = (fuel_capacity * balance.fuel_per_capacity +
+                           power_capacity * balance.power_fuel_per_capacity) * minister_efficiency.get('resources', 1.0)
+        electricity_production = power_capacity * balance.electricity_per_capacity
 
         return food_production, ammo_production, fuel_production, electricity_production
 
     def calculate_daily_consumption(self, population, soldiers, battles_count, patrols, motorized_divisions):
         """Расчет ежедневного потребления - БАЛАНСИРОВКА"""
-        # Сбалансированное потребление
-        food_consumption = population * 0.03 + soldiers * 0.1  # Уменьшено потребление
-        ammo_consumption = battles_count * 200 + patrols * 50   # Уменьшено потребление
-        fuel_consumption = motorized_divisions * 50             # Уменьшено потребление
-        electricity_consumption = population * 0.005
+        balance = self.balance
+        food_consumption = population * balance.food_per_citizen + soldiers * balance.food_per_soldier
+        ammo_consumption = battles_count * balance.ammo_per_battle + patrols * balance.ammo_per_patrol
+        fuel_consumption = motorized_divisions * balance.fuel_per_motorized
+        electricity_consumption = population * balance.electricity_per_citizen
 
         self.food_consumption = food_consumption
         self.ammo_consumption = ammo_consumption
@@ -63,12 +70,7 @@ class ResourceManager:
             'food': self.food,
             'ammunition': self.ammunition,
             'fuel': self.fuel,
-            'electricity': self.electricity,
-            'food_factory': self.food_factory,
-            'bakery': self.bakery,
-            'underground_factory': self.underground_factory,
-            'power_plant': self.power_plant,
-            'boiler_house': self.boiler_house
+            'electricity': self.electricity
         }
 
     def from_dict(self, data):
@@ -0,0 +1,127 @@
+# result_cache.py
+"""Кэш результатов кампаний на диске с адресацией по содержимому.
+
+Ключ записи - (контекст, seed). Контекст - хеш всего, от чего зависит исход:
+данных сценария (министры, дивизии, здания, каталог событий, балансовые
+константы balance.py, настройки прогона), политики выбора и исходного кода
+модулей симуляции. Любая правка данных или кода дает новый контекст, и
+старые записи просто перестают находиться, а затем вытесняются.
+Хранилище - SQLite с ограничением размера и вытеснением давно не использованных записей.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+# Модули, код которых влияет на результат кампании
+SIMULATION_MODULES = ("campaign", "game_state", "balance", "resources", "buildings", "ministers", "military",
+                      "events", "triggers", "city_damage", "lanchester", "batch_runner", "policies",
+                      "scenario_data")
+
+
+def _digest(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False, default=repr).encode('utf-8')).hexdigest()
+
+
+def scenario_fingerprint(scenario=None):
+    """Хеш данных сценария и настроек прогона"""
+    from balance import Balance
+    from buildings import BuildingManager
+    from events import EventManager
+    from military import MilitaryManager
+    from ministers import MinisterManager
+
+    buildings = BuildingManager()
+    data = {
+        'ministers': MinisterManager().to_dict(),
+        'divisions': MilitaryManager().to_dict(),
+        'buildings': buildings.to_dict(),
+        'positions': {name: bld.position for name, bld in buildings.buildings.items()},
+        'events': [(event.name, event.description, event.choices) for event in EventManager().events],
+        'balance': Balance().to_dict(),
+        'scenario': scenario or {},
+    }
+    return _digest(data)
+
+
+def code_fingerprint(modules=SIMULATION_MODULES):
+    """Хеш исходного кода модулей симуляции"""
+    sha = hashlib.sha256()
+    for name in modules:
+        module = sys.modules.get(name) or __import__(name)
+        with open(module.__file__, 'rb') as f:
+            sha.update(name.encode('utf-8'))
+            sha.update(f.read())
+    return sha.hexdigest()
+
+
+def context_key(scenario, policy):
+    return _digest([scenario_fingerprint(scenario), str(policy), code_fingerprint()])
+
+
+class ResultCache:
+    """Записи кампаний в SQLite; при превышении max_bytes удаляются самые давние"""
+
+    def __init__(self, path=".campaign_cache.sqlite", max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.db = sqlite3.connect(path)
+        self.db.execute("""CREATE TABLE IF NOT EXISTS results (
+            context TEXT NOT NULL,
+            seed INTEGER NOT NULL,
+            record TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (context, seed))""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS results_lru ON results (last_used)")
+        self.db.commit()
+
+    def get_range(self, context, seeds):
+        """Найденные записи диапазона seed: {seed: запись}"""
+        query = "WHERE context = ? AND seed >= ? AND seed < ?"
+        params = (context, seeds.start, seeds.stop)
+        rows = self.db.execute(f"SELECT seed, record FROM results {query}", params).fetchall()
+        if rows:
+            self.db.execute(f"UPDATE results SET last_used = ? {query}", (time.time(),) + params)
+            self.db.commit()
+        found = {seed: json.loads(record) for seed, record in rows}
+        self.hits += len(found)
+        self.misses += len(seeds) - len(found)
+        return found
+
+    def put_many(self, context, records):
+        now = time.time()
+        rows = []
+        for record in records:
+            text = json.dumps(record, ensure_ascii=False)
+            rows.append((context, record[0], text, len(text), now))
+        self.db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", rows)
+        self.db.commit()
+        self.evict()
+
+    def total_bytes(self):
+        return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def evict(self):
+        """Удаление давно не использованных записей до укладывания в max_bytes"""
+        excess = self.total_bytes() - self.max_bytes
+        while excess > 0:
+            rows = self.db.execute("SELECT rowid, size FROM results ORDER BY last_used LIMIT 1000").fetchall()
+            victims = []
+            for rowid, size in rows:
+                if excess <= 0:
+                    break
+                victims.append((rowid,))
+                excess -= size
+            self.db.executemany("DELETE FROM results WHERE rowid = ?", victims)
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
@@ -6,17 +6,22 @@ from datetime import datetime
 class SaveSystem:
     def __init__(self, save_dir="saves"):
         self.save_dir = save_dir
+        self._manifest = None  # Кэш списка сохранений
         if not os.path.exists(save_dir):
             os.makedirs(save_dir)
 
-    def save_game(self, game_state, resources, buildings, ministers, military, filename=None):
-        """Сохранение игры"""
+    def save_game(self, game_state, resources, buildings, ministers, military, filename=None, extra=None):
+        """Сохранение игры; extra - дополнительные поля верхнего уровня"""
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"save_{timestamp}.json"
 
-        save_path = os.path.join(self.save_dir, filename)
+        save_data = self.build_save_data(game_state, resources, buildings, ministers, military, extra)
+        self.write_save(filename, self.encode(save_data))
+        return filename
 
+    def build_save_data(self, game_state, resources, buildings, ministers, military, extra=None):
+        """Данные сохранения без записи на диск"""
         save_data = {
             'timestamp': datetime.now().isoformat(),
             'game_state': game_state.to_dict(),
@@ -25,11 +30,19 @@ class SaveSystem:
             'ministers': ministers.to_dict(),
             'military': military.to_dict()
         }
+        if extra:
+            save_data.update(extra)
+        return save_data
 
-        with open(save_path, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, indent=2, ensure_ascii=False)
+    @staticmethod
+    def encode(save_data):
+        return json.dumps(save_data, indent=2, ensure_ascii=False)
 
-        return filename
+    def write_save(self, filename, text):
+        """Запись готового текста сохранения; не трогает объекты игры, можно звать из другого потока"""
+        with open(os.path.join(self.save_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(text)
+        self._manifest = None
 
     def load_game(self, filename):
         """Загрузка игры"""
@@ -43,8 +56,11 @@ class SaveSystem:
 
         return save_data
 
-    def list_saves(self):
-        """Список сохранений"""
+    def list_saves(self, refresh=False):
+        """Список сохранений (каталог сканируется один раз до следующего сохранения)"""
+        if self._manifest is not None and not refresh:
+            return list(self._manifest)
+
         saves = []
         for file in os.listdir(self.save_dir):
             if file.endswith('.json'):
@@ -57,4 +73,5 @@ class SaveSystem:
                         'day': data.get('game_state', {}).get('current_day', 1)
                     })
 
-        return sorted(saves, key=lambda x: x['timestamp'], reverse=True)
\ No newline at end of file
+        self._manifest = sorted(saves, key=lambda x: x['timestamp'], reverse=True)
+        return list(self._manifest)
\ No newline at end of file
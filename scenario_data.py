@@ -0,0 +1,175 @@
+# scenario_data.py
+"""Неизменяемые данные сценария в разделяемой памяти для пулов процессов.
+
+Имена, должности, фракции, навыки, параметры дивизий и координаты зданий
+один раз упаковываются в плоские массивы одного блока SharedMemory.
+Рабочие процессы подключаются к блоку по имени и собирают из него только
+изменяемые объекты своих кампаний, не вызывая initialize_*.
+
+Раскладка блока: заголовок из COUNT_FIELDS чисел int64, затем массивы
+в порядке _layout(); строки хранятся одной UTF-8 таблицей со смещениями.
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from buildings import Building, BuildingManager
+from military import Division, MilitaryManager
+from ministers import Minister, MinisterManager
+
+
+COUNT_FIELDS = ("strings", "text_bytes", "ministers", "max_skills", "divisions", "buildings")
+HEADER_SIZE = len(COUNT_FIELDS) * 8
+
+
+def _layout(counts):
+    """Массивы блока: (имя, тип, форма) в порядке размещения"""
+    ministers, max_skills = counts['ministers'], counts['max_skills']
+    return [
+        ('string_offsets', np.int64, (counts['strings'] + 1,)),
+        ('text', np.uint8, (counts['text_bytes'],)),
+        # Министры: индексы строк имени, должности, фракции; навыки - пары (строка, уровень), -1 = нет
+        ('minister_strings', np.int64, (ministers, 3)),
+        ('minister_loyalty', np.int64, (ministers,)),
+        ('minister_skill_names', np.int64, (ministers, max_skills)),
+        ('minister_skill_levels', np.int64, (ministers, max_skills)),
+        # Дивизии: имя, командир, тип; численность, опыт, мораль, снаряжение
+        ('division_strings', np.int64, (counts['divisions'], 3)),
+        ('division_stats', np.int64, (counts['divisions'], 4)),
+        # Здания: имя, тип; уровень; эффективность; координаты (-1 = нет)
+        ('building_strings', np.int64, (counts['buildings'], 2)),
+        ('building_levels', np.int64, (counts['buildings'],)),
+        ('building_efficiency', np.float64, (counts['buildings'],)),
+        ('building_positions', np.int64, (counts['buildings'], 2)),
+    ]
+
+
+def _array_sizes(counts):
+    return [(name, dtype, shape, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            for name, dtype, shape in _layout(counts)]
+
+
+class ScenarioCatalog:
+    """Каталог сценария поверх блока разделяемой памяти"""
+
+    def __init__(self, shm, owner=False):
+        self.shm = shm
+        self.owner = owner
+        header = np.ndarray((len(COUNT_FIELDS),), np.int64, shm.buf, 0)
+        self.counts = dict(zip(COUNT_FIELDS, (int(value) for value in header)))
+
+        self.arrays = {}
+        offset = HEADER_SIZE
+        for name, dtype, shape, size in _array_sizes(self.counts):
+            self.arrays[name] = np.ndarray(shape, dtype, shm.buf, offset)
+            offset += size
+
+        # Строки декодируются один раз на процесс
+        text = self.arrays['text'].tobytes()
+        offsets = self.arrays['string_offsets']
+        self.strings = [text[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(self.counts['strings'])]
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @classmethod
+    def create(cls):
+        """Упаковка стандартного сценария в новый блок разделяемой памяти"""
+        ministers = list(MinisterManager().ministers.values())
+        divisions = list(MilitaryManager().divisions.values())
+        buildings = list(BuildingManager().buildings.values())
+
+        strings = []
+        string_index = {}
+
+        def intern(text):
+            if text not in string_index:
+                string_index[text] = len(strings)
+                strings.append(text)
+            return string_index[text]
+
+        encoded = []
+        minister_rows = [(intern(m.name), intern(m.position), intern(m.faction)) for m in ministers]
+        skill_rows = [[(intern(skill), level) for skill, level in m.skills.items()] for m in ministers]
+        division_rows = [(intern(d.name), intern(d.commander), intern(d.type)) for d in divisions]
+        building_rows = [(intern(b.name), intern(b.type)) for b in buildings]
+        for text in strings:
+            encoded.append(text.encode('utf-8'))
+
+        counts = {
+            'strings': len(strings),
+            'text_bytes': sum(len(item) for item in encoded),
+            'ministers': len(ministers),
+            'max_skills': max((len(row) for row in skill_rows), default=0),
+            'divisions': len(divisions),
+            'buildings': len(buildings),
+        }
+        size = HEADER_SIZE + sum(item[3] for item in _array_sizes(counts))
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        np.ndarray((len(COUNT_FIELDS),), np.int64, shm.buf, 0)[:] = [counts[field] for field in COUNT_FIELDS]
+
+        offset = HEADER_SIZE
+        arrays = {}
+        for name, dtype, shape, array_size in _array_sizes(counts):
+            arrays[name] = np.ndarray(shape, dtype, shm.buf, offset)
+            offset += array_size
+
+        arrays['string_offsets'][:] = np.concatenate(([0], np.cumsum([len(item) for item in encoded])))
+        arrays['text'][:] = np.frombuffer(b''.join(encoded), np.uint8)
+        arrays['minister_strings'][:] = minister_rows
+        arrays['minister_loyalty'][:] = [m.loyalty for m in ministers]
+        arrays['minister_skill_names'][:] = -1
+        arrays['minister_skill_levels'][:] = -1
+        for row, skills in enumerate(skill_rows):
+            for column, (skill, level) in enumerate(skills):
+                arrays['minister_skill_names'][row, column] = skill
+                arrays['minister_skill_levels'][row, column] = level
+        arrays['division_strings'][:] = division_rows
+        arrays['division_stats'][:] = [(d.soldiers, d.experience, d.morale, d.equipment) for d in divisions]
+        arrays['building_strings'][:] = building_rows
+        arrays['building_levels'][:] = [b.level for b in buildings]
+        arrays['building_efficiency'][:] = [b.efficiency for b in buildings]
+        arrays['building_positions'][:] = [b.position if b.position else (-1, -1) for b in buildings]
+        del arrays  # Представления не должны держать буфер после закрытия
+
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        # Дочерние процессы пула делят с создателем resource_tracker, так что блок
+        # удаляется только создателем (close) или при завершении всего пула
+        return cls(shared_memory.SharedMemory(name=name))
+
+    def build_ministers(self):
+        strings = self.strings
+        names = self.arrays['minister_skill_names'].tolist()
+        levels = self.arrays['minister_skill_levels'].tolist()
+        ministers = []
+        for row, (name, position, faction) in enumerate(self.arrays['minister_strings'].tolist()):
+            skills = {strings[skill]: level for skill, level in zip(names[row], levels[row]) if skill >= 0}
+            ministers.append(Minister(strings[name], strings[position], skills,
+                                      int(self.arrays['minister_loyalty'][row]), strings[faction]))
+        return ministers
+
+    def build_divisions(self):
+        strings = self.strings
+        return [Division(strings[name], strings[commander], strings[division_type], *stats)
+                for (name, commander, division_type), stats in zip(self.arrays['division_strings'].tolist(),
+                                                                     self.arrays['division_stats'].tolist())]
+
+    def build_buildings(self):
+        strings = self.strings
+        buildings = []
+        for (name, building_type), level, efficiency, position in zip(
+                self.arrays['building_strings'].tolist(), self.arrays['building_levels'].tolist(),
+                self.arrays['building_efficiency'].tolist(), self.arrays['building_positions'].tolist()):
+            buildings.append(Building(strings[name], strings[building_type], level, efficiency,
+                                      position=tuple(position) if position[0] >= 0 else None))
+        return buildings
+
+    def close(self):
+        self.arrays = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
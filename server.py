@@ -0,0 +1,234 @@
+# server.py
+"""Сервер кампаний: много игр в одном процессе для плейтестов.
+
+Протокол - JSON по строкам через TCP или Unix-сокет. Запрос:
+    {"id": 1, "cmd": "new"}
+    {"id": 2, "cmd": "next_day", "session": "..."}
+    {"id": 3, "cmd": "choose", "session": "...", "choice": 0}
+    {"id": 4, "cmd": "state", "session": "..."}
+    {"id": 5, "cmd": "building", "session": "...", "building": "...", "action": "repair_building"}
+    {"id": 6, "cmd": "close", "session": "..."}
+    {"id": 7, "cmd": "stats"}
+Ответ - одна строка {"id": ..., "ok": true, ...} или {"id": ..., "ok": false, "error": "..."}.
+
+Простаивающие кампании сохраняются через SaveSystem и выгружаются из памяти;
+при следующем обращении сессия загружается обратно. Данные сохранения
+собираются в цикле событий, а запись на диск идет в пуле потоков; сессия,
+к которой обратились во время записи, просто остается в памяти.
+Неизменяемые каталог событий и сетка обстрела общие для всех сессий.
+Запуск: python server.py --port 7777 или python server.py --unix /tmp/reich.sock
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from functools import partial
+
+from campaign import Campaign
+from events import EventManager
+from save_system import SaveSystem
+
+
+class CampaignServer:
+    def __init__(self, save_dir="server_saves", idle_timeout=300.0, shelling=True):
+        self.save_system = SaveSystem(save_dir)
+        self.idle_timeout = idle_timeout
+        self.shelling = shelling
+        self.events = EventManager()  # Общий неизменяемый каталог событий
+        self.shelling_grid = None
+        if shelling:
+            from city_damage import ShellingGrid
+
+            self.shelling_grid = ShellingGrid()  # Общие ядро и веса обстрела
+        self.sessions = {}  # id -> Campaign
+        self.last_access = {}  # id -> время последней команды
+        self.evicted = set()
+        # id -> [future записи в пуле потоков, кампания]; кампания None, если сессию
+        # во время записи вернули в память или закрыли - тогда файл не нужен
+        self.saving = {}
+        self.requests = 0
+        self.started = time.perf_counter()
+
+        self.commands = {
+            'new': self.cmd_new,
+            'next_day': self.cmd_next_day,
+            'choose': self.cmd_choose,
+            'state': self.cmd_state,
+            'building': self.cmd_building,
+            'close': self.cmd_close,
+            'stats': self.cmd_stats,
+        }
+
+    def new_campaign(self):
+        return Campaign(events=self.events, shelling=self.shelling, shelling_grid=self.shelling_grid)
+
+    def get_session(self, session_id):
+        campaign = self.sessions.get(session_id)
+        if campaign is None:
+            pending = self.saving.get(session_id)
+            if pending is not None and pending[1] is not None:
+                # Запись еще идет: кампания возвращается в память без чтения файла
+                campaign, pending[1] = pending[1], None
+            elif session_id in self.evicted:
+                campaign = self.new_campaign()
+                campaign.load_save_data(self.save_system.load_game(f"{session_id}.json"))
+                self.evicted.discard(session_id)
+            else:
+                raise KeyError(f"Нет сессии {session_id}")
+            self.sessions[session_id] = campaign
+        self.last_access[session_id] = time.monotonic()
+        return campaign
+
+    def save_path(self, session_id):
+        return os.path.join(self.save_system.save_dir, f"{session_id}.json")
+
+    def evict_idle(self):
+        """Выгрузка кампаний, простаивающих дольше idle_timeout; сохранение - в пуле потоков"""
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() - self.idle_timeout
+        # Сессия с незаконченной прошлой записью ждет ее окончания
+        idle = [sid for sid, last in self.last_access.items()
+                if last < deadline and sid in self.sessions and sid not in self.saving]
+        for session_id in idle:
+            campaign = self.sessions.pop(session_id)
+            # Текст собирается здесь, поток пула только пишет его в файл
+            text = self.save_system.encode(campaign.save_data(self.save_system))
+            future = loop.run_in_executor(None, self.save_system.write_save, f"{session_id}.json", text)
+            future.add_done_callback(partial(self.finish_eviction, session_id))
+            self.saving[session_id] = [future, campaign]
+        return len(idle)
+
+    def finish_eviction(self, session_id, future):
+        campaign = self.saving.pop(session_id)[1]
+        if future.exception() is not None:
+            if campaign is not None:
+                # Сохранить не удалось - кампания остается в памяти
+                self.sessions[session_id] = campaign
+                self.last_access[session_id] = time.monotonic()
+        elif campaign is None:
+            # Сессию вернули в память или закрыли, пока шла запись
+            os.remove(self.save_path(session_id))
+        else:
+            self.evicted.add(session_id)
+
+    async def evict_loop(self):
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 4))
+            self.evict_idle()
+
+    def handle(self, request):
+        if not isinstance(request, dict):
+            raise ValueError("Запрос должен быть JSON-объектом")
+        command = self.commands.get(request.get('cmd'))
+        if command is None:
+            raise ValueError(f"Неизвестная команда {request.get('cmd')}")
+        return command(request)
+
+    def cmd_new(self, request):
+        session_id = uuid.uuid4().hex
+        self.sessions[session_id] = self.new_campaign()
+        self.last_access[session_id] = time.monotonic()
+        return {'session': session_id, 'state': self.sessions[session_id].summary()}
+
+    def cmd_next_day(self, request):
+        campaign = self.get_session(request['session'])
+        if campaign.current_event is not None:
+            raise ValueError("Сначала нужно ответить на событие")
+        if campaign.game_state.game_over:
+            raise ValueError("Игра окончена")
+        campaign.next_day()
+        return {'state': campaign.summary()}
+
+    def cmd_choose(self, request):
+        campaign = self.get_session(request['session'])
+        result = campaign.choose(int(request['choice']))
+        return {'result': result, 'state': campaign.summary()}
+
+    def cmd_state(self, request):
+        return {'state': self.get_session(request['session']).summary()}
+
+    def cmd_building(self, request):
+        campaign = self.get_session(request['session'])
+        return {'result': campaign.building_action(request['building'], request['action'])}
+
+    def cmd_close(self, request):
+        session_id = request['session']
+        self.sessions.pop(session_id, None)
+        self.last_access.pop(session_id, None)
+        if session_id in self.saving:
+            self.saving[session_id][1] = None  # Файл удалит finish_eviction
+        if session_id in self.evicted:
+            self.evicted.discard(session_id)
+            os.remove(self.save_path(session_id))
+        return {}
+
+    def cmd_stats(self, request):
+        return {
+            'resident': len(self.sessions),
+            'evicted': len(self.evicted),
+            'requests': self.requests,
+            'cpu_time': time.process_time(),
+            'uptime': time.perf_counter() - self.started
+        }
+
+    async def serve_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = {}
+                try:
+                    request = json.loads(line)
+                    response = self.handle(request)
+                    response['ok'] = True
+                except (KeyError, ValueError, TypeError) as error:
+                    response = {'ok': False, 'error': str(error)}
+                self.requests += 1
+                response['id'] = request.get('id') if isinstance(request, dict) else None
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve(self, host="127.0.0.1", port=7777, unix_path=None):
+        if unix_path:
+            server = await asyncio.start_unix_server(self.serve_client, path=unix_path, backlog=4096)
+        else:
+            server = await asyncio.start_server(self.serve_client, host, port, backlog=4096)
+        evictor = asyncio.ensure_future(self.evict_loop())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            evictor.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сервер кампаний Березовского Рейха")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--unix', help="путь к Unix-сокету вместо TCP")
+    parser.add_argument('--save-dir', default="server_saves")
+    parser.add_argument('--idle-timeout', type=float, default=300.0, help="секунд до выгрузки сессии")
+    parser.add_argument('--no-shelling', action='store_true', help="без модели обстрела (без NumPy)")
+    args = parser.parse_args()
+
+    server = CampaignServer(args.save_dir, args.idle_timeout, shelling=not args.no_shelling)
+    print(f"Сервер кампаний: {args.unix or f'{args.host}:{args.port}'}")
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
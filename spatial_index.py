@@ -0,0 +1,45 @@
+# spatial_index.py
+
+
+class SpatialHash:
+    """Равномерная сетка для поиска элементов интерфейса по точке.
+
+    Элементы регистрируются прямоугольником (x, y, ширина, высота); поиск
+    по точке смотрит только одну ячейку. При перекрытии побеждает элемент
+    с большим приоритетом, при равном - зарегистрированный позже.
+    """
+
+    def __init__(self, cell_size=50):
+        self.cell_size = cell_size
+        self.cells = {}
+        self._order = 0
+
+    def clear(self):
+        self.cells.clear()
+        self._order = 0
+
+    def insert(self, rect, payload, priority=0):
+        x, y, width, height = rect
+        if width <= 0 or height <= 0:
+            return
+        self._order += 1
+        entry = (priority, self._order, x, y, x + width, y + height, payload)
+
+        size = self.cell_size
+        for cell_x in range(x // size, (x + width - 1) // size + 1):
+            for cell_y in range(y // size, (y + height - 1) // size + 1):
+                self.cells.setdefault((cell_x, cell_y), []).append(entry)
+
+    def query_point(self, pos):
+        """Верхний элемент, содержащий точку, или None"""
+        x, y = pos
+        entries = self.cells.get((x // self.cell_size, y // self.cell_size))
+        if not entries:
+            return None
+
+        best = None
+        for entry in entries:
+            if entry[2] <= x < entry[4] and entry[3] <= y < entry[5]:
+                if best is None or entry[:2] > best[:2]:
+                    best = entry
+        return best[6] if best else None
@@ -0,0 +1,161 @@
+# splitting.py
+"""Оценка вероятностей редких концовок многоуровневым расщеплением.
+
+Функция оценки над GameState растет по мере приближения к концовке
+(1.0 - все условия выполнены). Уровни L1 < L2 < ... делят путь к концовке
+на этапы. На каждом этапе запускается effort траекторий из снимков,
+достигших предыдущего уровня (выбираются равновероятно с возвращением,
+каждая копия получает свой seed); доля p_i дошедших до следующего уровня
+оценивается независимо. Оценка P = p_1 * ... * p_k несмещенная
+(fixed-effort splitting), относительная дисперсия приближенно равна
+сумме (1 - p_i) / (effort * p_i).
+
+Уровни по умолчанию выбираются по квантилям максимальной оценки в
+отдельном пилотном прогоне, поэтому на основную оценку они не влияют.
+
+Запуск: python splitting.py uprising --by-day 12 --effort 200
+"""
+import argparse
+import math
+import random
+import time
+
+from batch_runner import DEFAULT_SCENARIO, advance_day
+from campaign import Campaign
+from events import EventManager
+
+
+def _fraction(value, target):
+    return max(0.0, min(1.0, value / target)) if target else 1.0
+
+
+# Оценки близости к концовкам по их условиям в GameState.check_*_conditions
+SCORES = {
+    'uprising': lambda gs: _fraction(100 - gs.morale, 90),
+    'defense_miracle': lambda gs: min(_fraction(gs.current_day, 45), _fraction(gs.population, 12500)),
+    'bloody_tyrant': lambda gs: min(_fraction(gs.cruelty, 80), _fraction(gs.executed_ministers, 5),
+                                    _fraction(gs.suppressed_rebellions, 3)),
+    'people_martyr': lambda gs: min(_fraction(gs.humanism, 70), _fraction(gs.civilians_saved, 1000),
+                                    _fraction(100 - gs.morale, 80)),
+    'pragmatic_leader': lambda gs: min(_fraction(gs.pragmatism, 60), _fraction(gs.peace_negotiations, 2),
+                                       _fraction(gs.population, 20000)),
+    'idealist_fanatic': lambda gs: min(_fraction(gs.ideology, 75), _fraction(gs.morale, 80),
+                                       _fraction(100 - gs.cruelty, 70)),
+}
+
+
+class SplittingEstimator:
+    def __init__(self, ending, by_day=None, scenario=None, effort=200, seed=0):
+        self.ending = ending
+        self.score = SCORES[ending]
+        self.scenario = dict(DEFAULT_SCENARIO, **(scenario or {}))
+        self.horizon = min(by_day or self.scenario['max_days'], self.scenario['max_days'])
+        self.effort = effort
+        self.rng = random.Random(seed)
+        self.events = EventManager()
+        self.campaigns = 0  # Запущенные траектории (для сравнения стоимости)
+        self.days = 0
+
+    def reached(self, state):
+        return state.game_over and (state.victory_type or state.defeat_reason) == self.ending
+
+    def new_campaign(self):
+        return Campaign(events=self.events, shelling=self.scenario['shelling'], seed=self.rng.getrandbits(32))
+
+    def run_segment(self, campaign, level):
+        """Продолжение траектории до уровня (True) или до конца игры/горизонта (False)"""
+        state = campaign.game_state
+        self.campaigns += 1
+        while True:
+            if self.reached(state) and state.current_day <= self.horizon + 1:
+                return True
+            if level is not None and self.score(state) >= level:
+                return True
+            if state.game_over or state.current_day > self.horizon:
+                return False
+            advance_day(campaign)
+            self.days += 1
+
+    def pilot_levels(self, runs=100, count=4):
+        """Уровни по квантилям максимальной оценки траекторий пилотного прогона"""
+        maxima = []
+        for _ in range(runs):
+            campaign = self.new_campaign()
+            state = campaign.game_state
+            best = self.score(state)
+            while not state.game_over and state.current_day <= self.horizon:
+                advance_day(campaign)
+                self.days += 1
+                best = max(best, self.score(state))
+            maxima.append(best)
+        maxima.sort()
+        levels = []
+        for i in range(1, count + 1):
+            level = maxima[min(len(maxima) - 1, int(len(maxima) * (1 - 0.5 ** i)))]
+            if level < 1.0 and (not levels or level > levels[-1]):
+                levels.append(level)
+        return levels
+
+    def estimate(self, levels=None):
+        """(оценка вероятности, стандартная ошибка, вероятности этапов)"""
+        if levels is None:
+            levels = self.pilot_levels()
+        stages = list(levels) + [None]  # Последний этап - сама концовка
+
+        starts = None  # Снимки, достигшие предыдущего уровня
+        stage_probabilities = []
+        for level in stages:
+            hits = []
+            for _ in range(self.effort):
+                if starts is None:
+                    campaign = self.new_campaign()
+                else:
+                    # Продолжение с копии снимка, без сборки новой кампании
+                    campaign = Campaign.from_snapshot(self.rng.choice(starts))
+                    campaign.reseed(self.rng.getrandbits(32))
+                if self.run_segment(campaign, level):
+                    hits.append(campaign.snapshot())
+            stage_probabilities.append(len(hits) / self.effort)
+            if not hits:
+                break
+            starts = hits
+
+        probability = math.prod(stage_probabilities) if len(stage_probabilities) == len(stages) else 0.0
+        relative_variance = sum((1 - p) / (self.effort * p) for p in stage_probabilities if p > 0)
+        return probability, probability * math.sqrt(relative_variance), stage_probabilities
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Вероятность редкой концовки методом расщепления")
+    parser.add_argument('ending', choices=sorted(SCORES))
+    parser.add_argument('--by-day', type=int, help="концовка не позже этого дня")
+    parser.add_argument('--effort', type=int, default=200, help="траекторий на этап")
+    parser.add_argument('--levels', help="уровни оценки через запятую, например 0.6,0.7,0.8")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    estimator = SplittingEstimator(args.ending, args.by_day, effort=args.effort, seed=args.seed)
+    levels = [float(value) for value in args.levels.split(",")] if args.levels else estimator.pilot_levels()
+    pilot_days = estimator.days
+    estimator.days = 0
+    estimator.campaigns = 0
+
+    started = time.perf_counter()
+    probability, error, stages = estimator.estimate(levels)
+    elapsed = time.perf_counter() - started
+
+    print(f"Концовка {args.ending}" + (f" до дня {args.by_day}" if args.by_day else ""))
+    print(f"Уровни: {', '.join(f'{level:.3f}' for level in levels)} (пилот: {pilot_days} дней)")
+    print(f"Вероятности этапов: {', '.join(f'{p:.3f}' for p in stages)}")
+    print(f"P = {probability:.3e} ± {error:.1e}; траекторий {estimator.campaigns}, "
+          f"дней {estimator.days}, {elapsed:.1f} с")
+    if probability > 0 and error > 0:
+        # Прямому методу для той же точности нужно p(1-p)/error^2 полных кампаний
+        direct = probability * (1 - probability) / error ** 2
+        print(f"Прямой Монте-Карло для той же точности: ~{direct:.0f} кампаний")
+    elif stages[-1:] == [0.0]:
+        print("Ни одна траектория не прошла последний этап - концовка не достигнута")
+
+
+if __name__ == "__main__":
+    main()
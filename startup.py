@@ -0,0 +1,47 @@
+# startup.py
+import threading
+import time
+
+
+class StartupLoader(threading.Thread):
+    """Фоновая загрузка игры по шагам, пока на экране заставка.
+
+    steps - список (название, функция); результат каждой функции сохраняется
+    в results под названием шага. Ошибка шага останавливает загрузку и
+    сохраняется в error, чтобы главный поток мог её пробросить.
+    """
+
+    def __init__(self, steps):
+        super().__init__(name="startup-loader", daemon=True)
+        self.steps = steps
+        self.results = {}
+        self.timings = {}
+        self.current_step = None
+        self.completed = 0
+        self.error = None
+        self.done = threading.Event()
+
+    @property
+    def progress(self):
+        return self.completed / len(self.steps) if self.steps else 1.0
+
+    def run(self):
+        try:
+            for name, step in self.steps:
+                self.current_step = name
+                started = time.perf_counter()
+                self.results[name] = step()
+                self.timings[name] = time.perf_counter() - started
+                self.completed += 1
+        except Exception as error:
+            self.error = error
+        finally:
+            self.current_step = None
+            self.done.set()
+
+    def result(self):
+        """Результаты загрузки; ошибку фонового потока пробрасывает в вызывающий"""
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.results
@@ -0,0 +1,57 @@
+# stopping.py
+"""Последовательная остановка прогонов по доверительным интервалам концовок.
+
+Для каждой концовки ведется интервал Уилсона для её вероятности. В отличие
+от нормального приближения он не схлопывается в ноль для редких концовок:
+при нуле наблюдений ширина убывает как z^2 / n, поэтому прогон не
+остановится раньше, чем отсутствие концовки станет статистически значимым.
+"""
+import math
+
+
+Z_BY_CONFIDENCE = {0.9: 1.6449, 0.95: 1.9600, 0.99: 2.5758}
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """Интервал Уилсона (нижняя, верхняя граница) для доли successes / trials"""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    z2 = z * z
+    denominator = 1 + z2 / trials
+    center = (p + z2 / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z2 / (4 * trials * trials)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+class EndingIntervals:
+    """Счетчики концовок и критерий остановки: все интервалы уже target_width"""
+
+    def __init__(self, endings, target_width=0.01, confidence=0.95, min_campaigns=100):
+        self.endings = endings
+        self.target_width = target_width
+        self.z = Z_BY_CONFIDENCE.get(confidence, 1.96)
+        self.min_campaigns = min_campaigns
+        self.counts = dict.fromkeys(endings, 0)
+        self.trials = 0
+
+    def add(self, ending):
+        self.trials += 1
+        if ending in self.counts:
+            self.counts[ending] += 1
+
+    def interval(self, ending):
+        return wilson_interval(self.counts[ending], self.trials, self.z)
+
+    def widest(self):
+        """(концовка, ширина) самого широкого интервала"""
+        widths = {ending: self.interval(ending)[1] - self.interval(ending)[0] for ending in self.endings}
+        ending = max(widths, key=widths.get)
+        return ending, widths[ending]
+
+    def converged(self):
+        return self.trials >= self.min_campaigns and self.widest()[1] <= self.target_width
+
+    def report(self):
+        return {ending: (self.counts[ending] / self.trials if self.trials else 0.0,) + self.interval(ending)
+                for ending in self.endings}
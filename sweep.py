@@ -0,0 +1,125 @@
+# sweep.py
+"""Перебор балансовых параметров: сетка или латинский гиперкуб.
+
+Каждая точка плана - набор переопределений balance.DEFAULTS. Все точки
+прогоняются на одном и том же наборе seed (общие случайные числа), так что
+различия между точками отражают параметры, а не шум выборки. Задания
+(точка, часть seed) раздаются общему пулу рабочих; итог - таблица частот
+концовок по точкам, в консоль или в CSV.
+
+Запуск:
+    python sweep.py --grid food_per_soldier=0.08,0.1,0.12 --grid morale_per_battle=0.2,0.3
+    python sweep.py --lhs enemy_attack_factor=0.05:0.2 --lhs ammo_per_battle=100:300 --points 1000
+"""
+import argparse
+import csv
+import itertools
+import random
+import sys
+import time
+
+from balance import DEFAULTS
+from batch_runner import DEFAULT_SCENARIO, ENDINGS, WorkerPool, chunk_range, run_seeds, summarize
+
+
+def grid_design(axes):
+    """Все сочетания значений: axes - {параметр: [значения]}"""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+
+
+def lhs_design(bounds, points, seed=0):
+    """Латинский гиперкуб: по каждому параметру ровно одна точка в каждой из points полос"""
+    rng = random.Random(seed)
+    columns = {}
+    for name, (low, high) in bounds.items():
+        strata = list(range(points))
+        rng.shuffle(strata)
+        columns[name] = [low + (stratum + rng.random()) / points * (high - low) for stratum in strata]
+    return [{name: columns[name][i] for name in bounds} for i in range(points)]
+
+
+def _run_point_chunk(args):
+    index, scenario, seeds = args
+    return index, run_seeds(seeds, scenario)
+
+
+def run_sweep(design, seeds, scenario=None, workers=None, chunk_size=50):
+    """Частоты концовок для каждой точки плана на общем наборе seed"""
+    base = dict(DEFAULT_SCENARIO, **(scenario or {}))
+    tasks = [(index, dict(base, balance=overrides), chunk)
+             for index, overrides in enumerate(design)
+             for chunk in chunk_range(seeds, chunk_size)]
+    records = [[] for _ in design]
+
+    if workers == 1:
+        for task in tasks:
+            index, chunk_records = _run_point_chunk(task)
+            records[index].extend(chunk_records)
+    else:
+        with WorkerPool(workers) as pool:
+            for index, chunk_records in pool.pool.imap_unordered(_run_point_chunk, tasks):
+                records[index].extend(chunk_records)
+
+    return [summarize(point_records) for point_records in records]
+
+
+def parse_axes(items, parse):
+    axes = {}
+    for item in items or ():
+        name, values = item.split("=", 1)
+        if name not in DEFAULTS:
+            raise SystemExit(f"Неизвестный параметр баланса: {name}")
+        axes[name] = parse(values)
+    return axes
+
+
+def write_table(design, summaries, output):
+    names = list(design[0]) if design else []
+    writer = csv.writer(output)
+    writer.writerow(names + ["campaigns"] + list(ENDINGS) + ["mean_day"])
+    for overrides, summary in zip(design, summaries):
+        writer.writerow([f"{overrides[name]:.6g}" for name in names] + [summary['campaigns']] +
+                        [f"{summary['frequencies'].get(ending, 0.0):.4f}" for ending in ENDINGS] +
+                        [f"{summary['mean_day']:.2f}"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Перебор балансовых параметров")
+    parser.add_argument('--grid', action='append', help="параметр=значение1,значение2,...")
+    parser.add_argument('--lhs', action='append', help="параметр=нижняя:верхняя граница")
+    parser.add_argument('--points', type=int, default=100, help="точек латинского гиперкуба")
+    parser.add_argument('--seeds-per-point', type=int, default=100)
+    parser.add_argument('--max-days', type=int, default=DEFAULT_SCENARIO['max_days'])
+    parser.add_argument('--no-shelling', action='store_true')
+    parser.add_argument('--policy', default=DEFAULT_SCENARIO['policy'])
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0, help="seed плана гиперкуба")
+    parser.add_argument('--output', help="файл CSV (по умолчанию - консоль)")
+    args = parser.parse_args()
+
+    if args.grid:
+        design = grid_design(parse_axes(args.grid, lambda text: [float(v) for v in text.split(",")]))
+    elif args.lhs:
+        bounds = parse_axes(args.lhs, lambda text: tuple(float(v) for v in text.split(":")))
+        design = lhs_design(bounds, args.points, args.seed)
+    else:
+        parser.error("нужен --grid или --lhs")
+
+    scenario = {'max_days': args.max_days, 'shelling': not args.no_shelling, 'policy': args.policy}
+    started = time.perf_counter()
+    summaries = run_sweep(design, range(args.seeds_per_point), scenario, args.workers)
+    elapsed = time.perf_counter() - started
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as f:
+            write_table(design, summaries, f)
+    else:
+        write_table(design, summaries, sys.stdout)
+    campaigns = len(design) * args.seeds_per_point
+    print(f"Точек: {len(design)}, кампаний: {campaigns}, {elapsed:.1f} с ({campaigns / elapsed:.0f} кампаний/с)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+# Новости дня после Campaign.daily_update
+from campaign import Campaign
+
+
+def test_shelling_news_survives_day_change(monkeypatch):
+    campaign = Campaign(seed=1)
+    building = next(iter(campaign.buildings.buildings.values()))
+    monkeypatch.setattr(campaign.city_damage, "apply_daily_shelling", lambda enemy_force: [building])
+
+    campaign.daily_update()
+
+    assert f"Здание {building.name} разрушено обстрелом" in campaign.game_state.daily_news
@@ -0,0 +1,30 @@
+# Сравнение стохастической и ланчестерской моделей боя
+import math
+import random
+
+import pytest
+
+from lanchester import compare_models
+from military import MilitaryManager
+from resources import ResourceManager
+
+SAMPLES = 2000
+Z_LIMIT = 3.0  # Двусторонний z-критерий, уровень ~0.3%
+RELATIVE_TOLERANCE = 0.05
+
+
+@pytest.fixture(scope="module")
+def stats():
+    random.seed(2024)
+    return compare_models(MilitaryManager, ResourceManager(), samples=SAMPLES)
+
+
+@pytest.mark.parametrize("side", ["defender", "attacker"])
+def test_mean_casualties_agree(stats, side):
+    stochastic, lanchester = stats["stochastic"], stats["lanchester"]
+    mean_a, mean_b = stochastic[f"{side}_mean"], lanchester[f"{side}_mean"]
+    std_a, std_b = stochastic[f"{side}_std"], lanchester[f"{side}_std"]
+
+    z = (mean_a - mean_b) / math.sqrt((std_a ** 2 + std_b ** 2) / SAMPLES)
+    assert abs(z) < Z_LIMIT
+    assert abs(mean_a - mean_b) <= RELATIVE_TOLERANCE * mean_a
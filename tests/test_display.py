@@ -0,0 +1,38 @@
+# Программное масштабирование холста: поля вокруг и смена размера окна
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from display import Display
+
+
+@pytest.fixture
+def display():
+    pygame.display.init()
+    yield Display((100, 50), window_size=(300, 200), hardware=False)
+    pygame.display.quit()
+
+
+def test_clicks_on_letterbox_are_outside_canvas(display):
+    # Масштаб 3: холст 300x150 с полями по 25 пикселей сверху и снизу
+    assert display.offset == (0, 25)
+    assert display.to_logical((150, 10)) is None
+    assert display.to_logical((150, 190)) is None
+    assert display.to_logical((0, 25)) == (0, 0)
+    assert display.to_logical((299, 174)) == (99, 49)
+
+
+def test_resize_keeps_fullscreen(monkeypatch):
+    pygame.display.init()
+    display = Display((100, 50), fullscreen=True, window_size=(300, 200), hardware=False)
+    calls = []
+    set_mode = pygame.display.set_mode
+    monkeypatch.setattr(pygame.display, "set_mode", lambda size, flags=0: calls.append(flags) or set_mode(size))
+
+    display.handle_resize((400, 200))
+    pygame.display.quit()
+
+    assert calls == [pygame.FULLSCREEN | pygame.RESIZABLE]
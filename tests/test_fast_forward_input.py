@@ -0,0 +1,36 @@
+# Ввод в кадре, где началась перемотка, не должен трогать кампанию
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+
+def test_click_after_fast_forward_key_is_ignored(tmp_path, monkeypatch):
+    import main
+
+    monkeypatch.chdir(tmp_path)
+    game = main.BerezovskyReichGame()
+    game.finish_startup()
+
+    started, clicks, updates = [], [], []
+
+    def start_fast_forward(days=main.FAST_FORWARD_DAYS):
+        started.append(days)
+        game.fast_forward = object()
+
+    monkeypatch.setattr(game, "start_fast_forward", start_fast_forward)
+    monkeypatch.setattr(game, "update_fast_forward", lambda: False)
+    monkeypatch.setattr(game.ui, "handle_click", lambda *args: clicks.append(args) or "next_day")
+    monkeypatch.setattr(game, "daily_update", lambda: updates.append(1) or [])
+
+    pygame.event.clear()
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_f, mod=0, unicode="f", scancode=0))
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(0, 0)))
+    game.run()
+
+    assert started
+    assert not clicks
+    assert not updates
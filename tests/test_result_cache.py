@@ -0,0 +1,29 @@
+# Кэш результатов: правка кода симуляции делает старые записи ненаходимыми
+import shutil
+
+import policies
+import result_cache
+from result_cache import ResultCache, context_key
+
+
+def test_edited_policies_module_misses_cache(tmp_path, monkeypatch):
+    source = tmp_path / "policies.py"
+    shutil.copy(policies.__file__, source)
+    monkeypatch.setattr(policies, "__file__", str(source))
+
+    cache = ResultCache(str(tmp_path / "cache.sqlite"))
+    before = context_key({'max_days': 10}, "greedy_morale")
+    cache.put_many(before, [(0, "uprising")])
+    assert cache.get_range(before, range(0, 1)) == {0: [0, "uprising"]}
+
+    with open(source, "a", encoding="utf-8") as f:
+        f.write("\n# Правка политики\n")
+    after = context_key({'max_days': 10}, "greedy_morale")
+    assert after != before
+    assert cache.get_range(after, range(0, 1)) == {}
+    cache.close()
+
+
+def test_simulation_modules_cover_policies_and_scenario_data():
+    assert "policies" in result_cache.SIMULATION_MODULES
+    assert "scenario_data" in result_cache.SIMULATION_MODULES
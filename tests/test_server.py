@@ -0,0 +1,67 @@
+# Сервер кампаний: выгрузка сессий и общие неизменяемые данные
+import asyncio
+import os
+import threading
+
+import pytest
+
+from server import CampaignServer
+
+
+def make_server(tmp_path, monkeypatch):
+    """Сервер с записью сохранений, которая ждет release"""
+    server = CampaignServer(str(tmp_path), idle_timeout=0.0)
+    release = threading.Event()
+    write_save = server.save_system.write_save
+
+    def slow_write(filename, text):
+        release.wait(5)
+        write_save(filename, text)
+
+    monkeypatch.setattr(server.save_system, "write_save", slow_write)
+    return server, release
+
+
+async def evict_and_finish(server, release, action):
+    session_id = server.cmd_new({})['session']
+    assert server.evict_idle() == 1
+    future = server.saving[session_id][0]
+    result = action(session_id)
+    release.set()
+    await future
+    await asyncio.sleep(0)  # finish_eviction - колбэк future
+    return session_id, result
+
+
+def test_close_during_save_removes_file(tmp_path, monkeypatch):
+    server, release = make_server(tmp_path, monkeypatch)
+    session_id, _ = asyncio.run(evict_and_finish(server, release, lambda sid: server.cmd_close({'session': sid})))
+
+    assert not os.path.exists(server.save_path(session_id))
+    assert session_id not in server.evicted
+    with pytest.raises(KeyError):
+        server.get_session(session_id)
+
+
+def test_session_requested_during_save_stays_resident(tmp_path, monkeypatch):
+    server, release = make_server(tmp_path, monkeypatch)
+    session_id, campaign = asyncio.run(evict_and_finish(server, release, server.get_session))
+
+    assert server.sessions[session_id] is campaign
+    assert session_id not in server.evicted
+    assert not os.path.exists(server.save_path(session_id))
+
+
+def test_sessions_share_shelling_grid(tmp_path):
+    server = CampaignServer(str(tmp_path))
+    first = server.get_session(server.cmd_new({})['session'])
+    second = server.get_session(server.cmd_new({})['session'])
+
+    assert first.city_damage.grid is second.city_damage.grid is server.shelling_grid
+    assert first.snapshot()[0].city_damage.grid is server.shelling_grid
+
+
+@pytest.mark.parametrize("request_data", [[1], "x", 5])
+def test_non_object_request_is_rejected(tmp_path, request_data):
+    with pytest.raises(ValueError):
+        CampaignServer(str(tmp_path), shelling=False).handle(request_data)
@@ -0,0 +1,145 @@
+# triggers.py
+import bisect
+import operator
+
+# Операции сравнения, допустимые в триггерах
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# Разбор старых текстовых триггеров: (ключевые слова, источник, параметр, операция, порог)
+LEGACY_PATTERNS = [
+    (("мораль", "низк"), "game_state", "morale", "<", 30),
+    (("еда",), "resources", "food", "<", 500),
+]
+
+
+def parse_trigger(trigger):
+    """Приведение триггера к структурной форме.
+
+    Структурный триггер - словарь вида
+    {"source": "game_state", "var": "morale", "op": "<", "value": 30, "text": "..."}.
+    Текстовый триггер разбирается по ключевым словам и может дать несколько условий.
+    """
+    if isinstance(trigger, dict):
+        spec = dict(trigger)
+        spec.setdefault("source", "game_state")
+        spec.setdefault("text", f"{spec['var']} {spec['op']} {spec['value']}")
+        if spec["op"] not in OPERATORS:
+            raise ValueError(f"Неизвестная операция триггера: {spec['op']}")
+        return [spec]
+
+    specs = []
+    for keywords, source, var, op, value in LEGACY_PATTERNS:
+        if all(word in trigger for word in keywords):
+            specs.append({"source": source, "var": var, "op": op, "value": value, "text": trigger})
+    return specs
+
+
+class CompiledTrigger:
+    """Триггер министра, скомпилированный в предикат от значения параметра"""
+
+    def __init__(self, minister_name, spec):
+        self.minister_name = minister_name
+        self.source = spec["source"]
+        self.var = spec["var"]
+        self.op = spec["op"]
+        self.threshold = spec["value"]
+        self.message = f"{minister_name}: {spec['text']}"
+
+        compare = OPERATORS[self.op]
+        threshold = self.threshold
+        self.predicate = lambda value: compare(value, threshold)
+
+    @property
+    def key(self):
+        return self.source, self.var
+
+
+def compile_triggers(minister):
+    """Компиляция всех триггеров министра"""
+    compiled = []
+    for trigger in minister.triggers:
+        for spec in parse_trigger(trigger):
+            compiled.append(CompiledTrigger(minister.name, spec))
+    return compiled
+
+
+class _TriggerGroup:
+    """Триггеры одного параметра, упорядоченные по порогу"""
+
+    def __init__(self):
+        self.below = []  # "<" и "<=": по убыванию порога
+        self.below_keys = []
+        self.above = []  # ">" и ">=": по возрастанию порога
+        self.above_keys = []
+        self.other = []  # "==" и "!=" проверяются целиком
+
+    def add(self, trigger):
+        if trigger.op in ("<", "<="):
+            index = bisect.bisect_right(self.below_keys, -trigger.threshold)
+            self.below_keys.insert(index, -trigger.threshold)
+            self.below.insert(index, trigger)
+        elif trigger.op in (">", ">="):
+            index = bisect.bisect_right(self.above_keys, trigger.threshold)
+            self.above_keys.insert(index, trigger.threshold)
+            self.above.insert(index, trigger)
+        else:
+            self.other.append(trigger)
+
+    def remove_minister(self, minister_name):
+        for triggers, keys in ((self.below, self.below_keys), (self.above, self.above_keys)):
+            for i in range(len(triggers) - 1, -1, -1):
+                if triggers[i].minister_name == minister_name:
+                    del triggers[i]
+                    del keys[i]
+        self.other = [t for t in self.other if t.minister_name != minister_name]
+
+    def fire(self, value, fired):
+        # Пороги отсортированы, поэтому проверка останавливается на первом недостижимом
+        for trigger in self.below:
+            if trigger.threshold < value:
+                break
+            if trigger.predicate(value):
+                fired.append(trigger.message)
+        for trigger in self.above:
+            if trigger.threshold > value:
+                break
+            if trigger.predicate(value):
+                fired.append(trigger.message)
+        for trigger in self.other:
+            if trigger.predicate(value):
+                fired.append(trigger.message)
+
+
+class TriggerIndex:
+    """Индекс триггеров всех министров, сгруппированный по проверяемому параметру"""
+
+    def __init__(self):
+        self.groups = {}  # (источник, параметр) -> _TriggerGroup
+
+    def add_minister(self, minister):
+        """Регистрация (или перерегистрация) триггеров министра; при замене minister.triggers индекс обновляется"""
+        self.remove_minister(minister.name)
+        minister._trigger_index = self
+        for trigger in minister.compiled_triggers:
+            self.groups.setdefault(trigger.key, _TriggerGroup()).add(trigger)
+
+    def remove_minister(self, minister_name):
+        for group in self.groups.values():
+            group.remove_minister(minister_name)
+
+    def evaluate(self, sources):
+        """Один проход по каждому параметру; sources - {"game_state": ..., "resources": ...}"""
+        fired = []
+        for (source, var), group in self.groups.items():
+            obj = sources.get(source)
+            if obj is None:
+                continue
+            group.fire(getattr(obj, var), fired)
+        return fired
@@ -1,6 +1,14 @@
 import pygame
 import os
 
+from assets import TextureAtlas, bake_panel_chrome, prepare_surface
+from display import Display
+from spatial_index import SpatialHash
+from virtual_list import VirtualListModel, RowSurfaceCache
+
+
+WINDOW_TITLE = "Березовский Рейх: Последний Рубеж v1.1.2А"
+
 
 class Colors:
     DARK_GRAY = (40, 40, 40)
@@ -41,17 +49,27 @@ class Button:
         self.current_color = color
         self.is_hovered = False
         self.action = action  # Новое поле для действия кнопки
+        self._surfaces = {}  # (цвет, текст) -> готовая поверхность кнопки
 
-    def draw(self, screen, fonts):
-        pygame.draw.rect(screen, self.current_color, self.rect)
-        pygame.draw.rect(screen, Colors.WHITE, self.rect, 2)
+    def render(self, fonts):
+        surface = pygame.Surface(self.rect.size)
+        local_rect = surface.get_rect()
+        pygame.draw.rect(surface, self.current_color, local_rect)
+        pygame.draw.rect(surface, Colors.WHITE, local_rect, 2)
 
         text_surf = fonts.medium.render(self.text, True, Colors.WHITE)
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        screen.blit(text_surf, text_rect)
+        surface.blit(text_surf, text_surf.get_rect(center=local_rect.center))
+        return prepare_surface(surface)
+
+    def draw(self, screen, fonts):
+        key = (self.current_color, self.text)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self._surfaces[key] = self.render(fonts)
+        screen.blit(surface, self.rect)
 
     def update(self, mouse_pos):
-        self.is_hovered = self.rect.collidepoint(mouse_pos)
+        self.is_hovered = mouse_pos is not None and bool(self.rect.collidepoint(mouse_pos))
         self.current_color = self.hover_color if self.is_hovered else self.color
         return self.is_hovered
 
@@ -66,66 +84,90 @@ class Panel:
         self.rect = pygame.Rect(x, y, width, height)
         self.title = title
         self.visible = True
+        self.chrome = None  # Фон, рамка и заголовок, запеченные в одну поверхность
+
+    def bake(self, fonts):
+        """Запекание статичной части панели (при раскладке или первой отрисовке)"""
+        self.chrome = bake_panel_chrome(self.rect.size, self.title, fonts,
+                                        Colors.DARK_GRAY, Colors.LIGHT_GRAY, Colors.WHITE)
 
     def draw(self, screen, fonts):
         """Отрисовка панели"""
         if not self.visible:
             return
 
-        # Фон панели
-        pygame.draw.rect(screen, Colors.DARK_GRAY, self.rect)
-        pygame.draw.rect(screen, Colors.LIGHT_GRAY, self.rect, 2)
-
-        # Заголовок
-        if self.title:
-            title_surf = fonts.medium.render(self.title, True, Colors.WHITE)
-            screen.blit(title_surf, (self.rect.x + 10, self.rect.y + 10))
+        if self.chrome is None:
+            self.bake(fonts)
+        screen.blit(self.chrome, self.rect)
 
 
 class ResourcePanel(Panel):
     """Панель ресурсов"""
 
-    def __init__(self, x, y, width, height):
+    def __init__(self, x, y, width, height, atlas=None):
         super().__init__(x, y, width, height, "Ресурсы Рейха")
         self.resource_data = {}
+        self.shortage = {}  # Название ресурса -> дни до нехватки из ResourceForecast
+        self.atlas = atlas or TextureAtlas()
 
-    def update_resources(self, resources):
-        """Обновление данных о ресурсах"""
+    def update_resources(self, resources, shortage=None):
+        """Обновление данных о ресурсах; shortage - ResourceForecast.shortage"""
         self.resource_data = {
             "Продовольствие": resources.food,
             "Боеприпасы": resources.ammunition,
             "Топливо": resources.fuel,
             "Электричество": resources.electricity
         }
+        shortage = shortage or {}
+        self.shortage = {
+            "Продовольствие": shortage.get('food'),
+            "Боеприпасы": shortage.get('ammunition'),
+            "Топливо": shortage.get('fuel')
+        }
 
     def draw(self, screen, fonts):
         super().draw(screen, fonts)
 
         y_offset = 50
         for resource, amount in self.resource_data.items():
-            # Иконка ресурса (простой прямоугольник)
-            icon_rect = pygame.Rect(self.rect.x + 15, self.rect.y + y_offset, 20, 20)
-            color = Colors.GREEN if "Продовольствие" in resource else \
-                Colors.RED if "Боеприпасы" in resource else \
-                    Colors.YELLOW if "Топливо" in resource else Colors.BLUE
+            # Иконка и текст ресурса - один спрайт из атласа
+            text = f"{resource}: {int(amount)}"
+            days = self.shortage.get(resource)
+            if days:
+                earliest, _, latest = days
+                text += f" ({earliest} дн.)" if earliest == latest else f" ({earliest}-{latest or '?'} дн.)"
+            self.atlas.blit(screen, ("resource", text), lambda: self.render_line(resource, text, fonts, days),
+                            (self.rect.x + 15, self.rect.y + y_offset))
+            y_offset += 30
 
-            pygame.draw.rect(screen, color, icon_rect)
-            pygame.draw.rect(screen, Colors.WHITE, icon_rect, 1)
+    @staticmethod
+    def render_line(resource, text, fonts, shortage=None):
+        # Нехватка в ближайшую неделю выделяется цветом
+        color = Colors.RED if shortage and shortage[0] <= 7 else Colors.WHITE
+        text_surf = fonts.small.render(text, True, color)
+        line = pygame.Surface((30 + text_surf.get_width(), max(20, text_surf.get_height())), pygame.SRCALPHA)
 
-            # Текст
-            text = f"{resource}: {int(amount)}"
-            text_surf = fonts.small.render(text, True, Colors.WHITE)
-            screen.blit(text_surf, (self.rect.x + 45, self.rect.y + y_offset))
+        # Иконка ресурса (простой прямоугольник)
+        icon_rect = pygame.Rect(0, 0, 20, 20)
+        color = Colors.GREEN if "Продовольствие" in resource else \
+            Colors.RED if "Боеприпасы" in resource else \
+                Colors.YELLOW if "Топливо" in resource else Colors.BLUE
 
-            y_offset += 30
+        pygame.draw.rect(line, color, icon_rect)
+        pygame.draw.rect(line, Colors.WHITE, icon_rect, 1)
+
+        # Текст
+        line.blit(text_surf, (30, 0))
+        return line
 
 
 class StatusPanel(Panel):
     """Панель статуса"""
 
-    def __init__(self, x, y, width, height):
+    def __init__(self, x, y, width, height, atlas=None):
         super().__init__(x, y, width, height, "Статус Рейха")
         self.status_data = {}
+        self.atlas = atlas or TextureAtlas()
 
     def update_status(self, game_state, military):
         """Обновление статуса"""
@@ -144,36 +186,23 @@ class StatusPanel(Panel):
         y_offset = 50
         for stat, value in self.status_data.items():
             text = f"{stat}: {value}"
-            text_surf = fonts.small.render(text, True, Colors.WHITE)
-            screen.blit(text_surf, (self.rect.x + 15, self.rect.y + y_offset))
+            self.atlas.blit(screen, ("label", text), lambda: fonts.small.render(text, True, Colors.WHITE),
+                            (self.rect.x + 15, self.rect.y + y_offset))
             y_offset += 25
 
 class MapPanel(Panel):
-    def __init__(self, x, y, width, height):
+    def __init__(self, x, y, width, height, atlas=None):
         super().__init__(x, y, width, height, "Карта Центрального Района")
+        self.atlas = atlas or TextureAtlas()
         self.buildings = []
         self.selected_building = None
+        self.hovered_building = None
+        self.layout_version = 0
 
     def initialize_buildings(self, building_manager):
         """Инициализация зданий на карте"""
         self.buildings = []
 
-        # Позиции зданий на карте (относительные координаты в масштабе 1px = 10 метров)
-        building_positions = {
-            "Рейхстаг": (300, 200),  # центр
-            "Отделение СС": (250, 200),  # 65 метров к востоку
-            "Электростанция": (150, 350),  # 620 метров северо-запад (62px по x, 62px по y)
-            "Завод продуктов": (450, 200),  # 770 метров к востоку
-            "Пекарня": (350, 169),  # 310 метров северо-запад (31px по x, 31px по y)
-            "Котельная": (400, 144),  # 560 метров к северу
-            "Подземная фабрика": (300, 144),  # 140 метров к югу
-            "Больница": (150, 200),  # 400 метров к западу
-            "Пожарная часть": (400, 250),  # 310 метров к востоку
-            "Церковь Св. Николая": (550, 200),  # 1.2 км к востоку
-            "АЗС": (410, 90),  # 1.1 км к востоку
-            "Церковь Покрова": (300, 300),  # 860 метров к северу
-        }
-
         # Сокращенные названия для отображения
         short_names = {
             "Рейхстаг": "Рейхстаг",
@@ -190,9 +219,9 @@ class MapPanel(Panel):
             "Церковь Покрова": "Церковь №2"
         }
 
-        for name, pos in building_positions.items():
-            building = building_manager.get_building(name)
-            if building:
+        for name, building in building_manager.buildings.items():
+            pos = building.position
+            if pos:
                 self.buildings.append({
                     'name': name,
                     'short_name': short_names.get(name, name),
@@ -200,36 +229,45 @@ class MapPanel(Panel):
                     'building': building,
                     'rect': pygame.Rect(self.rect.x + pos[0] - 20, self.rect.y + pos[1] - 20, 40, 40)
                 })
+        self.layout_version += 1
+
+    def register_hit_targets(self, index):
+        """Регистрация зданий в индексе кликов"""
+        for bld in self.buildings:
+            index.insert(bld['rect'], ("building", bld), priority=1)
 
     def draw(self, screen, fonts):
         super().draw(screen, fonts)
 
-        # Отрисовка зданий
+        # Отрисовка зданий: иконка с подписью - один спрайт из атласа
         for bld in self.buildings:
             color = Colors.DARK_RED if bld['building'].is_destroyed else \
                 Colors.BROWN if "Рейхстаг" in bld['name'] else \
                     Colors.GRAY
 
-            pygame.draw.rect(screen, color, bld['rect'])
-            pygame.draw.rect(screen, Colors.WHITE, bld['rect'], 1)
-
-            # Используем короткое название здания
-            text_surf = fonts.small.render(bld['short_name'], True, Colors.WHITE)
-            text_rect = text_surf.get_rect(center=bld['rect'].center)
-            screen.blit(text_surf, text_rect)
+            self.atlas.blit(screen, ("building", color, bld['short_name']),
+                            lambda: self.render_icon(color, bld['short_name'], fonts),
+                            center=bld['rect'].center)
 
             # Выделение выбранного здания
             if self.selected_building == bld['name']:
                 pygame.draw.rect(screen, Colors.YELLOW, bld['rect'], 3)
+            elif self.hovered_building is bld:
+                pygame.draw.rect(screen, Colors.LIGHT_GRAY, bld['rect'], 2)
 
-    def handle_click(self, mouse_pos):
-        """Обработка клика по карте"""
-        for bld in self.buildings:
-            if bld['rect'].collidepoint(mouse_pos):
-                self.selected_building = bld['name']
-                return bld
-        self.selected_building = None
-        return None
+    @staticmethod
+    def render_icon(color, short_name, fonts):
+        """Иконка здания 40x40 с короткой подписью по центру"""
+        # Используем короткое название здания
+        text_surf = fonts.small.render(short_name, True, Colors.WHITE)
+        icon = pygame.Surface((max(40, text_surf.get_width()), 40), pygame.SRCALPHA)
+        icon_rect = pygame.Rect(0, 0, 40, 40)
+        icon_rect.centerx = icon.get_width() // 2
+
+        pygame.draw.rect(icon, color, icon_rect)
+        pygame.draw.rect(icon, Colors.WHITE, icon_rect, 1)
+        icon.blit(text_surf, text_surf.get_rect(center=icon_rect.center))
+        return icon
 
 
 class MinisterPanel(Panel):
@@ -237,16 +275,65 @@ class MinisterPanel(Panel):
 
     def __init__(self, x, y, width, height):
         super().__init__(x, y, width, height, "Министры Рейха")
-        self.ministers = []
         self.selected_minister = None
-        self.scroll_offset = 0
         self.max_visible = 8  # Максимум видимых министров
-        self.scroll_up_button = Button(x + width - 30, y + 40, 25, 25, "↑", Colors.GRAY)
-        self.scroll_down_button = Button(x + width - 30, y + height - 30, 25, 25, "↓", Colors.GRAY)
+        self.list_model = VirtualListModel(40, 50, height - 30, self.max_visible, height - 50, min_y=1)
+        self.row_cache = RowSurfaceCache()
+        self.scroll_up_button = Button(x + width - 30, y + 40, 25, 25, "↑", Colors.GRAY, action=-40)
+        self.scroll_down_button = Button(x + width - 30, y + height - 30, 25, 25, "↓", Colors.GRAY, action=40)
+
+    @property
+    def ministers(self):
+        return self.list_model.items
+
+    @property
+    def scroll_offset(self):
+        return self.list_model.scroll_offset
+
+    @property
+    def layout_version(self):
+        return self.list_model.version
 
     def update_ministers(self, minister_manager):
-        """Обновление списка министров"""
-        self.ministers = list(minister_manager.ministers.values())
+        """Обновление списка министров (список копируется только при изменении состава)"""
+        self.list_model.set_source(minister_manager.ministers)
+
+    def scroll(self, delta):
+        self.list_model.scroll(delta)
+
+    def register_hit_targets(self, index):
+        """Регистрация видимых строк и кнопок прокрутки в индексе кликов"""
+        for _, minister, y_offset in self.list_model.visible_rows():
+            index.insert((self.rect.x + 10, self.rect.y + y_offset - 5, self.rect.width - 40, 35),
+                         ("minister", minister), priority=1)
+        index.insert(self.scroll_up_button.rect, ("scroll", (self, self.scroll_up_button)), priority=2)
+        index.insert(self.scroll_down_button.rect, ("scroll", (self, self.scroll_down_button)), priority=2)
+
+    def render_row(self, minister, fonts):
+        """Отрисовка строки министра в отдельную поверхность"""
+        row = pygame.Surface((self.rect.width - 40, 40), pygame.SRCALPHA)
+
+        # Цвет в зависимости от лояльности
+        loyalty_color = Colors.GREEN if minister.loyalty >= 70 else \
+            Colors.YELLOW if minister.loyalty >= 50 else Colors.RED
+
+        # Имя и должность (сокращаем если слишком длинное)
+        position = minister.position
+        if len(position) > 20:
+            position = position[:20] + "..."
+
+        text = f"{minister.name} - {position}"
+        row.blit(fonts.small.render(text, True, Colors.WHITE), (5, 5))
+
+        # Полоска лояльности
+        loyalty_rect = pygame.Rect(5, 25, min(minister.loyalty * 2, 200), 8)  # Ограничиваем длину полоски
+        pygame.draw.rect(row, loyalty_color, loyalty_rect)
+        pygame.draw.rect(row, Colors.WHITE, loyalty_rect, 1)
+
+        # Текст лояльности
+        loyalty_text = f"{minister.loyalty}%"
+        row.blit(fonts.small.render(loyalty_text, True, Colors.WHITE), (210, 20))
+        return row
 
     def draw(self, screen, fonts):
         super().draw(screen, fonts)
@@ -255,113 +342,83 @@ class MinisterPanel(Panel):
         self.scroll_up_button.draw(screen, fonts)
         self.scroll_down_button.draw(screen, fonts)
 
-        y_offset = 50 - self.scroll_offset
-        visible_count = 0
-
-        for i, minister in enumerate(self.ministers):
-            if visible_count >= self.max_visible:
-                break
-
-            if y_offset < self.rect.height - 30 and y_offset > 0:
-                # Цвет в зависимости от лояльности
-                loyalty_color = Colors.GREEN if minister.loyalty >= 70 else \
-                    Colors.YELLOW if minister.loyalty >= 50 else Colors.RED
-
-                # Имя и должность (сокращаем если слишком длинное)
-                position = minister.position
-                if len(position) > 20:
-                    position = position[:20] + "..."
-
-                text = f"{minister.name} - {position}"
-                text_surf = fonts.small.render(text, True, Colors.WHITE)
-                screen.blit(text_surf, (self.rect.x + 15, self.rect.y + y_offset))
-
-                # Полоска лояльности
-                loyalty_rect = pygame.Rect(self.rect.x + 15, self.rect.y + y_offset + 20,
-                                           min(minister.loyalty * 2, 200), 8)  # Ограничиваем длину полоски
-                pygame.draw.rect(screen, loyalty_color, loyalty_rect)
-                pygame.draw.rect(screen, Colors.WHITE, loyalty_rect, 1)
-
-                # Текст лояльности
-                loyalty_text = f"{minister.loyalty}%"
-                loyalty_surf = fonts.small.render(loyalty_text, True, Colors.WHITE)
-                screen.blit(loyalty_surf, (self.rect.x + 220, self.rect.y + y_offset + 15))
-
-                # Выделение выбранного министра
-                if self.selected_minister == minister.name:
-                    highlight_rect = pygame.Rect(self.rect.x + 10, self.rect.y + y_offset - 5,
-                                                 self.rect.width - 40, 35)  # Учитываем место для кнопок
-                    pygame.draw.rect(screen, Colors.YELLOW, highlight_rect, 2)
-
-                visible_count += 1
-
-            y_offset += 40
-
-    def handle_click(self, mouse_pos):
-        """Обработка клика по списку министров"""
-        # Проверка кнопок прокрутки
-        if self.scroll_up_button.is_clicked(mouse_pos, True):
-            self.scroll_offset = max(0, self.scroll_offset - 40)
-            return None
-        if self.scroll_down_button.is_clicked(mouse_pos, True):
-            max_scroll = max(0, len(self.ministers) * 40 - (self.rect.height - 50))
-            self.scroll_offset = min(max_scroll, self.scroll_offset + 40)
-            return None
-
-        y_offset = 50 - self.scroll_offset
-        for minister in self.ministers:
-            minister_rect = pygame.Rect(self.rect.x + 10, self.rect.y + y_offset - 5,
-                                        self.rect.width - 40, 35)  # Учитываем место для кнопок
+        for _, minister, y_offset in self.list_model.visible_rows():
+            row = self.row_cache.get(minister, (minister.loyalty, minister.position),
+                                     lambda item: self.render_row(item, fonts))
+            screen.blit(row, (self.rect.x + 10, self.rect.y + y_offset - 5))
 
-            if minister_rect.collidepoint(mouse_pos):
-                self.selected_minister = minister.name
-                return minister
-
-            y_offset += 40
-
-        self.selected_minister = None
-        return None
+            # Выделение выбранного министра
+            if self.selected_minister == minister.name:
+                highlight_rect = pygame.Rect(self.rect.x + 10, self.rect.y + y_offset - 5,
+                                             self.rect.width - 40, 35)  # Учитываем место для кнопок
+                pygame.draw.rect(screen, Colors.YELLOW, highlight_rect, 2)
 
 
 class MilitaryPanel(Panel):
     def __init__(self, x, y, width, height):
         super().__init__(x, y, width, height, "Военные силы")
-        self.divisions = []
-        self.scroll_offset = 0
         self.max_visible = 6  # Максимум видимых дивизий
-        self.division_buttons = []
-        self.scroll_up_button = Button(x + width - 30, y + 40, 25, 25, "↑", Colors.GRAY)
-        self.scroll_down_button = Button(x + width - 30, y + height - 30, 25, 25, "↓", Colors.GRAY)
+        self.list_model = VirtualListModel(50, 50, height, self.max_visible, height - 50)
+        self.row_cache = RowSurfaceCache()
+        self.scroll_up_button = Button(x + width - 30, y + 40, 25, 25, "↑", Colors.GRAY, action=-50)
+        self.scroll_down_button = Button(x + width - 30, y + height - 30, 25, 25, "↓", Colors.GRAY, action=50)
+
+    @property
+    def divisions(self):
+        return self.list_model.items
+
+    @property
+    def scroll_offset(self):
+        return self.list_model.scroll_offset
+
+    @property
+    def layout_version(self):
+        return self.list_model.version
 
     def update_divisions(self, military_manager):
-        """Обновление списка дивизий"""
-        self.divisions = list(military_manager.divisions.values())
-        self.update_division_buttons()
-
-    def update_division_buttons(self):
-        """Обновление позиций кнопок дивизий с учетом прокрутки"""
-        self.division_buttons = []
-
-        start_index = self.scroll_offset // 50
-        visible_count = min(self.max_visible, len(self.divisions) - start_index)
-
-        for i in range(visible_count):
-            division_index = start_index + i
-            if division_index < len(self.divisions):
-                division = self.divisions[division_index]
-                y_offset = 50 + (i * 50) - (self.scroll_offset % 50)
-
-                button_rect = pygame.Rect(
-                    self.rect.x + 10,
-                    self.rect.y + y_offset - 5,
-                    self.rect.width - 40,
-                    45
-                )
-                self.division_buttons.append({
-                    'rect': button_rect,
-                    'division': division,
-                    'index': division_index
-                })
+        """Обновление списка дивизий (список копируется только при изменении состава)"""
+        self.list_model.set_source(military_manager.divisions)
+
+    def scroll(self, delta):
+        self.list_model.scroll(delta)
+
+    def row_rect(self, y_offset):
+        return pygame.Rect(self.rect.x + 10, self.rect.y + y_offset - 5, self.rect.width - 40, 45)
+
+    def register_hit_targets(self, index):
+        """Регистрация видимых дивизий и кнопок прокрутки в индексе кликов"""
+        for _, division, y_offset in self.list_model.visible_rows():
+            index.insert(self.row_rect(y_offset), ("division", division), priority=1)
+        index.insert(self.scroll_up_button.rect, ("scroll", (self, self.scroll_up_button)), priority=2)
+        index.insert(self.scroll_down_button.rect, ("scroll", (self, self.scroll_down_button)), priority=2)
+
+    def render_row(self, division, fonts):
+        """Отрисовка строки дивизии в отдельную поверхность"""
+        rect = pygame.Rect(0, 0, self.rect.width - 40, 45)
+        row = pygame.Surface(rect.size)
+
+        # Цвет в зависимости от типа
+        color = Colors.RED if "СС" in division.name else Colors.BLUE
+        status_color = Colors.GREEN if not division.is_engaged else Colors.RED
+
+        # Фон кнопки
+        pygame.draw.rect(row, Colors.DARK_GRAY, rect)
+        pygame.draw.rect(row, color, rect, 2)
+
+        # Название дивизии
+        text = f"{division.name}"
+        row.blit(fonts.small.render(text, True, color), (5, 5))
+
+        # Статус и численность
+        status = "СВОБОДНА" if not division.is_engaged else "ЗАНЯТА"
+        details = f"{division.soldiers} солдат - {status}"
+        row.blit(fonts.small.render(details, True, status_color), (5, 20))
+
+        # Полоска морали
+        morale_rect = pygame.Rect(5, 35, min(division.morale * 2, rect.width - 10), 6)
+        pygame.draw.rect(row, Colors.YELLOW, morale_rect)
+        pygame.draw.rect(row, Colors.WHITE, morale_rect, 1)
+        return row
 
     def draw(self, screen, fonts):
         super().draw(screen, fonts)
@@ -371,55 +428,10 @@ class MilitaryPanel(Panel):
         self.scroll_down_button.draw(screen, fonts)
 
         # Отрисовка видимых дивизий
-        for button_data in self.division_buttons:
-            division = button_data['division']
-            rect = button_data['rect']
-
-            # Цвет в зависимости от типа
-            color = Colors.RED if "СС" in division.name else Colors.BLUE
-            status_color = Colors.GREEN if not division.is_engaged else Colors.RED
-
-            # Фон кнопки
-            pygame.draw.rect(screen, Colors.DARK_GRAY, rect)
-            pygame.draw.rect(screen, color, rect, 2)
-
-            # Название дивизии
-            text = f"{division.name}"
-            text_surf = fonts.small.render(text, True, color)
-            screen.blit(text_surf, (rect.x + 5, rect.y + 5))
-
-            # Статус и численность
-            status = "СВОБОДНА" if not division.is_engaged else "ЗАНЯТА"
-            details = f"{division.soldiers} солдат - {status}"
-            details_surf = fonts.small.render(details, True, status_color)
-            screen.blit(details_surf, (rect.x + 5, rect.y + 20))
-
-            # Полоска морали
-            morale_rect = pygame.Rect(rect.x + 5, rect.y + 35, min(division.morale * 2, rect.width - 10), 6)
-            pygame.draw.rect(screen, Colors.YELLOW, morale_rect)
-            pygame.draw.rect(screen, Colors.WHITE, morale_rect, 1)
-
-    def handle_click(self, mouse_pos):
-        """Обработка клика по дивизиям"""
-        # Проверка кнопок прокрутки
-        if self.scroll_up_button.is_clicked(mouse_pos, True):
-            self.scroll_offset = max(0, self.scroll_offset - 50)
-            self.update_division_buttons()
-            return None
-
-        if self.scroll_down_button.is_clicked(mouse_pos, True):
-            max_scroll = max(0, len(self.divisions) * 50 - (self.rect.height - 50))
-            self.scroll_offset = min(max_scroll, self.scroll_offset + 50)
-            self.update_division_buttons()
-            return None
-
-        # Проверка кликов по дивизиям
-        for button_data in self.division_buttons:
-            if button_data['rect'].collidepoint(mouse_pos):
-                return ("division_click", button_data['division'])
-
-        return None
-
+        for _, division, y_offset in self.list_model.visible_rows():
+            row = self.row_cache.get(division, (division.soldiers, division.morale, division.is_engaged),
+                                     lambda item: self.render_row(item, fonts))
+            screen.blit(row, (self.rect.x + 10, self.rect.y + y_offset - 5))
 
 
 class NewsPanel(Panel):
@@ -482,45 +494,163 @@ class NewsPanel(Panel):
         return None
 
 
+class ChartPanel(Panel):
+    """Графики показателей по дням из MetricsStore"""
+
+    SERIES = (
+        ("Продовольствие", 'food', Colors.GREEN),
+        ("Боеприпасы", 'ammunition', Colors.RED),
+        ("Мораль", 'morale', Colors.YELLOW),
+        ("Солдаты", 'soldiers', Colors.BLUE),
+        ("Силы врага", 'enemy_force', Colors.LIGHT_GRAY),
+    )
+
+    def __init__(self, x, y, width, height, metrics=None):
+        super().__init__(x, y, width, height, "Динамика")
+        self.metrics = metrics
+        self.content = None  # Все графики одной поверхностью
+        self._version = None  # Версия метрик, по которой нарисован content
+
+    def draw(self, screen, fonts):
+        super().draw(screen, fonts)
+        if self.metrics is None or not len(self.metrics):
+            return
+
+        # Перерисовка только после записи нового дня
+        if self.metrics.version != self._version:
+            self._version = self.metrics.version
+            self.content = prepare_surface(self.render_content(fonts), alpha=True)
+        screen.blit(self.content, self.rect)
+
+    def render_content(self, fonts):
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        row_height = (self.rect.height - 45) // len(self.SERIES)
+        width = self.rect.width - 30
+
+        y = 45
+        for label, field, color in self.SERIES:
+            text_surf = fonts.small.render(f"{label}: {int(self.metrics.last(field))}", True, Colors.WHITE)
+            surface.blit(text_surf, (15, y))
+            self.draw_sparkline(surface, self.metrics.column(field), color,
+                                pygame.Rect(15, y + 18, width, row_height - 24))
+            y += row_height
+        return surface
+
+    @staticmethod
+    def draw_sparkline(surface, values, color, rect):
+        if len(values) < 2:
+            return
+        low, high = values.min(), values.max()
+        span = (high - low) or 1.0
+        step = (rect.width - 1) / (len(values) - 1)
+        ys = rect.bottom - 1 - (values - low) / span * (rect.height - 1)
+        pygame.draw.lines(surface, color, False, [(rect.x + i * step, y) for i, y in enumerate(ys.tolist())])
+
+
 class UIManager:
-    def __init__(self, screen_width=1200, screen_height=800):
+    def __init__(self, screen_width=1200, screen_height=800, fullscreen=False, window_size=None,
+                 display=None, fonts=None):
+        # Логический холст фиксированного размера; на экран его выводит Display
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.screen = pygame.display.set_mode((screen_width, screen_height))
-        pygame.display.set_caption("Березовский Рейх: Последний Рубеж v1.1.2А")
+        pygame.display.set_caption(WINDOW_TITLE)
+        self.display = display or Display((screen_width, screen_height), fullscreen, window_size)
+        self.screen = self.display.canvas
 
-        self.fonts = Fonts()
+        self.fonts = fonts or Fonts()
         self.colors = Colors()
 
+        # Атлас спрайтов (иконки зданий, подписи), заполняется по требованию
+        self.atlas = TextureAtlas()
+
         # Создание панелей
-        self.resource_panel = ResourcePanel(10, 10, 250, 180)
-        self.status_panel = StatusPanel(10, 200, 250, 200)
+        self.resource_panel = ResourcePanel(10, 10, 250, 180, self.atlas)
+        self.status_panel = StatusPanel(10, 200, 250, 200, self.atlas)
         self.news_panel = NewsPanel(10, 410, 250, 180)  # Новая панель новостей
-        self.map_panel = MapPanel(270, 10, 600, 400)
+        self.map_panel = MapPanel(270, 10, 600, 400, self.atlas)
         self.minister_panel = MinisterPanel(880, 10, 310, 390)
         self.military_panel = MilitaryPanel(270, 420, 600, 370)
+        self.chart_panel = ChartPanel(880, 510, 310, 280)  # Метрики задаются игрой после загрузки кампании
 
         # Кнопки управления
-        self.next_day_button = Button(880, 410, 150, 40, "Следующий день", Colors.GREEN)
-        self.save_button = Button(1040, 410, 150, 40, "Сохранить игру", Colors.BLUE)
-        self.load_button = Button(880, 460, 150, 40, "Загрузить игру", Colors.YELLOW)
-        self.info_button = Button(1040, 460, 150, 40, "Информация", Colors.LIGHT_GRAY)
+        self.next_day_button = Button(880, 410, 150, 40, "Следующий день", Colors.GREEN, action="next_day")
+        self.save_button = Button(1040, 410, 150, 40, "Сохранить игру", Colors.BLUE, action="save_game")
+        self.load_button = Button(880, 460, 150, 40, "Загрузить игру", Colors.YELLOW, action="load_game")
+        self.info_button = Button(1040, 460, 150, 40, "Информация", Colors.LIGHT_GRAY, action="show_info")
         self.menu_buttons = [self.next_day_button, self.save_button, self.load_button, self.info_button]
 
+        # Индекс кликабельных элементов главного экрана, перестраивается при смене раскладки
+        self.hit_index = SpatialHash(cell_size=50)
+        self._hit_layout = None
+        self.hovered_target = None
+
         # Кнопки для детальных экранов
         self.detail_buttons = []
+        self.detail_panels = {}  # Панели детальных экранов с запеченным фоном
+        self.forecast = None  # ResourceForecast, задается игрой после загрузки кампании
+        self.fast_forward_background = None
+        self.advice_cache = RowSurfaceCache(capacity=8)  # Строки оценок советника по вариантам
+
+        # Статичные части интерфейса запекаются при раскладке
+        self.bake_layout()
 
         self.current_screen = "main"
 
+    def present(self):
+        """Вывод кадра с масштабированием под физическое разрешение"""
+        self.display.present()
+
+    def get_mouse_pos(self):
+        """Позиция мыши в координатах логического холста; None - за пределами холста"""
+        return self.display.get_mouse_pos()
+
+    def bake_layout(self):
+        """Запекание статичных элементов: фон панелей и заголовок главного экрана"""
+        for panel in (self.resource_panel, self.status_panel, self.news_panel,
+                      self.map_panel, self.minister_panel, self.military_panel, self.chart_panel):
+            panel.bake(self.fonts)
+        self.detail_panels = {}
+
+        self.title_surf = prepare_surface(self.fonts.title.render("БЕРЕЗОВСКИЙ РЕЙХ", True, Colors.WHITE), alpha=True)
+        self.subtitle_surf = prepare_surface(self.fonts.medium.render("ПОСЛЕДНИЙ РУБЕЖ", True, Colors.RED),
+                                             alpha=True)
+
+    def get_detail_panel(self, x, y, width, height, title):
+        """Панель детального экрана (создается и запекается один раз)"""
+        key = (x, y, width, height, title)
+        panel = self.detail_panels.get(key)
+        if panel is None:
+            panel = self.detail_panels[key] = Panel(x, y, width, height, title)
+            panel.bake(self.fonts)
+        return panel
+
     def initialize_map(self, building_manager):
         self.map_panel.initialize_buildings(building_manager)
 
     def update_ui(self, game_state, resources, ministers, military):
-        self.resource_panel.update_resources(resources)
+        self.resource_panel.update_resources(resources, self.forecast.update() if self.forecast else None)
         self.status_panel.update_status(game_state, military)
         self.news_panel.update_news(game_state)  # Обновляем новости
         self.minister_panel.update_ministers(ministers)
         self.military_panel.update_divisions(military)
+        self.refresh_hit_index()
+
+    def refresh_hit_index(self):
+        """Перестройка индекса кликов, если раскладка панелей изменилась"""
+        layout = (self.map_panel.layout_version, self.minister_panel.layout_version,
+                  self.military_panel.layout_version)
+        if layout == self._hit_layout:
+            return
+        self._hit_layout = layout
+
+        self.hit_index.clear()
+        self.hit_index.insert(self.news_panel.rect, ("news", self.news_panel))
+        self.map_panel.register_hit_targets(self.hit_index)
+        self.minister_panel.register_hit_targets(self.hit_index)
+        self.military_panel.register_hit_targets(self.hit_index)
+        for button in self.menu_buttons:
+            self.hit_index.insert(button.rect, ("button", button), priority=2)
+        self.hovered_target = None
 
     def draw_main_screen(self):
         self.screen.fill(Colors.BLACK)
@@ -531,17 +661,16 @@ class UIManager:
         self.map_panel.draw(self.screen, self.fonts)
         self.minister_panel.draw(self.screen, self.fonts)
         self.military_panel.draw(self.screen, self.fonts)
+        self.chart_panel.draw(self.screen, self.fonts)
 
         for button in self.menu_buttons:
             button.draw(self.screen, self.fonts)
 
-        title_surf = self.fonts.title.render("БЕРЕЗОВСКИЙ РЕЙХ", True, Colors.WHITE)
-        subtitle_surf = self.fonts.medium.render("ПОСЛЕДНИЙ РУБЕЖ", True, Colors.RED)
-
-        self.screen.blit(title_surf, (self.screen_width // 2 - title_surf.get_width() // 2, 450))
-        self.screen.blit(subtitle_surf, (self.screen_width // 2 - subtitle_surf.get_width() // 2, 500))
+        self.screen.blit(self.title_surf, (self.screen_width // 2 - self.title_surf.get_width() // 2, 450))
+        self.screen.blit(self.subtitle_surf, (self.screen_width // 2 - self.subtitle_surf.get_width() // 2, 500))
 
-    def draw_event_screen(self, event):
+    def draw_event_screen(self, event, advice=None):
+        """advice - оценки EventAdvisor.estimates() по вариантам или None"""
         self.screen.fill(Colors.DARK_GRAY)
 
         title_surf = self.fonts.large.render(f"СОБЫТИЕ: {event.name}", True, Colors.YELLOW)
@@ -555,13 +684,30 @@ class UIManager:
             text = f"{i + 1}. {choice['text']}"
             choice_surf = self.fonts.medium.render(text, True, Colors.WHITE)
             self.screen.blit(choice_surf, (50, y_offset))
-            y_offset += 40
+            y_offset += 30
+
+            if advice:
+                advice_text = self.format_advice(*advice[i])
+                advice_surf = self.advice_cache.get(
+                    i, advice_text, lambda _: self.fonts.small.render(advice_text, True, Colors.LIGHT_GRAY))
+                self.screen.blit(advice_surf, (70, y_offset))
+                y_offset += 30
+            else:
+                y_offset += 10
+
+    @staticmethod
+    def format_advice(visits, wins, endings):
+        if not visits:
+            return "Советник: анализ..."
+        top = sorted(endings.items(), key=lambda item: -item[1])[:2]
+        details = ", ".join(f"{name} {share:.0%}" for name, share in top)
+        return f"Победа ~{wins:.0%} (прогонов: {visits}); {details}"
 
     def draw_building_detail(self, building_data):
         if not building_data:
             return
 
-        detail_panel = Panel(400, 200, 400, 300, building_data['name'])
+        detail_panel = self.get_detail_panel(400, 200, 400, 300, building_data['name'])
         detail_panel.draw(self.screen, self.fonts)
 
         building = building_data['building']
@@ -600,7 +746,7 @@ class UIManager:
         if not minister:
             return
 
-        detail_panel = Panel(400, 150, 400, 400, minister.name)
+        detail_panel = self.get_detail_panel(400, 150, 400, 400, minister.name)
         detail_panel.draw(self.screen, self.fonts)
 
         info_lines = [
@@ -633,7 +779,7 @@ class UIManager:
         if not division:
             return
 
-        detail_panel = Panel(400, 200, 400, 350, division.name)  # Увеличили высоту
+        detail_panel = self.get_detail_panel(400, 200, 400, 350, division.name)  # Увеличили высоту
         detail_panel.draw(self.screen, self.fonts)
 
         info_lines = [
@@ -657,6 +803,38 @@ class UIManager:
         for button in self.detail_buttons:
             button.draw(self.screen, self.fonts)
 
+    def begin_fast_forward(self):
+        """Затемненный последний кадр - фон экрана перемотки"""
+        self.fast_forward_background = self.screen.copy()
+        shade = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+        shade.fill((0, 0, 0, 160))
+        self.fast_forward_background.blit(shade, (0, 0))
+
+    def draw_fast_forward_overlay(self, fast_forward):
+        self.screen.blit(self.fast_forward_background, (0, 0))
+
+        box = pygame.Rect(0, 0, 500, 150)
+        box.center = (self.screen_width // 2, self.screen_height // 2)
+        pygame.draw.rect(self.screen, Colors.DARK_GRAY, box)
+        pygame.draw.rect(self.screen, Colors.LIGHT_GRAY, box, 2)
+
+        day = fast_forward.start_day + fast_forward.days_done
+        title_surf = self.fonts.large.render(f"Перемотка: день {day}", True, Colors.WHITE)
+        self.screen.blit(title_surf, (box.x + 20, box.y + 15))
+
+        bar = pygame.Rect(box.x + 20, box.y + 60, box.width - 40, 20)
+        pygame.draw.rect(self.screen, Colors.GRAY, bar)
+        filled = bar.copy()
+        filled.width = int(bar.width * min(1.0, fast_forward.days_done / max(1, fast_forward.days)))
+        pygame.draw.rect(self.screen, Colors.GREEN, filled)
+
+        info = (f"{fast_forward.days_done} из {fast_forward.days} дн., {fast_forward.days_per_second:.0f} дн/с, "
+                f"событий решено: {len(fast_forward.resolved)}")
+        info_surf = self.fonts.small.render(info, True, Colors.WHITE)
+        self.screen.blit(info_surf, (box.x + 20, box.y + 92))
+        hint_surf = self.fonts.small.render("Esc - остановить", True, Colors.LIGHT_GRAY)
+        self.screen.blit(hint_surf, (box.x + 20, box.y + 118))
+
     def draw_info_screen(self):
         """Экран информации об игре"""
         self.screen.fill(Colors.DARK_GRAY)
@@ -673,6 +851,7 @@ class UIManager:
             "- Нажимайте на министров для просмотра их характеристик",
             "- Нажимайте на дивизии для просмотра их состояния",
             "- Кнопка 'Следующий день' - переход к следующему игровому дню",
+            "- Клавиша F - перемотка на несколько дней (до события, требующего решения)",
             "- Следите за ресурсами и моралью населения",
             "",
             "ЦЕЛЬ ИГРЫ:",
@@ -698,46 +877,64 @@ class UIManager:
         self.detail_buttons = [back_button]
 
     def update_buttons(self, mouse_pos):
-        for button in self.menu_buttons:
-            button.update(mouse_pos)
-
-        # Обновляем кнопки детальных экранов
+        """Подсветка под курсором; mouse_pos None - курсор вне холста"""
+        # Кнопки детальных экранов (их немного, проверяем напрямую)
         for button in self.detail_buttons:
             button.update(mouse_pos)
 
-        # Обновляем кнопки прокрутки в панели министров
-        self.minister_panel.scroll_up_button.update(mouse_pos)
-        self.minister_panel.scroll_down_button.update(mouse_pos)
+        # Наведение на главном экране: одна ячейка индекса
+        target = None
+        if self.current_screen == "main" and mouse_pos is not None:
+            target = self.hit_index.query_point(mouse_pos)
+        if target is self.hovered_target:
+            return
+        self._set_hover(self.hovered_target, False)
+        self._set_hover(target, True)
+        self.hovered_target = target
+
+    def _set_hover(self, target, hovered):
+        if target is None:
+            return
+        kind, obj = target
+        if kind == "button":
+            obj.is_hovered = hovered
+            obj.current_color = obj.hover_color if hovered else obj.color
+        elif kind == "scroll":
+            button = obj[1]
+            button.is_hovered = hovered
+            button.current_color = button.hover_color if hovered else button.color
+        elif kind == "building":
+            self.map_panel.hovered_building = obj if hovered else None
 
     def handle_click(self, mouse_pos, mouse_click):
         if self.current_screen == "main":
+            if not mouse_click:
+                return None
+            target = self.hit_index.query_point(mouse_pos)
+            kind, obj = target if target else (None, None)
+
             # Проверка основных кнопок
-            if self.next_day_button.is_clicked(mouse_pos, mouse_click):
-                return "next_day"
-            if self.save_button.is_clicked(mouse_pos, mouse_click):
-                return "save_game"
-            if self.load_button.is_clicked(mouse_pos, mouse_click):
-                return "load_game"
-            if self.info_button.is_clicked(mouse_pos, mouse_click):
-                return "show_info"
-
-            # Проверка кликов по панелям
-            building_click = self.map_panel.handle_click(mouse_pos)
-            if building_click:
-                return ("building_click", building_click)
-
-            minister_click = self.minister_panel.handle_click(mouse_pos)
-            if minister_click:
-                return ("minister_click", minister_click)
-
-            division_click = self.military_panel.handle_click(mouse_pos)
-            if division_click:
-                return division_click
-
-            # Проверка кликов по панели новостей
-            news_click = self.news_panel.handle_click(mouse_pos)
-            if news_click:
-                return "news_scroll"
+            if kind == "button":
+                return obj.action
+
+            # Клик мимо здания или министра снимает выделение
+            self.map_panel.selected_building = obj['name'] if kind == "building" else None
+            if kind != "scroll":
+                self.minister_panel.selected_minister = obj.name if kind == "minister" else None
+
+            if kind == "building":
+                return ("building_click", obj)
+            if kind == "minister":
+                return ("minister_click", obj)
+            if kind == "division":
+                return ("division_click", obj)
+            if kind == "scroll":
+                panel, button = obj
+                panel.scroll(button.action)
+                self.refresh_hit_index()
+                return None
+            if kind == "news":
+                self.news_panel.handle_click(mouse_pos)
 
         elif self.current_screen in ["building_detail", "minister_detail", "division_detail", "info"]:
             # Проверка кнопок детальных экранов
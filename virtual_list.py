@@ -0,0 +1,87 @@
+# virtual_list.py
+from collections import OrderedDict
+
+
+class VirtualListModel:
+    """Модель прокручиваемого списка: видимые строки пересчитываются
+    только при прокрутке или изменении данных.
+
+    Строка i находится на высоте top + i * row_height - scroll_offset и
+    видна, если попадает в [min_y, bottom); видимых строк не больше max_visible.
+    Прокрутка ограничена так, чтобы последняя строка оставалась в viewport_height.
+    """
+
+    def __init__(self, row_height, top, bottom, max_visible, viewport_height, min_y=0):
+        self.row_height = row_height
+        self.top = top
+        self.bottom = bottom
+        self.viewport_height = viewport_height
+        self.min_y = min_y
+        self.max_visible = max_visible
+        self.items = []
+        self.scroll_offset = 0
+        self.version = 0  # Растет при каждом изменении видимой части
+        self._source = None
+        self._source_length = -1
+        self._visible = None
+
+    def set_source(self, source):
+        """Привязка к словарю или списку; копия делается только при изменении"""
+        if source is self._source and len(source) == self._source_length:
+            return
+        self._source = source
+        self._source_length = len(source)
+        self.items = list(source.values()) if isinstance(source, dict) else list(source)
+        self.invalidate()
+
+    def invalidate(self):
+        self._visible = None
+        self.version += 1
+
+    def max_scroll(self):
+        return max(0, len(self.items) * self.row_height - self.viewport_height)
+
+    def scroll(self, delta):
+        offset = max(0, min(self.max_scroll(), self.scroll_offset + delta))
+        if offset != self.scroll_offset:
+            self.scroll_offset = offset
+            self.invalidate()
+
+    def visible_rows(self):
+        """Список (индекс, элемент, y) видимых строк"""
+        if self._visible is None:
+            first = max(0, -((self.top - self.scroll_offset - self.min_y) // self.row_height))
+            rows = []
+            for index in range(first, len(self.items)):
+                y = self.top + index * self.row_height - self.scroll_offset
+                if y < self.min_y:
+                    continue
+                if y >= self.bottom or len(rows) >= self.max_visible:
+                    break
+                rows.append((index, self.items[index], y))
+            self._visible = rows
+        return self._visible
+
+
+class RowSurfaceCache:
+    """Кэш отрисованных строк: строка перерисовывается, только когда меняется её ключ состояния"""
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.entries = OrderedDict()  # элемент -> (ключ состояния, поверхность)
+
+    def get(self, item, state_key, render):
+        entry = self.entries.get(item)
+        if entry is not None and entry[0] == state_key:
+            self.entries.move_to_end(item)
+            return entry[1]
+
+        surface = render(item)
+        self.entries[item] = (state_key, surface)
+        self.entries.move_to_end(item)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.entries.clear()